@@ -13,6 +13,9 @@ import uvicorn
 from storyville import PACKAGE_DIR
 from storyville.app import create_app
 from storyville.build import build_catalog
+from storyville.memory_output import MemoryOutput
+from storyville.static_assets import CopyStrategy
+from storyville.subinterpreter_pool import DEFAULT_POOL_SIZE
 
 app = typer.Typer()
 
@@ -46,6 +49,16 @@ def serve(
             "Default: True (use subinterpreters for proper hot reload)."
         ),
     ),
+    pool_size: int = typer.Option(
+        DEFAULT_POOL_SIZE,
+        "--pool-size",
+        min=1,
+        help=(
+            "Number of subinterpreters kept warm for hot reload builds. "
+            "Each one imports Storyville in the background at startup. "
+            f"Default: {DEFAULT_POOL_SIZE}."
+        ),
+    ),
     with_assertions: bool = typer.Option(
         True,
         "--with-assertions/--no-with-assertions",
@@ -56,6 +69,59 @@ def serve(
             "Default: True (assertions enabled)."
         ),
     ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental/--no-incremental",
+        help=(
+            "Make hot reload rebuilds incremental: only pages whose inputs "
+            "changed are re-rendered and rewritten. "
+            "Default: False (full rebuild on every change)."
+        ),
+    ),
+    atomic: bool = typer.Option(
+        False,
+        "--atomic/--no-atomic",
+        help=(
+            "Build hot reload rebuilds into a staging directory and swap it "
+            "into place when complete, so the server never serves a half-built site. "
+            "Default: False (rebuild directly in the output directory)."
+        ),
+    ),
+    static_strategy: CopyStrategy = typer.Option(
+        CopyStrategy.COPY,
+        "--static-strategy",
+        help=(
+            "How static assets are placed in the output: copy, hardlink, "
+            "reflink or symlink. Files that can't be linked are copied. "
+            "Default: copy (the output is independent of the sources)."
+        ),
+    ),
+    in_memory: bool = typer.Option(
+        False,
+        "--in-memory/--no-in-memory",
+        help=(
+            "Build into memory and serve pages straight from it, without "
+            "writing the site to disk. Rebuilds run in the main interpreter "
+            "and import the package's modules again. Default: False."
+        ),
+    ),
+    flush: bool = typer.Option(
+        False,
+        "--flush/--no-flush",
+        help=(
+            "With --in-memory, also write changed files to the output "
+            "directory after each build. Default: False."
+        ),
+    ),
+    lazy: bool = typer.Option(
+        False,
+        "--lazy/--no-lazy",
+        help=(
+            "Skip the initial build: load the catalog and render each page "
+            "the first time it is requested, caching recent pages. "
+            "Rebuilds run in the main interpreter. Default: False."
+        ),
+    ),
 ) -> None:
     """Start a development server for the Storyville catalog.
 
@@ -66,25 +132,52 @@ def serve(
     --use-subinterpreters flag to enable isolated subinterpreters for each
     rebuild, which allows module changes to take effect without restarting
     the server.
+
+    With --in-memory, builds render into memory and the server reads pages
+    from there, so the hot reload loop skips the write phase entirely.
+
+    With --lazy, startup only loads the catalog; pages are rendered when
+    a browser asks for them.
     """
+    if lazy and in_memory:
+        raise typer.BadParameter("--lazy and --in-memory can't be combined")
+
     # Configure logging for storyville modules to show watcher events
     logging.basicConfig(
         level=logging.INFO,
         format="%(levelname)s:     %(name)s - %(message)s",
     )
 
+    # Subinterpreter builds can't render into this process's memory
+    memory = MemoryOutput(flush=flush) if in_memory else None
+    use_subinterpreter_builds = use_subinterpreters and memory is None and not lazy
+
     def run_server(output_dir: Path) -> None:
         """Run the server with the given output directory."""
-        typer.echo(f"Building catalog from '{input_path}' to '{output_dir}'...")
-        build_catalog(
-            package_location=input_path,
-            output_dir=output_dir,
-            with_assertions=with_assertions,
-        )
-        typer.echo("Build complete! Starting server on http://localhost:8080")
-        typer.echo(f"Serving from: {output_dir}")
-
-        if use_subinterpreters:
+        if lazy:
+            # The catalog is loaded by create_app; pages render on request
+            typer.echo(f"Serving '{input_path}', rendering pages on request")
+        else:
+            if memory is None:
+                typer.echo(f"Building catalog from '{input_path}' to '{output_dir}'...")
+            else:
+                typer.echo(f"Building catalog from '{input_path}' into memory...")
+            build_catalog(
+                package_location=input_path,
+                output_dir=output_dir,
+                with_assertions=with_assertions,
+                static_strategy=static_strategy,
+                memory=memory,
+            )
+            typer.echo("Build complete! Starting server on http://localhost:8080")
+            if memory is None:
+                typer.echo(f"Serving from: {output_dir}")
+            elif memory.flush:
+                typer.echo(f"Serving from memory, flushing to: {output_dir}")
+            else:
+                typer.echo("Serving from memory")
+
+        if use_subinterpreter_builds:
             typer.echo("Hot reload using subinterpreters: enabled")
         else:
             typer.echo("Hot reload using direct builds: enabled")
@@ -101,8 +194,14 @@ def serve(
             input_path=input_path,
             package_location=input_path,
             output_dir=output_dir,
-            use_subinterpreters=use_subinterpreters,
+            use_subinterpreters=use_subinterpreter_builds,
             with_assertions=with_assertions,
+            incremental=incremental,
+            atomic=atomic,
+            static_strategy=static_strategy,
+            memory=memory,
+            lazy=lazy,
+            pool_size=pool_size,
         )
         try:
             # Note: Do NOT use reload=True - we have custom file watching
@@ -131,12 +230,69 @@ def build(
         ...,
         help="Output directory for the built catalog",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help=(
+            "Number of worker processes for rendering pages. "
+            "Values above 1 render sections, subjects and stories in parallel. "
+            "Default: 1 (render in the current process)."
+        ),
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental/--no-incremental",
+        help=(
+            "Reuse the existing output directory and only re-render pages "
+            "whose inputs changed since the last build. "
+            "Default: False (clear the output directory and rebuild everything)."
+        ),
+    ),
+    atomic: bool = typer.Option(
+        False,
+        "--atomic/--no-atomic",
+        help=(
+            "Build into a sibling staging directory and swap it into place when "
+            "complete. The output directory is never seen half-written. "
+            "Default: False (build directly in the output directory)."
+        ),
+    ),
+    static_strategy: CopyStrategy = typer.Option(
+        CopyStrategy.COPY,
+        "--static-strategy",
+        help=(
+            "How static assets are placed in the output: copy, hardlink, "
+            "reflink or symlink. Files that can't be linked are copied. "
+            "Default: copy (the output is independent of the sources)."
+        ),
+    ),
+    fingerprint: bool = typer.Option(
+        False,
+        "--fingerprint/--no-fingerprint",
+        help=(
+            "Also publish each static file under a content-hashed name "
+            "(e.g. pico-main.3f9a1c2b7d.css), link pages to those names and "
+            "write asset-manifest.json, so assets can be cached forever. "
+            "Default: False."
+        ),
+    ),
+    precompress: bool = typer.Option(
+        False,
+        "--precompress/--no-precompress",
+        help=(
+            "Write .gz siblings (and .br, when the brotli package is installed) "
+            "of HTML, CSS and JS files above 1 KB, for servers that send "
+            "precompressed files. Default: False."
+        ),
+    ),
 ) -> None:
     """Build the Storyville catalog to static files.
 
     The build command performs a one-time build without starting a server.
     It always uses direct builds (no subinterpreters) for maximum simplicity
-    and performance.
+    and performance. Use --jobs to spread page rendering across processes.
 
     For development with hot reload, use the 'serve' command instead.
     """
@@ -151,7 +307,18 @@ def build(
 
     # Build the catalog
     typer.echo(f"Building catalog from '{input_path}' to '{output_p}'...")
-    build_catalog(package_location=input_path, output_dir=output_p)
+    build_catalog(
+        package_location=input_path,
+        output_dir=output_p,
+        jobs=jobs,
+        incremental=incremental,
+        atomic=atomic,
+        static_strategy=static_strategy,
+        fingerprint=fingerprint,
+        precompress=precompress,
+        # Only a later incremental build reads the manifest
+        write_manifest=incremental,
+    )
     typer.echo("Build complete!")
 
 
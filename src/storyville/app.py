@@ -2,23 +2,59 @@
 
 import asyncio
 import logging
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable, Collection
 from contextlib import asynccontextmanager
 from functools import partial
 from pathlib import Path
+from typing import Any
 
 from starlette.applications import Starlette
 from starlette.routing import Mount, WebSocketRoute
-from starlette.staticfiles import StaticFiles
 
 from storyville.build import build_site
+from storyville.catalog import clear_package_modules
+from storyville.lazy import LazySite
+from storyville.manifest import BuildManifest, DependencyGraph
+from storyville.memory_output import MemoryOutput
 from storyville.nodes import get_package_path
+from storyville.site_files import SiteFiles, SiteIndex, SiteSource
+from storyville.static_assets import CopyStrategy
+from storyville.subinterpreter_pool import DEFAULT_POOL_SIZE
 from storyville.watchers import watch_and_rebuild
 from storyville.websocket import broadcast_reload_async, websocket_endpoint
 
 logger = logging.getLogger(__name__)
 
 
+def _rebuild_with_fresh_imports(
+    package_location: str,
+    output_dir: Path,
+    should_cancel: Callable[[], bool] | None = None,
+    pages: Collection[str] | None = None,
+    **build_options: Any,
+) -> None:
+    """Rebuild in this interpreter after clearing the package's modules.
+
+    In-memory builds can't run in a subinterpreter, so this is how edits to
+    stories.py and component modules reach them.
+
+    Args:
+        package_location: The package to rebuild
+        output_dir: The output directory to pass to build_site
+        should_cancel: Passed to build_site
+        pages: Passed to build_site
+        **build_options: Other build_site options, e.g. memory
+    """
+    clear_package_modules(package_location)
+    build_site(
+        package_location,
+        output_dir,
+        should_cancel=should_cancel,
+        pages=pages,
+        **build_options,
+    )
+
+
 @asynccontextmanager
 async def lifespan(
     app: Starlette,
@@ -27,6 +63,11 @@ async def lifespan(
     output_dir: Path | None = None,
     use_subinterpreters: bool = False,
     with_assertions: bool = True,
+    incremental: bool = False,
+    atomic: bool = False,
+    static_strategy: CopyStrategy = CopyStrategy.COPY,
+    memory: MemoryOutput | None = None,
+    pool_size: int = DEFAULT_POOL_SIZE,
 ) -> AsyncIterator[None]:
     """Starlette lifespan context manager for hot reload watcher.
 
@@ -44,6 +85,12 @@ async def lifespan(
         output_dir: Output directory to rebuild to (optional)
         use_subinterpreters: Whether to use subinterpreters for builds (default: False)
         with_assertions: Whether to enable assertions during builds (default: True)
+        incremental: Whether rebuilds only re-render changed pages (default: False)
+        atomic: Whether rebuilds swap in a staged output directory (default: False)
+        static_strategy: How rebuilds place static assets (default: copy)
+        memory: In-memory output that rebuilds render into (optional)
+        pool_size: Number of subinterpreters kept warm for rebuilds
+            (default: DEFAULT_POOL_SIZE)
 
     Yields:
         None (no app state needed)
@@ -55,10 +102,17 @@ async def lifespan(
         from storyville.subinterpreter_pool import create_pool, shutdown_pool
 
         logger.info("Creating subinterpreter pool for hot reload...")
-        pool = create_pool()
+        pool = create_pool(pool_size)
         app.state.pool = pool
         logger.info("Subinterpreter pool created")
 
+    # Site served by the app: a built output, or pages rendered on request
+    site_index: SiteSource | None = getattr(app.state, "site_index", None)
+
+    # Index the built output before serving, off the event loop
+    if isinstance(site_index, SiteIndex):
+        await asyncio.to_thread(site_index.refresh)
+
     # Only start watcher if all required paths are provided
     if input_path and package_location and output_dir:
         logger.info("Starting hot reload watcher...")
@@ -73,7 +127,10 @@ async def lifespan(
         storyville_path = storyville_src if storyville_src.exists() else None
 
         # Determine which rebuild callback to use based on mode
-        if use_subinterpreters:
+        if isinstance(site_index, LazySite):
+            # Nothing to build: reload the catalog and drop rendered pages
+            rebuild_callback = site_index.rebuild
+        elif use_subinterpreters:
             from storyville.subinterpreter_pool import rebuild_callback_subinterpreter
 
             # Create async callback that uses subinterpreter
@@ -82,11 +139,50 @@ async def lifespan(
                 rebuild_callback_subinterpreter,
                 pool=app.state.pool,
                 with_assertions=with_assertions,
+                incremental=incremental,
+                atomic=atomic,
+                static_strategy=static_strategy,
+            )
+        elif memory is not None:
+            # Memory builds run here, so import the package's modules again
+            rebuild_callback = partial(
+                _rebuild_with_fresh_imports,
+                memory=memory,
+                with_assertions=with_assertions,
+                incremental=incremental,
+                static_strategy=static_strategy,
             )
         else:
             # Use direct build_site callback
-            # Bind with_assertions using partial
-            rebuild_callback = partial(build_site, with_assertions=with_assertions)
+            # Bind the build options using partial
+            rebuild_callback = partial(
+                build_site,
+                with_assertions=with_assertions,
+                incremental=incremental,
+                atomic=atomic,
+                static_strategy=static_strategy,
+            )
+
+        # Re-index the output after each rebuild, before browsers reload
+        async def refresh_site_index() -> None:
+            if isinstance(site_index, SiteIndex):
+                await asyncio.to_thread(site_index.refresh)
+
+        # Source files each page was built from, for targeted rebuilds
+        def load_dependencies() -> DependencyGraph | None:
+            if isinstance(site_index, LazySite):
+                return None
+            if memory is not None:
+                manifest = memory.manifest
+            else:
+                manifest = BuildManifest.load(output_dir)
+            return None if manifest is None else manifest.dependencies
+
+        # Story HTML for morphs, from memory when the output isn't on disk
+        def read_memory_story_html(story_id: str) -> str | None:
+            assert memory is not None
+            memory_file = memory.get(f"{story_id}/themed_story.html")
+            return None if memory_file is None else memory_file.data.decode("utf-8")
 
         # Create unified watcher task that watches, rebuilds, and broadcasts
         watcher_task = asyncio.create_task(
@@ -97,6 +193,9 @@ async def lifespan(
                 broadcast_callback=broadcast_reload_async,
                 package_location=package_location,
                 output_dir=output_dir,
+                after_rebuild=refresh_site_index,
+                dependencies=load_dependencies,
+                story_html=None if memory is None else read_memory_story_html,
             ),
             name="unified-watcher",
         )
@@ -144,6 +243,12 @@ def create_app(
     output_dir: Path | None = None,
     use_subinterpreters: bool = False,
     with_assertions: bool = True,
+    incremental: bool = False,
+    atomic: bool = False,
+    static_strategy: CopyStrategy = CopyStrategy.COPY,
+    memory: MemoryOutput | None = None,
+    lazy: bool = False,
+    pool_size: int = DEFAULT_POOL_SIZE,
 ) -> Starlette:
     """Create a Starlette application to serve a built Storyville site.
 
@@ -159,13 +264,33 @@ def create_app(
         with_assertions: Whether to enable assertion execution during rendering (default: True)
                         When True, assertions defined on stories will execute and display badges.
                         When False, assertion execution is skipped entirely.
+        incremental: Whether hot reload rebuilds are incremental (default: False)
+                    When True, only pages whose inputs changed are re-rendered.
+        atomic: Whether hot reload rebuilds are atomic (default: False)
+               When True, rebuilds are staged in a sibling directory and swapped
+               in when complete, so requests never see a half-built site.
+        static_strategy: How hot reload rebuilds place static assets (default: copy)
+                        Hard links, reflinks and symlinks avoid copying data when
+                        the output is on the same filesystem as the sources.
+        memory: Optional in-memory output to serve instead of path (default: None)
+               Hot reload rebuilds render into it, and only write to
+               output_dir if it was created with flush=True.
+        lazy: Whether to render pages on request, ignoring path (default: False)
+             Requires package_location. Hot reload reloads the catalog and
+             clears the rendered page cache instead of rebuilding.
+        pool_size: Number of subinterpreters for hot reload builds
+                  (default: DEFAULT_POOL_SIZE). Each is warmed up in the
+                  background when the app starts.
 
     Returns:
         Configured Starlette application instance ready to serve
 
-    The application serves all content via a single StaticFiles mount at the
-    root path with html=True for automatic index.html resolution. It also
-    provides a WebSocket endpoint at /ws/reload for hot reload functionality.
+    The application serves all content via a single SiteFiles mount at the
+    root path, which resolves directories to their index.html like
+    StaticFiles with html=True. Files are served from an in-memory index of
+    the output (app.state.site_index) with content-hash ETags, so repeat
+    page loads are answered with 304 Not Modified. It also provides a
+    WebSocket endpoint at /ws/reload for hot reload functionality.
 
     If input_path, package_location, and output_dir are provided, the app
     will start a unified file watcher during its lifespan to enable hot reload.
@@ -177,7 +302,29 @@ def create_app(
     allowing module changes (e.g., to stories.py) to take effect immediately.
     This is useful for development but adds slight overhead. The default (False)
     maintains backward compatibility with direct builds.
+
+    In-memory Mode:
+    When memory is given, the app serves the MemoryOutput that builds render
+    into, so the hot reload loop never writes pages to disk. Subinterpreter
+    builds can't share it, so the two can't be combined; instead, each
+    rebuild clears the package's modules from sys.modules first, so module
+    changes still take effect.
+
+    Lazy Mode:
+    When lazy=True, nothing needs to be built before serving. The catalog
+    is loaded from package_location and each page is rendered the first
+    time it is requested, then kept in an LRU cache. Static assets are
+    served from their source files.
     """
+    if memory is not None and use_subinterpreters:
+        msg = "An in-memory output can't be used with subinterpreter builds"
+        raise ValueError(msg)
+    if lazy and (package_location is None or use_subinterpreters or memory is not None):
+        msg = (
+            "Lazy rendering needs a package_location and can't be combined "
+            "with subinterpreter builds or an in-memory output"
+        )
+        raise ValueError(msg)
 
     # Create lifespan context manager with bound parameters
     @asynccontextmanager
@@ -189,20 +336,34 @@ def create_app(
             output_dir,
             use_subinterpreters,
             with_assertions,
+            incremental,
+            atomic,
+            static_strategy,
+            memory,
+            pool_size,
         ):
             yield
 
+    # Index the built site; the watcher refreshes it after each rebuild
+    site_index: SiteSource
+    if lazy:
+        assert package_location is not None
+        site_index = LazySite(package_location, with_assertions=with_assertions)
+    else:
+        site_index = SiteIndex(path if memory is None else memory)
+
     # Create the app
     starlette_app = Starlette(
         debug=True,
         routes=[
             WebSocketRoute("/ws/reload", websocket_endpoint),
-            Mount("/", app=StaticFiles(directory=path, html=True), name="site"),
+            Mount("/", app=SiteFiles(site_index), name="site"),
         ],
         lifespan=app_lifespan,
     )
 
-    # Store with_assertions flag in app state for view access
+    # Store the site index and with_assertions flag in app state
+    starlette_app.state.site_index = site_index
     starlette_app.state.with_assertions = with_assertions
 
     return starlette_app
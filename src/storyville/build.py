@@ -1,16 +1,33 @@
 """Called by the CLI main to build the catalog to disk."""
 
 import logging
+import os
+from collections.abc import Callable, Collection, Generator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from shutil import rmtree
-from time import perf_counter
-from typing import TYPE_CHECKING
+from queue import Queue
+from shutil import copy2, rmtree
+from threading import Thread
+from time import perf_counter, time_ns
+from typing import TYPE_CHECKING, Literal
 
 from storyville import PACKAGE_DIR
 from storyville.catalog.views import CatalogView
+from storyville.components.navigation_tree import NavigationIndex
 from storyville.components.themed_story import ThemedStory
+from storyville.compression import precompress_output, remove_compressed_siblings
+from storyville.manifest import MANIFEST_NAME, BuildManifest, Fingerprinter
+from storyville.memory_output import MemoryFile, MemoryOutput
 from storyville.section.views import SectionView
-from storyville.static_assets import copy_all_static_assets
+from storyville.static_assets import (
+    ASSET_MANIFEST_NAME,
+    AssetManifest,
+    CopyStrategy,
+    sync_all_static_assets,
+)
 from storyville.stories import make_catalog
 from storyville.story.views import StoryView
 from storyville.subject.views import SubjectView
@@ -22,175 +39,729 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# A rendered page: (path relative to the output directory, HTML)
+type RenderedPage = tuple[str, str]
 
-def _render_all_views(
-    catalog: "Catalog", with_assertions: bool
-) -> tuple[str, str, str, list, list, list, list]:
-    """Render all views to HTML strings.
+# Most rendered pages waiting for the writer thread before rendering blocks
+WRITE_QUEUE_SIZE = 64
 
-    Args:
-        catalog: The catalog to render
-        with_assertions: Whether to execute assertions during rendering
+# Most units per parallel rendering chunk; bounds the pages a worker returns at once
+MAX_CHUNK_UNITS = 32
 
-    Returns:
-        Tuple of (catalog_view, about_view, debug_view, rendered_sections,
-                 rendered_subjects, rendered_stories, rendered_themed_stories)
+
+class BuildCancelled(Exception):
+    """Raised when a build is stopped because newer changes superseded it."""
+
+
+def _check_cancelled(should_cancel: Callable[[], bool] | None) -> None:
+    """Stop the build if its caller no longer wants the result.
+
+    Raises:
+        BuildCancelled: If should_cancel returns True
     """
-    from storyville.components.navigation_tree import NavigationTree
+    if should_cancel is not None and should_cancel():
+        raise BuildCancelled("Build cancelled")
 
-    cached_nav = str(NavigationTree(sections=catalog.items, resource_path="")())
 
-    # Render the catalog index page (root) and convert to string
-    catalog_view = str(CatalogView(catalog=catalog, cached_navigation=cached_nav)())
+@dataclass(frozen=True)
+class PageUnit:
+    """One independently renderable piece of the catalog.
 
-    # Render the About page and convert to string
-    about_view = str(AboutView(site=catalog, cached_navigation=cached_nav)())
+    Units only carry keys, not tree nodes, so they can be pickled and
+    shipped to worker processes which look the nodes up in their own
+    copy of the catalog. A story unit renders both the story page and,
+    when a themed layout is configured, its themed_story.html.
+    """
 
-    # Render the Debug page and convert to string
-    debug_view = str(DebugView(site=catalog, cached_navigation=cached_nav)())
+    kind: Literal["catalog", "about", "debug", "section", "subject", "story"]
+    section_key: str = ""
+    subject_key: str = ""
+    story_idx: int = 0
 
-    # Walk the tree and render each section and subject
-    rendered_sections = []
-    rendered_subjects = []
-    rendered_stories = []
-    rendered_themed_stories = []
+    @property
+    def output_paths(self) -> tuple[str, ...]:
+        """Paths, relative to the output directory, this unit may write.
+
+        The first entry is the unit's primary page, which is always written.
+        """
+        match self.kind:
+            case "catalog":
+                return ("index.html",)
+            case "about":
+                return ("about.html",)
+            case "debug":
+                return ("debug.html",)
+            case "section":
+                return (f"{self.section_key}/index.html",)
+            case "subject":
+                return (f"{self.section_key}/{self.subject_key}/index.html",)
+            case "story":
+                story_dir = (
+                    f"{self.section_key}/{self.subject_key}/story-{self.story_idx}"
+                )
+                return (f"{story_dir}/index.html", f"{story_dir}/themed_story.html")
+
+
+def _iter_page_units(catalog: "Catalog") -> Iterator[PageUnit]:
+    """Yield a PageUnit for every page in the catalog, in tree order.
+
+    Args:
+        catalog: The catalog to walk
+
+    Yields:
+        PageUnit for the root pages, then each section, subject and story
+    """
+    yield PageUnit(kind="catalog")
+    yield PageUnit(kind="about")
+    yield PageUnit(kind="debug")
 
     for section_key, section in catalog.items.items():
-        # Render section index page and convert to string
-        section_view = str(
-            SectionView(
+        yield PageUnit(kind="section", section_key=section_key)
+        for subject_key, subject in section.items.items():
+            yield PageUnit(
+                kind="subject", section_key=section_key, subject_key=subject_key
+            )
+            for story_idx in range(len(subject.items)):
+                yield PageUnit(
+                    kind="story",
+                    section_key=section_key,
+                    subject_key=subject_key,
+                    story_idx=story_idx,
+                )
+
+
+def _render_navigation(catalog: "Catalog") -> NavigationIndex:
+    """Render the shared navigation tree once for all pages.
+
+    Args:
+        catalog: The catalog to render navigation for
+
+    Returns:
+        The navigation index that produces each page's variant
+    """
+    return NavigationIndex(catalog.items)
+
+
+def _render_unit(
+    catalog: "Catalog",
+    unit: PageUnit,
+    navigation: NavigationIndex,
+    with_assertions: bool,
+) -> list[RenderedPage]:
+    """Render the page(s) for one unit.
+
+    Args:
+        catalog: The catalog the unit's keys refer to
+        unit: The unit to render
+        navigation: Pre-rendered navigation, patched with the unit's open state
+        with_assertions: Whether to execute assertions during rendering
+
+    Returns:
+        List of (relative_path, html) pages produced by the unit
+    """
+    match unit.kind:
+        case "catalog":
+            catalog_view = CatalogView(
+                catalog=catalog, cached_navigation=navigation.render()
+            )
+            return [(unit.output_paths[0], catalog_view.render_html())]
+        case "about":
+            about_view = AboutView(site=catalog, cached_navigation=navigation.render())
+            return [(unit.output_paths[0], about_view.render_html())]
+        case "debug":
+            debug_view = DebugView(site=catalog, cached_navigation=navigation.render())
+            return [(unit.output_paths[0], debug_view.render_html())]
+        case "section":
+            section = catalog.items[unit.section_key]
+            section_view = SectionView(
                 section=section,
                 site=catalog,
-                cached_navigation=cached_nav,
+                cached_navigation=navigation.render(section.resource_path),
                 resource_path=section.resource_path,
-            )()
-        )
-        rendered_sections.append((section_key, section_view))
+            )
+            return [(unit.output_paths[0], section_view.render_html())]
+        case "subject":
+            subject = catalog.items[unit.section_key].items[unit.subject_key]
+            subject_view = SubjectView(
+                subject=subject,
+                site=catalog,
+                cached_navigation=navigation.render(subject.resource_path),
+                resource_path=subject.resource_path,
+            )
+            return [(unit.output_paths[0], subject_view.render_html())]
+        case "story":
+            subject = catalog.items[unit.section_key].items[unit.subject_key]
+            story = subject.items[unit.story_idx]
+            story_path, themed_story_path = unit.output_paths
 
-        # Walk subjects in this section
-        for subject_key, subject in section.items.items():
-            # Render subject index page and convert to string
-            subject_view = str(
-                SubjectView(
-                    subject=subject,
-                    site=catalog,
-                    cached_navigation=cached_nav,
-                    resource_path=subject.resource_path,
-                )()
+            # Pass with_assertions flag to StoryView
+            story_view = StoryView(
+                story=story,
+                site=catalog,
+                cached_navigation=navigation.render(story.resource_path),
+                with_assertions=with_assertions,
+                resource_path=story.resource_path,
             )
-            rendered_subjects.append((section_key, subject_key, subject_view))
-
-            # Walk stories in this subject
-            for story_idx, story in enumerate(subject.items):
-                # Render story index page and convert to string
-                # Pass with_assertions flag to StoryView
-                story_view = str(
-                    StoryView(
-                        story=story,
-                        site=catalog,
-                        cached_navigation=cached_nav,
-                        with_assertions=with_assertions,
-                        resource_path=story.resource_path,
-                    )()
-                )
-                rendered_stories.append(
-                    (section_key, subject_key, story_idx, story_view)
+            pages = [(story_path, story_view.render_html())]
+
+            # Render themed story if catalog has themed_layout configured,
+            # reusing the instance the story view (and its assertions) built
+            instance = story_view.rendered_instance
+            if catalog.themed_layout is not None and instance is not None:
+                themed_story = ThemedStory(
+                    story_title=story.title or "Untitled Story",
+                    children=instance,
+                    site=catalog,
                 )
+                pages.append((themed_story_path, str(themed_story())))
+            return pages
+
+
+def _iter_rendered_pages(
+    catalog: "Catalog",
+    with_assertions: bool,
+    units: list[PageUnit] | None = None,
+    navigation: NavigationIndex | None = None,
+) -> Generator[RenderedPage]:
+    """Render views to HTML strings in this process, one unit at a time.
+
+    Pages are yielded as soon as their unit is rendered, so a consumer
+    that writes and drops them keeps memory use independent of catalog size.
 
-                # Render themed story if catalog has themed_layout configured
-                if catalog.themed_layout is not None and story.instance is not None:
-                    themed_story = ThemedStory(
-                        story_title=story.title or "Untitled Story",
-                        children=story.instance,
-                        site=catalog,
-                    )
-                    themed_story_html = str(themed_story())
-                    rendered_themed_stories.append(
-                        (section_key, subject_key, story_idx, themed_story_html)
-                    )
-
-    return (
-        catalog_view,
-        about_view,
-        debug_view,
-        rendered_sections,
-        rendered_subjects,
-        rendered_stories,
-        rendered_themed_stories,
+    Args:
+        catalog: The catalog to render
+        with_assertions: Whether to execute assertions during rendering
+        units: Units to render (default: every unit in the catalog)
+        navigation: Pre-rendered navigation (default: render it here)
+
+    Yields:
+        (relative_path, html) pages, in tree order
+    """
+    if units is None:
+        units = list(_iter_page_units(catalog))
+    if navigation is None:
+        navigation = _render_navigation(catalog)
+
+    for unit in units:
+        yield from _render_unit(catalog, unit, navigation, with_assertions)
+
+
+# Per-process state for parallel rendering workers, set by _init_render_worker
+_worker_catalog: "Catalog | None" = None
+_worker_navigation: NavigationIndex | None = None
+_worker_with_assertions: bool = True
+
+
+def _init_render_worker(
+    package_location: str,
+    with_assertions: bool,
+    asset_manifest: AssetManifest | None = None,
+) -> None:
+    """Load the catalog once per worker process.
+
+    Tree nodes hold arbitrary user callables and aren't picklable, so
+    each worker builds its own catalog from the package location.
+
+    Args:
+        package_location: The package location to build from
+        with_assertions: Whether to execute assertions during rendering
+        asset_manifest: Fingerprinted asset names for pages to link to
+    """
+    global _worker_catalog, _worker_navigation, _worker_with_assertions
+
+    _worker_catalog = make_catalog(package_location=package_location)
+    if asset_manifest is not None:
+        _worker_catalog.static_assets = asset_manifest.discovered_assets()
+    _worker_navigation = _render_navigation(_worker_catalog)
+    _worker_with_assertions = with_assertions
+
+
+def _render_units_in_worker(
+    units: list[PageUnit],
+) -> tuple[int, float, list[RenderedPage]]:
+    """Render a chunk of units inside a worker process.
+
+    Args:
+        units: The units to render
+
+    Returns:
+        Tuple of (worker pid, rendering duration, rendered pages)
+    """
+    if _worker_catalog is None or _worker_navigation is None:
+        msg = "Render worker was not initialized with a catalog"
+        raise RuntimeError(msg)
+
+    start = perf_counter()
+    pages: list[RenderedPage] = []
+    for unit in units:
+        pages.extend(
+            _render_unit(
+                _worker_catalog, unit, _worker_navigation, _worker_with_assertions
+            )
+        )
+    return os.getpid(), perf_counter() - start, pages
+
+
+def _partition_units(units: list[PageUnit], jobs: int) -> list[list[PageUnit]]:
+    """Split units into chunks for the worker pool.
+
+    Several chunks per worker keep all workers busy when some subjects
+    are much more expensive to render than others. Chunks hold at most
+    MAX_CHUNK_UNITS units, so the pages a chunk sends back stay small.
+
+    Args:
+        units: All units to render
+        jobs: Number of worker processes
+
+    Returns:
+        Non-empty list of unit chunks
+    """
+    chunk_count = max(jobs * 4, -(-len(units) // MAX_CHUNK_UNITS))
+    chunk_count = max(1, min(len(units), chunk_count))
+    return [units[i::chunk_count] for i in range(chunk_count)]
+
+
+def _iter_rendered_pages_parallel(
+    package_location: str,
+    units: list[PageUnit],
+    with_assertions: bool,
+    jobs: int,
+    asset_manifest: AssetManifest | None = None,
+) -> Generator[RenderedPage]:
+    """Render views on a pool of worker processes.
+
+    At most two chunks per worker are in flight at a time and pages are
+    yielded as each chunk completes, so only a bounded number of rendered
+    pages is held in the parent process. Per-worker timings are logged so
+    the speedup over a serial build is visible. If the consumer stops
+    early, chunks that haven't started are cancelled.
+
+    Args:
+        package_location: The package location workers load the catalog from
+        units: The units to render
+        with_assertions: Whether to execute assertions during rendering
+        jobs: Number of worker processes
+        asset_manifest: Fingerprinted asset names for pages to link to
+
+    Yields:
+        (relative_path, html) pages, in completion order
+    """
+    worker_stats: dict[int, tuple[int, float]] = {}
+    chunks = iter(_partition_units(units, jobs))
+
+    executor = ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_render_worker,
+        initargs=(package_location, with_assertions, asset_manifest),
     )
+    try:
+        pending = {
+            executor.submit(_render_units_in_worker, chunk)
+            for chunk in islice(chunks, jobs * 2)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pid, duration, chunk_pages = future.result()
+                page_count, total_duration = worker_stats.get(pid, (0, 0.0))
+                worker_stats[pid] = (
+                    page_count + len(chunk_pages),
+                    total_duration + duration,
+                )
+
+                # Keep the workers busy while the pages are consumed
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    pending.add(executor.submit(_render_units_in_worker, next_chunk))
+
+                yield from chunk_pages
+    finally:
+        # When the build is cancelled or fails, drop the queued chunks
+        # instead of waiting for the workers to render them
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for pid, (page_count, total_duration) in sorted(worker_stats.items()):
+        logger.info(
+            f"Rendering worker {pid}: rendered {page_count} pages in {total_duration:.2f}s"
+        )
+
+
+def _next_manifest(
+    previous: BuildManifest,
+    units: list[PageUnit],
+    digests: dict[PageUnit, str],
+    rendered_units: list[PageUnit],
+    written_paths: set[str],
+) -> BuildManifest:
+    """Build the manifest describing the output after this build.
+
+    Rendered units record the pages they just produced. Skipped units
+    carry their entries over from the previous manifest.
+
+    Args:
+        previous: The manifest loaded before the build
+        units: Every unit in the catalog
+        digests: Input hash per unit
+        rendered_units: Units rendered by this build
+        written_paths: Paths of the pages rendered by this build
+
+    Returns:
+        The new manifest
+    """
+    rendered = set(rendered_units)
+    manifest = BuildManifest()
+    for unit in units:
+        known_paths = written_paths if unit in rendered else previous.pages.keys()
+        for path in unit.output_paths:
+            if path in known_paths:
+                manifest.pages[path] = digests[unit]
+    return manifest
+
+
+def _remove_stale_pages(
+    output_dir: Path, previous: BuildManifest, current: BuildManifest
+) -> int:
+    """Delete pages from the previous build that this build no longer produces.
+
+    Directories left empty are removed as well.
+
+    Args:
+        output_dir: The output directory
+        previous: The manifest loaded before the build
+        current: The manifest for this build
+
+    Returns:
+        Number of page files removed
+    """
+    removed = 0
+    for relative_path in sorted(previous.pages.keys() - current.pages.keys()):
+        path = output_dir / relative_path
+        if path.is_file():
+            path.unlink()
+            removed += 1
+        remove_compressed_siblings(path)
+
+        parent = path.parent
+        while parent != output_dir and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
+
+
+def _write_if_changed(path: Path, content: bytes) -> bool:
+    """Write content to path unless the file already holds the same bytes.
+
+    The size is compared first, so most changed files are detected from
+    a stat() alone; same-sized files are compared by content.
+
+    Args:
+        path: Destination file
+        content: Bytes to write
+
+    Returns:
+        True if the file was written, False if it was already identical
+    """
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    # Replace rather than overwrite, so readers never see a partial file
+    # and hard-linked files from a previous generation stay intact
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(content)
+    os.replace(temp_path, path)
+    return True
+
+
+class _PageWriter:
+    """Write rendered pages to disk on a background thread.
+
+    Pages go through a bounded queue: the renderer blocks once
+    WRITE_QUEUE_SIZE pages are waiting, so rendering can run ahead of
+    writing but never buffers the whole site. File writes release the
+    GIL, so writing overlaps with rendering.
+
+    Use as a context manager; leaving the block waits for every queued
+    page to be written and re-raises any error from the writer thread.
+
+    Attributes:
+        written: Number of files written
+        skipped: Number of files left alone because they were identical
+        paths: Relative paths of every page received
+    """
+
+    def __init__(self, output_dir: Path, max_pending: int = WRITE_QUEUE_SIZE) -> None:
+        self.output_dir = output_dir
+        self.written = 0
+        self.skipped = 0
+        self.paths: set[str] = set()
+        self._queue: Queue[RenderedPage | None] = Queue(maxsize=max_pending)
+        self._created_dirs: set[Path] = set()
+        self._error: BaseException | None = None
+        self._thread = Thread(target=self._run, name="storyville-writer", daemon=True)
+
+    def __enter__(self) -> "_PageWriter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    def put(self, page: RenderedPage) -> None:
+        """Queue a page for writing, blocking while the queue is full.
+
+        Args:
+            page: A (relative_path, html) page
+        """
+        if self._error is not None:
+            raise self._error
+        self.paths.add(page[0])
+        self._queue.put(page)
+
+    def _run(self) -> None:
+        """Write queued pages until the end-of-stream marker arrives."""
+        while (page := self._queue.get()) is not None:
+            if self._error is not None:
+                # Keep draining so the producer never blocks on a dead writer
+                continue
+            try:
+                self._write(*page)
+            except BaseException as e:
+                self._error = e
+
+    def _write(self, relative_path: str, page_html: str) -> None:
+        """Write one page, creating its directory on first use."""
+        path = self.output_dir / relative_path
+        if path.parent not in self._created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path.parent)
+        if _write_if_changed(path, page_html.encode("utf-8")):
+            self.written += 1
+        else:
+            self.skipped += 1
+
+
+class _MemoryWriter:
+    """Store rendered pages in the next generation of an in-memory output.
+
+    Has the same interface as _PageWriter. A page whose bytes are the
+    same as in the previous generation keeps its MemoryFile, so the
+    server's index recognizes it as unchanged.
+
+    Attributes:
+        written: Number of pages stored with new contents
+        skipped: Number of pages left alone because they were identical
+        paths: Relative paths of every page received
+    """
+
+    def __init__(self, files: dict[str, MemoryFile]) -> None:
+        self.files = files
+        self.written = 0
+        self.skipped = 0
+        self.paths: set[str] = set()
+
+    def __enter__(self) -> "_MemoryWriter":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        pass
+
+    def put(self, page: RenderedPage) -> None:
+        """Store a page.
+
+        Args:
+            page: A (relative_path, html) page
+        """
+        relative_path, page_html = page
+        self.paths.add(relative_path)
+        if _store_if_changed(self.files, relative_path, page_html.encode("utf-8")):
+            self.written += 1
+        else:
+            self.skipped += 1
+
+
+def _store_if_changed(files: dict[str, MemoryFile], path: str, content: bytes) -> bool:
+    """Store content in an in-memory generation unless it is already there.
+
+    Args:
+        files: The generation being built
+        path: Path relative to the output
+        content: Bytes to store
+
+    Returns:
+        True if the file was stored, False if it was already identical
+    """
+    previous = files.get(path)
+    if previous is not None and previous.data == content:
+        return False
+    files[path] = MemoryFile(content)
+    return True
+
+
+def _remove_stale_memory_pages(
+    files: dict[str, MemoryFile], previous: BuildManifest, current: BuildManifest
+) -> int:
+    """Drop pages from an in-memory generation that this build no longer produces.
+
+    Args:
+        files: The generation being built
+        previous: The manifest of the previous generation
+        current: The manifest for this build
+
+    Returns:
+        Number of pages removed
+    """
+    removed = 0
+    for relative_path in previous.pages.keys() - current.pages.keys():
+        if files.pop(relative_path, None) is not None:
+            removed += 1
+    return removed
 
 
 def _write_all_files(
-    output_dir: Path,
-    catalog_view: str,
-    about_view: str,
-    debug_view: str,
-    rendered_sections: list,
-    rendered_subjects: list,
-    rendered_stories: list,
-    rendered_themed_stories: list,
-) -> None:
-    """Write all rendered HTML files to disk.
+    output_dir: Path, pages: Iterable[RenderedPage]
+) -> tuple[int, int]:
+    """Write rendered HTML files to disk, skipping identical files.
+
+    Leaving identical files alone keeps their mtimes stable, so file
+    watchers and sync tools downstream only see pages that changed.
 
     Args:
         output_dir: The output directory
-        catalog_view: Rendered catalog index page
-        about_view: Rendered about page
-        debug_view: Rendered debug page
-        rendered_sections: List of (section_key, section_view) tuples
-        rendered_subjects: List of (section_key, subject_key, subject_view) tuples
-        rendered_stories: List of (section_key, subject_key, story_idx, story_view) tuples
-        rendered_themed_stories: List of (section_key, subject_key, story_idx, themed_story_html) tuples
+        pages: Iterable of (relative_path, html) pages
+
+    Returns:
+        Tuple of (files written, files skipped as unchanged)
+    """
+    with _PageWriter(output_dir) as writer:
+        for page in pages:
+            writer.put(page)
+    return writer.written, writer.skipped
+
+
+def _prepare_staging_dir(output_dir: Path) -> Path:
+    """Create a sibling staging directory seeded from the current output.
+
+    Every file of the current generation is hard-linked into the staging
+    directory, so unchanged pages and static assets cost nothing to keep.
+    Writers replace files rather than writing into them, which leaves the
+    linked files of the live generation untouched.
+
+    Args:
+        output_dir: The published output directory
+
+    Returns:
+        Path to the empty-or-seeded staging directory
+    """
+    staging_dir = output_dir.with_name(f".{output_dir.name}.staging")
+    if staging_dir.exists():
+        # Leftover from an interrupted build
+        rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
+
+    if not output_dir.exists():
+        return staging_dir
+
+    current_dir = output_dir.resolve()
+    for item in current_dir.iterdir():
+        if item.is_symlink():
+            continue
+        if item.is_file():
+            _link_or_copy(item, staging_dir / item.name)
+            continue
+        for dirpath, _dirnames, filenames in os.walk(item):
+            target_dir = staging_dir / Path(dirpath).relative_to(current_dir)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            for filename in filenames:
+                _link_or_copy(Path(dirpath) / filename, target_dir / filename)
+
+    return staging_dir
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link source to target, copying if links aren't supported."""
+    try:
+        os.link(source, target)
+    except OSError:
+        copy2(source, target)
+
+
+def _swap_output_dir(staging_dir: Path, output_dir: Path) -> None:
+    """Publish the staging directory at output_dir.
+
+    If output_dir is a symlink, the new generation is published by
+    atomically replacing the link. Otherwise the current directory is
+    renamed aside and the staging directory renamed into place, leaving
+    only the gap between two renames in which the path is missing.
+
+    Args:
+        staging_dir: The fully built staging directory
+        output_dir: The published output directory
+    """
+    if output_dir.is_symlink():
+        previous_target = output_dir.resolve()
+        generation = output_dir.with_name(f".{output_dir.name}.{time_ns()}")
+        staging_dir.rename(generation)
+
+        temp_link = output_dir.with_name(f".{output_dir.name}.link")
+        temp_link.unlink(missing_ok=True)
+        temp_link.symlink_to(generation.name)
+        os.replace(temp_link, output_dir)
+
+        # Only remove generations this function created
+        if previous_target.name.startswith(f".{output_dir.name}."):
+            rmtree(previous_target, ignore_errors=True)
+        return
+
+    previous_dir = output_dir.with_name(f".{output_dir.name}.previous")
+    if previous_dir.exists():
+        rmtree(previous_dir)
+    if output_dir.exists():
+        output_dir.rename(previous_dir)
+    staging_dir.rename(output_dir)
+    rmtree(previous_dir, ignore_errors=True)
+
+
+def _package_input_dir(package_location: str) -> Path:
+    """Find the directory of the package being built.
+
+    Args:
+        package_location: The package location to build from
+
+    Returns:
+        The package directory, whose static/ folders are published
     """
-    # Write catalog pages
-    (output_dir / "index.html").parent.mkdir(parents=True, exist_ok=True)
-    (output_dir / "index.html").write_text(catalog_view)
-    (output_dir / "about.html").parent.mkdir(parents=True, exist_ok=True)
-    (output_dir / "about.html").write_text(about_view)
-    (output_dir / "debug.html").parent.mkdir(parents=True, exist_ok=True)
-    (output_dir / "debug.html").write_text(debug_view)
-
-    # Write sections
-    for section_key, section_view in rendered_sections:
-        section_dir = output_dir / section_key
-        path = section_dir / "index.html"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(section_view)
-
-    # Write subjects
-    for section_key, subject_key, subject_view in rendered_subjects:
-        section_dir = output_dir / section_key
-        subject_dir = section_dir / subject_key
-        path = subject_dir / "index.html"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(subject_view)
-
-    # Write stories
-    for section_key, subject_key, story_idx, story_view in rendered_stories:
-        section_dir = output_dir / section_key
-        subject_dir = section_dir / subject_key
-        story_dir = subject_dir / f"story-{story_idx}"
-        path = story_dir / "index.html"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(story_view)
-
-    # Write themed stories
-    for (
-        section_key,
-        subject_key,
-        story_idx,
-        themed_story_html,
-    ) in rendered_themed_stories:
-        section_dir = output_dir / section_key
-        subject_dir = section_dir / subject_key
-        story_dir = subject_dir / f"story-{story_idx}"
-        path = story_dir / "themed_story.html"
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(themed_story_html)
+    from importlib.util import find_spec
+
+    spec = find_spec(package_location)
+    if spec is None or spec.origin is None:
+        # Fallback: treat package_location as file path
+        input_dir = Path(package_location).resolve()
+        if input_dir.is_file():
+            input_dir = input_dir.parent
+        return input_dir
+    return Path(spec.origin).parent
 
 
 def build_catalog(
-    package_location: str, output_dir: Path, with_assertions: bool = True
+    package_location: str,
+    output_dir: Path,
+    with_assertions: bool = True,
+    jobs: int = 1,
+    incremental: bool = False,
+    atomic: bool = False,
+    static_strategy: CopyStrategy = CopyStrategy.COPY,
+    fingerprint: bool = False,
+    precompress: bool = False,
+    memory: MemoryOutput | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    pages: Collection[str] | None = None,
+    write_manifest: bool = True,
 ) -> None:
     """Write the static files and story info to the output directory.
 
@@ -198,21 +769,118 @@ def build_catalog(
         package_location: The package location to build from
         output_dir: The output directory to write the built catalog to
         with_assertions: Whether to execute assertions during rendering (default: True)
+        jobs: Number of worker processes for rendering (default: 1, render in-process)
+        incremental: Keep the previous output and only re-render pages whose
+            inputs changed since the last build (default: False)
+        atomic: Build into a sibling staging directory and swap it into
+            place when complete (default: False)
+        static_strategy: How static assets are placed in the output: copied,
+            hard-linked, reflinked or symlinked (default: copy)
+        fingerprint: Also publish each static file under a content-hashed
+            name, link pages to those names and write an asset manifest
+            (default: False)
+        precompress: Write .gz (and .br, with brotli installed) siblings
+            of large HTML, CSS and JS files for the server (default: False)
+        memory: Build into this in-memory output instead of output_dir,
+            which is only written to if the output flushes (default: None)
+        should_cancel: Polled between pages and phases; once it returns True
+            the build stops with BuildCancelled (default: None)
+        pages: Primary page paths to re-render even if their inputs look
+            unchanged; implies incremental, so other pages are kept unless
+            their inputs changed (default: None)
+        write_manifest: Record each page's input hash and dependencies in
+            a manifest in the output directory; incremental, atomic and
+            memory builds always do (default: True)
+
+    Raises:
+        BuildCancelled: If should_cancel asked the build to stop
 
     The builder:
     1. Clears the output directory if it exists and is not empty
     2. Creates a catalog from the package location
     3. Walks the tree and renders each view (catalog, sections, subjects, stories) to disk as index.html
     4. Renders About and Debug pages
-    5. Discovers and copies static assets from both src/storyville and input_dir
+    5. Discovers static assets from both src/storyville and input_dir and
+       syncs them into static/, copying only new or changed files
+
+    With jobs > 1, pages are rendered on a process pool. Each worker loads
+    its own catalog and renders chunks of sections, subjects and stories.
+
+    With write_manifest, the build records a hash of each page's inputs in
+    a manifest in the output directory. Without it, and unless another
+    mode needs them, pages aren't fingerprinted and any previous manifest
+    is removed, since it no longer describes the output. In incremental mode the output directory is not
+    cleared; pages whose hash matches the manifest are neither rendered nor
+    written, and pages that no longer exist in the catalog are removed.
+    The manifest also records the package source files each page depends
+    on, which the hot reload watcher uses to pass the affected pages.
+
+    In atomic mode the output directory is never cleared or partially
+    written. The staging directory starts as a hard-linked copy of the
+    current generation, so unchanged pages are reused, and is swapped in
+    once the build has finished. A failed build leaves the output as it was.
+
+    In fingerprint mode, static files are hashed while reading and pages
+    link to names such as pico-main.3f9a1c2b7d.css, which change whenever
+    the content does and can be cached forever. The original names are
+    kept for references between static files, and asset-manifest.json in
+    the output maps each reference to its fingerprinted name.
+
+    With precompress, a final phase compresses pages and static assets on
+    a thread pool. Siblings keep their source's mtime, so files that the
+    writer or the static sync left alone aren't compressed again.
+
+    With memory, pages, static assets and the asset manifest are stored in
+    the MemoryOutput and published together when the build finishes, so
+    memory builds are always atomic and static_strategy doesn't apply.
+    Unchanged pages keep their stored bytes. If the output flushes, the
+    files that changed are then written to output_dir.
+
+    A cancelled build stops before it publishes anything. Atomic and memory
+    builds leave the current output as it was; other builds may leave it
+    partly rewritten, for the build that superseded them to complete.
     """
+    if jobs < 1:
+        msg = f"jobs must be at least 1, got {jobs}"
+        raise ValueError(msg)
+    if memory is not None and precompress:
+        msg = "precompress is not supported when building into memory"
+        raise ValueError(msg)
+    if pages is not None:
+        # A targeted rebuild keeps the rest of the previous output
+        incremental = True
+    # Reusing or publishing the previous output needs page input hashes
+    write_manifest = write_manifest or incremental or atomic or memory is not None
+
+    # Directory this build writes into: the output itself or a staging copy
+    if atomic and memory is None:
+        build_dir = _prepare_staging_dir(output_dir)
+    else:
+        build_dir = output_dir
+
+    # Next in-memory generation, starting from the current one
+    files: dict[str, MemoryFile] = {}
+    if memory is not None:
+        files = memory.snapshot()
+        previous_manifest = memory.manifest or BuildManifest()
+    elif incremental or atomic:
+        previous_manifest = BuildManifest.load(build_dir)
+    else:
+        previous_manifest = BuildManifest()
 
     # Clear output directory if it exists and is not empty
-    if output_dir.exists():
+    if memory is not None:
+        # Nothing to clear: a flush only replaces files it wrote before
+        pass
+    elif incremental or atomic:
+        # Keep the previous output so unchanged pages can be reused
+        build_dir.mkdir(parents=True, exist_ok=True)
+    elif build_dir.exists():
         # Remove all contents
-        for item in output_dir.iterdir():
-            if item.is_symlink():
-                # Skip symlinks (e.g., pytest's "current" links)
+        for item in build_dir.iterdir():
+            if item.is_symlink() or item.name == "static":
+                # Skip symlinks (e.g., pytest's "current" links) and static/,
+                # which the static assets phase syncs in place
                 continue
             elif item.is_dir():
                 rmtree(item)
@@ -220,81 +888,181 @@ def build_catalog(
                 item.unlink()
     else:
         # Create output directory
-        output_dir.mkdir(parents=True, exist_ok=True)
+        build_dir.mkdir(parents=True, exist_ok=True)
 
     # Phase 1: Reading - Load content from filesystem
     start_reading = perf_counter()
     catalog = make_catalog(package_location=package_location)
+    input_dir = _package_input_dir(package_location)
+    asset_manifest = (
+        AssetManifest.from_sources(PACKAGE_DIR, input_dir) if fingerprint else None
+    )
+    if asset_manifest is not None:
+        catalog.static_assets = asset_manifest.discovered_assets()
     end_reading = perf_counter()
     reading_duration = end_reading - start_reading
     logger.info(f"Phase Reading: completed in {reading_duration:.2f}s")
+    _check_cancelled(should_cancel)
 
     # Phase 2: Rendering - Process views and generate HTML
     start_rendering = perf_counter()
 
-    (
-        catalog_view,
-        about_view,
-        debug_view,
-        rendered_sections,
-        rendered_subjects,
-        rendered_stories,
-        rendered_themed_stories,
-    ) = _render_all_views(catalog, with_assertions)
+    navigation = _render_navigation(catalog)
+    units = list(_iter_page_units(catalog))
+    fingerprinter = None
+    digests: dict[PageUnit, str] = {}
+    if write_manifest:
+        fingerprinter = Fingerprinter(
+            catalog=catalog,
+            package_location=package_location,
+            navigation=navigation.closed_html,
+            with_assertions=with_assertions,
+        )
+        digests = {unit: fingerprinter.unit_digest(unit) for unit in units}
+
+    if incremental:
+        targeted = frozenset(() if pages is None else pages)
+        stale_units = [
+            unit
+            for unit in units
+            if unit.output_paths[0] in targeted
+            or not previous_manifest.is_current(
+                unit, digests[unit], build_dir if memory is None else files
+            )
+        ]
+        logger.info(
+            f"Incremental build: {len(stale_units)} of {len(units)} page units changed"
+        )
+    else:
+        stale_units = units
 
-    end_rendering = perf_counter()
-    rendering_duration = end_rendering - start_rendering
-    logger.info(f"Phase Rendering: completed in {rendering_duration:.2f}s")
+    if jobs > 1 and stale_units:
+        rendered = _iter_rendered_pages_parallel(
+            package_location, stale_units, with_assertions, jobs, asset_manifest
+        )
+    else:
+        rendered = _iter_rendered_pages(
+            catalog, with_assertions, stale_units, navigation
+        )
 
     # Phase 3: Writing - Write files to disk
-    start_writing = perf_counter()
-
-    _write_all_files(
-        output_dir,
-        catalog_view,
-        about_view,
-        debug_view,
-        rendered_sections,
-        rendered_subjects,
-        rendered_stories,
-        rendered_themed_stories,
-    )
+    # Pages stream from the renderer into the writer thread, so writing
+    # overlaps rendering; this phase times the remaining queue drain.
+    writer = _PageWriter(build_dir) if memory is None else _MemoryWriter(files)
+    # Closing the renderer stops parallel workers if writing stops early
+    with writer, closing(rendered):
+        for page in rendered:
+            _check_cancelled(should_cancel)
+            writer.put(page)
+
+        end_rendering = perf_counter()
+        rendering_duration = end_rendering - start_rendering
+        logger.info(f"Phase Rendering: completed in {rendering_duration:.2f}s")
+
+        start_writing = perf_counter()
+
+    written_count, skipped_count = writer.written, writer.skipped
+
+    manifest = BuildManifest()
+    if fingerprinter is not None:
+        manifest = _next_manifest(
+            previous_manifest, units, digests, stale_units, writer.paths
+        )
+        manifest.dependencies = fingerprinter.dependency_graph(units)
+    if memory is None:
+        removed_count = _remove_stale_pages(build_dir, previous_manifest, manifest)
+        if fingerprinter is not None:
+            manifest.save(build_dir)
+        else:
+            (build_dir / MANIFEST_NAME).unlink(missing_ok=True)
+    else:
+        removed_count = _remove_stale_memory_pages(files, previous_manifest, manifest)
+    if removed_count:
+        logger.info(f"Removed {removed_count} stale pages")
 
     end_writing = perf_counter()
     writing_duration = end_writing - start_writing
-    logger.info(f"Phase Writing: completed in {writing_duration:.2f}s")
+    logger.info(
+        f"Phase Writing: wrote {written_count} files, skipped {skipped_count} "
+        f"unchanged, completed in {writing_duration:.2f}s"
+    )
 
     # Phase 4: Static Assets - Discover and copy static assets
+    _check_cancelled(should_cancel)
     start_static = perf_counter()
 
-    # Determine input_dir from package_location
-    from importlib.util import find_spec
-
-    spec = find_spec(package_location)
-    if spec is None or spec.origin is None:
-        # Fallback: treat package_location as file path
-        input_dir = Path(package_location).resolve()
-        if input_dir.is_file():
-            input_dir = input_dir.parent
+    # Sync all static assets from both sources to single static/ directory
+    fingerprints = None if asset_manifest is None else asset_manifest.assets
+    if memory is None:
+        static_stats = sync_all_static_assets(
+            storyville_base=PACKAGE_DIR,
+            input_dir=input_dir,
+            output_dir=build_dir,
+            strategy=static_strategy,
+            fingerprints=fingerprints,
+        )
+        if asset_manifest is not None:
+            asset_manifest.save(build_dir)
+        else:
+            (build_dir / ASSET_MANIFEST_NAME).unlink(missing_ok=True)
     else:
-        input_dir = Path(spec.origin).parent
-
-    # Copy all static assets from both sources to single static/ directory
-    file_count = copy_all_static_assets(
-        storyville_base=PACKAGE_DIR,
-        input_dir=input_dir,
-        output_dir=output_dir,
-    )
+        static_stats = memory.load_static_assets(
+            files, PACKAGE_DIR, input_dir, fingerprints
+        )
+        if asset_manifest is not None:
+            _store_if_changed(
+                files, ASSET_MANIFEST_NAME, asset_manifest.dumps().encode("utf-8")
+            )
+        else:
+            files.pop(ASSET_MANIFEST_NAME, None)
 
     end_static = perf_counter()
     static_duration = end_static - start_static
     logger.info(
-        f"Phase Static Assets: copied {file_count} files in {static_duration:.2f}s"
+        f"Phase Static Assets: copied {static_stats.copied} files "
+        f"({static_stats.bytes_copied} bytes), linked {static_stats.linked}, "
+        f"skipped {static_stats.unchanged} "
+        f"unchanged, removed {static_stats.removed}, "
+        f"completed in {static_duration:.2f}s"
     )
 
+    # Phase 5: Compression - Precompressed siblings for the server
+    compression_duration = 0.0
+    if precompress:
+        start_compression = perf_counter()
+        compression_stats = precompress_output(build_dir)
+        end_compression = perf_counter()
+        compression_duration = end_compression - start_compression
+        logger.info(
+            f"Phase Compression: compressed {compression_stats.compressed} files, "
+            f"skipped {compression_stats.unchanged} unchanged, "
+            f"removed {compression_stats.removed} stale, "
+            f"completed in {compression_duration:.2f}s"
+        )
+
+    _check_cancelled(should_cancel)
+    if memory is not None:
+        memory.publish(files, manifest)
+        logger.info(f"Published build generation {memory.generation} in memory")
+        if memory.flush:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            flushed_count, unflushed_count = memory.flush_to(output_dir)
+            manifest.save(output_dir)
+            logger.info(
+                f"Flushed {flushed_count} files to {output_dir}, "
+                f"removed {unflushed_count}"
+            )
+    elif atomic:
+        _swap_output_dir(build_dir, output_dir)
+        logger.info(f"Published new build at {output_dir}")
+
     # Log total build time
     total_duration = (
-        reading_duration + rendering_duration + writing_duration + static_duration
+        reading_duration
+        + rendering_duration
+        + writing_duration
+        + static_duration
+        + compression_duration
     )
     logger.info(f"Build completed in {total_duration:.2f}s")
 
@@ -1,6 +1,6 @@
 """Catalog package for top-level catalog organization."""
 
-from storyville.catalog.helpers import find_path, make_catalog
+from storyville.catalog.helpers import clear_package_modules, find_path, make_catalog
 from storyville.catalog.models import Catalog
 
-__all__ = ["Catalog", "make_catalog", "find_path"]
+__all__ = ["Catalog", "make_catalog", "find_path", "clear_package_modules"]
@@ -1,5 +1,8 @@
 """Catalog helper functions."""
 
+import importlib
+import logging
+import sys
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -9,6 +12,8 @@ if TYPE_CHECKING:
 
 from storyville.catalog.models import Catalog
 
+logger = logging.getLogger(__name__)
+
 
 def make_catalog(package_location: str) -> Catalog:
     """Create a catalog with a populated tree.
@@ -75,6 +80,38 @@ def make_catalog(package_location: str) -> Catalog:
     return catalog
 
 
+def clear_package_modules(package_location: str) -> None:
+    """Clear a user package's modules from sys.modules.
+
+    The next make_catalog() then imports every stories.py and component
+    module again, so edits since the last import take effect. Framework
+    modules (storyville, tdom) stay imported.
+
+    Args:
+        package_location: Package location string (e.g., "examples.basic");
+            every module under its top-level package is cleared
+    """
+    # e.g., "examples.basic" -> "examples"
+    package_prefix = package_location.split(".")[0]
+
+    modules_to_clear = [
+        module_name
+        for module_name in list(sys.modules.keys())
+        if module_name.startswith(package_prefix + ".") or module_name == package_prefix
+    ]
+    for module_name in modules_to_clear:
+        del sys.modules[module_name]
+    # Modules added since the last import must be found too
+    importlib.invalidate_caches()
+
+    if modules_to_clear:
+        logger.info(
+            f"Cleared {len(modules_to_clear)} user modules from sys.modules: {package_prefix}.*"
+        )
+    else:
+        logger.info(f"No cached modules found for {package_prefix}.*")
+
+
 def find_path(
     catalog: Catalog, path: str
 ) -> Catalog | Section | Subject | Story | None:
@@ -10,6 +10,7 @@ from storyville.nodes import BaseNode
 
 if TYPE_CHECKING:
     from storyville.section import Section
+    from storyville.static_assets.rewriting import DiscoveredAssets
 
 
 @dataclass
@@ -18,8 +19,12 @@ class Catalog(BaseNode["Catalog"]):
 
     The catalog contains the organized collections of stories, with
     logic to render to disk.
+
+    When static_assets is set, the Layout resolves its static/ references
+    through it, e.g. to the fingerprinted names of a fingerprinted build.
     """
 
     parent: None = None
     items: dict[str, Section] = field(default_factory=dict)
     themed_layout: Callable[..., Node] | None = None
+    static_assets: DiscoveredAssets | None = None
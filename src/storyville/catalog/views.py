@@ -28,11 +28,11 @@ class CatalogView:
     catalog: Catalog
     cached_navigation: str | None = None
 
-    def __call__(self) -> Node:
-        """Render the catalog to a tdom Node.
+    def layout(self) -> Layout:
+        """Build the Layout wrapping the catalog content.
 
         Returns:
-            A tdom Node representing the rendered catalog.
+            The Layout for this page, renderable as a Node or as a string.
         """
         # Conditionally render sections or empty state
         if not self.catalog.items:
@@ -73,12 +73,30 @@ class CatalogView:
 
         # Create the main content for this view
         # Note: Layout still uses 'site' parameter name for backward compatibility
-        view_content = html(t"""\
-<{Layout} view_title="Home" site={self.catalog} depth={0} cached_navigation={self.cached_navigation}>
+        return Layout(
+            view_title="Home",
+            site=self.catalog,
+            children=html(t"""\
 <div>
 <h1>{self.catalog.title}</h1>
 {content}
-</div>
-</{Layout}>""")
+</div>"""),
+            depth=0,
+            cached_navigation=self.cached_navigation,
+        )
 
-        return view_content
+    def __call__(self) -> Node:
+        """Render the catalog to a tdom Node.
+
+        Returns:
+            A tdom Node representing the rendered catalog.
+        """
+        return self.layout()()
+
+    def render_html(self) -> str:
+        """Render the catalog to an HTML string using the compiled layout shell.
+
+        Returns:
+            The complete HTML document.
+        """
+        return self.layout().render_html()
@@ -5,17 +5,76 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from markupsafe import Markup
 from tdom import Element, Fragment, Node, html
 
 from storyville.components.aside.aside import LayoutAside
 from storyville.components.footer.footer import LayoutFooter
 from storyville.components.header.header import LayoutHeader
 from storyville.components.main.main import LayoutMain
-from storyville.utils import rewrite_static_paths
+from storyville.components.navigation_tree import NavigationTree
+from storyville.static_assets import (
+    rewrite_static_paths as rewrite_asset_paths,
+    rewrite_static_paths_html as rewrite_asset_paths_html,
+)
+from storyville.utils import rewrite_static_paths, rewrite_static_paths_html
 
 if TYPE_CHECKING:
     from storyville.catalog.models import Catalog
 
+# Placeholders rendered into the shell where per-page content is spliced in
+_NAVIGATION_SLOT = "<!--storyville-slot:navigation-->"
+_MAIN_SLOT = "<!--storyville-slot:main-->"
+_TITLE_SLOT = "storyville-slot-title"
+
+
+@dataclass(frozen=True)
+class LayoutShell:
+    """Pre-rendered Layout document with holes for per-page content.
+
+    The head, scripts, header and footer only depend on the site title
+    and the page depth, so they are rendered and path-rewritten once.
+    A page is then the concatenation of these chunks with its title,
+    navigation and main element.
+
+    Attributes:
+        chunks: The static HTML before, between and after the three slots
+    """
+
+    chunks: tuple[str, str, str, str]
+
+    def splice(self, title: str, navigation: str, main: str) -> str:
+        """Join the static chunks with a page's rendered slots.
+
+        Args:
+            title: The rendered <title> element
+            navigation: The rendered navigation tree
+            main: The rendered <main> element
+
+        Returns:
+            The complete HTML document
+        """
+        before_title, before_navigation, before_main, after_main = self.chunks
+        return "".join(
+            (
+                before_title,
+                title,
+                before_navigation,
+                navigation,
+                before_main,
+                main,
+                after_main,
+            )
+        )
+
+
+# Compiled shells keyed by (site title, depth, static assets); None when a
+# shell can't be split
+_shells: dict[tuple[str | None, int, object], LayoutShell | None] = {}
+
+# Shells kept at once; rebuilds with a new title or asset map evict the oldest
+MAX_SHELLS = 32
+
 
 @dataclass
 class Layout:
@@ -49,17 +108,20 @@ class Layout:
     resource_path: str = ""
     cached_navigation: str | None = None
 
+    @property
+    def title_text(self) -> str | None:
+        """The document title: view title and site title, or just the site title."""
+        if self.view_title is not None:
+            return f"{self.view_title} - {self.site.title}"
+        return self.site.title
+
     def __call__(self) -> Node:
         """Render the layout to a tdom Node.
 
         Returns:
             A tdom Node representing the complete HTML document.
         """
-        # Build title with concatenation logic
-        if self.view_title is not None:
-            title_text = f"{self.view_title} - {self.site.title}"
-        else:
-            title_text = self.site.title
+        title_text = self.title_text
 
         # Use paths relative to this component file
         # static/ refers to the static folder in the output, with full nested path
@@ -90,4 +152,105 @@ class Layout:
 """)
 
         # Rewrite static/ paths to be relative to page location
-        return rewrite_static_paths(result, depth=self.depth)
+        return self._rewrite_static_paths(result)
+
+    def _rewrite_static_paths(self, node: Node) -> Node:
+        """Make static/ references relative to the page's depth.
+
+        With a site asset map, references are resolved through it first,
+        e.g. to fingerprinted file names. References missing from the map
+        only get the depth prefix.
+        """
+        assets = self.site.static_assets
+        if assets is not None:
+            # The asset rewriter's page depth counts from one level below the root
+            rewrite_asset_paths(node, self.depth - 1, assets)
+        # Resolved references already start with ../ (or are at the root)
+        return rewrite_static_paths(node, depth=self.depth)
+
+    def _rewrite_static_paths_html(self, html_text: str) -> str:
+        """Like _rewrite_static_paths(), for HTML that is already serialized."""
+        assets = self.site.static_assets
+        if assets is not None:
+            html_text = rewrite_asset_paths_html(html_text, self.depth - 1, assets)
+        return rewrite_static_paths_html(html_text, depth=self.depth)
+
+    def render_html(self) -> str:
+        """Render the layout straight to an HTML string.
+
+        Produces the same document as ``str(self())`` but reuses a shell
+        compiled once per (site title, depth, static assets). Only the title, navigation
+        and main element are rendered for each page.
+
+        Returns:
+            The complete HTML document as a string.
+        """
+        shell = _layout_shell(self.site, self.depth)
+        if shell is None:
+            return str(self())
+
+        title = str(html(t"<title>{self.title_text}</title>"))
+        if self.cached_navigation is not None:
+            navigation = self.cached_navigation
+        else:
+            navigation_tree = NavigationTree(
+                sections=self.site.items, resource_path=self.resource_path
+            )
+            navigation = str(navigation_tree())
+        main = LayoutMain(resource_path=self.resource_path, children=self.children)()
+        # Rewrite while serializing instead of walking the page's tree
+        main_html = self._rewrite_static_paths_html(str(main))
+        return shell.splice(title, navigation, main_html)
+
+
+def _layout_shell(site: Catalog, depth: int) -> LayoutShell | None:
+    """Return the compiled shell for a site and depth, compiling it once.
+
+    Args:
+        site: The catalog the page belongs to
+        depth: The page depth in the output directory
+
+    Returns:
+        The shell, or None if the rendered document couldn't be split
+    """
+    assets = site.static_assets
+    key = (site.title, depth, None if assets is None else assets.cache_key)
+    if key not in _shells:
+        if len(_shells) >= MAX_SHELLS:
+            # Dicts keep insertion order, so the first key is the oldest
+            del _shells[next(iter(_shells))]
+        _shells[key] = _compile_shell(site, depth)
+    return _shells[key]
+
+
+def _compile_shell(site: Catalog, depth: int) -> LayoutShell | None:
+    """Render a Layout with placeholders and split it around them.
+
+    Args:
+        site: The catalog the page belongs to
+        depth: The page depth in the output directory
+
+    Returns:
+        The shell, or None if a placeholder can't be found exactly once
+    """
+    layout = Layout(
+        view_title=_TITLE_SLOT,
+        site=site,
+        children=Markup(_MAIN_SLOT),
+        depth=depth,
+        cached_navigation=_NAVIGATION_SLOT,
+    )
+    document = str(layout())
+
+    title = str(html(t"<title>{layout.title_text}</title>"))
+    main = str(LayoutMain(children=Markup(_MAIN_SLOT))())
+
+    chunks: list[str] = []
+    rest = document
+    for slot in (title, _NAVIGATION_SLOT, main):
+        if rest.count(slot) != 1:
+            return None
+        before, rest = rest.split(slot)
+        chunks.append(before)
+    chunks.append(rest)
+    return LayoutShell(chunks=(chunks[0], chunks[1], chunks[2], chunks[3]))
@@ -436,3 +436,71 @@ def test_layout_passes_site_items_to_aside() -> None:
 
     # Should contain section titles from the navigation tree
     assert "Getting Started" in aside_text or "getting-started" in aside_text.lower()
+
+
+# Compiled Shell Tests
+
+
+def test_layout_render_html_matches_tree_rendering() -> None:
+    """Test render_html produces the same document as rendering the tree."""
+    catalog = Catalog(title="Test Catalog")
+    catalog.items = {"getting-started": Section(title="Getting Started")}
+
+    for depth, resource_path in ((0, ""), (1, "getting-started"), (3, "a/b/c")):
+        for cached_navigation in (None, "<nav>cached</nav>"):
+            layout = Layout(
+                view_title="Page",
+                site=catalog,
+                children=html(t'<p>Content <img src="static/logo.png" /></p>'),
+                depth=depth,
+                resource_path=resource_path,
+                cached_navigation=cached_navigation,
+            )
+            assert layout.render_html() == str(layout())
+
+
+def test_layout_shell_compiled_once_per_depth() -> None:
+    """Test the shell is reused across pages with the same site title and depth."""
+    from storyville.components.layout.layout import _layout_shell
+
+    catalog = Catalog(title="Shell Catalog")
+
+    shell = _layout_shell(catalog, 2)
+    assert shell is not None
+    assert _layout_shell(catalog, 2) is shell
+    assert _layout_shell(catalog, 1) is not shell
+    assert "../../static/components/layout/static/pico-main.css" in shell.chunks[0]
+
+
+def test_layout_unmapped_static_paths_get_depth_prefix() -> None:
+    """Test references missing from the asset map still get the ../ prefix."""
+    from pathlib import Path
+
+    from storyville.static_assets.rewriting import DiscoveredAssets
+
+    catalog = Catalog(title="Mapped Catalog")
+    catalog.static_assets = DiscoveredAssets(
+        {
+            "static/components/layout/static/pico-main.css": Path(
+                "static/components/layout/static/pico-main.abc123.css"
+            )
+        }
+    )
+    layout = Layout(view_title="Page", site=catalog, children=None, depth=2)
+
+    document = layout.render_html()
+
+    assert 'href="../../static/components/layout/static/pico-main.abc123.css"' in (
+        document
+    )
+    assert 'href="../../static/components/layout/static/storyville.css"' in document
+
+
+def test_layout_shell_cache_is_bounded() -> None:
+    """Test compiling shells for many titles keeps at most MAX_SHELLS."""
+    from storyville.components.layout import layout as layout_module
+
+    for index in range(layout_module.MAX_SHELLS + 5):
+        layout_module._layout_shell(Catalog(title=f"Catalog {index}"), 0)
+
+    assert len(layout_module._shells) <= layout_module.MAX_SHELLS
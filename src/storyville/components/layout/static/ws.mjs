@@ -7,6 +7,9 @@ let reconnectAttempt = 0;
 let reconnectTimeout = null;
 let reloadDebounceTimeout = null;
 
+// Story HTML last received from the server, the base for patched morphs
+let lastStoryHtml = null;
+
 function getWebSocketUrl() {
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
     const host = window.location.host;
@@ -156,6 +159,67 @@ function reloadIframe() {
     return true;
 }
 
+/**
+ * Split HTML into tokens that each end at a ">".
+ * Must match storyville.html_patch.tokenize_html on the server.
+ *
+ * @param {string} html - HTML text
+ * @returns {string[]} Tokens whose concatenation is the original text
+ */
+function tokenizeHtml(html) {
+    return html.match(/[^>]*>|[^>]+/g) || [];
+}
+
+let crcTable = null;
+
+/**
+ * CRC-32 of HTML's UTF-8 bytes, as 8 lowercase hex digits.
+ * Must match storyville.html_patch.html_hash on the server.
+ *
+ * @param {string} html - HTML text
+ * @returns {string} The hash
+ */
+function htmlHash(html) {
+    if (!crcTable) {
+        crcTable = new Uint32Array(256);
+        for (let n = 0; n < 256; n++) {
+            let c = n;
+            for (let k = 0; k < 8; k++) {
+                c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+            }
+            crcTable[n] = c;
+        }
+    }
+    let crc = 0xffffffff;
+    for (const byte of new TextEncoder().encode(html)) {
+        crc = crcTable[(crc ^ byte) & 0xff] ^ (crc >>> 8);
+    }
+    return ((crc ^ 0xffffffff) >>> 0).toString(16).padStart(8, '0');
+}
+
+/**
+ * Apply a server patch to the story HTML last received.
+ *
+ * @param {Array<[number, number, string]>} patch - [start, end, replacement] operations
+ * @param {string} baseHash - htmlHash of the HTML the patch was computed against
+ * @param {string | null} storyId - Story identifier
+ * @returns {string | null} The new HTML, or null if there is no matching base
+ */
+function applyHtmlPatch(patch, baseHash, storyId) {
+    if (!lastStoryHtml || lastStoryHtml.storyId !== storyId) {
+        return null;
+    }
+    if (htmlHash(lastStoryHtml.html) !== baseHash) {
+        return null;
+    }
+    const tokens = tokenizeHtml(lastStoryHtml.html);
+    for (let i = patch.length - 1; i >= 0; i--) {
+        const [start, end, replacement] = patch[i];
+        tokens.splice(start, end - start, replacement);
+    }
+    return tokens.join('');
+}
+
 /**
  * Morph the iframe content using idiomorph.
  * Morphs only the story content area to preserve scroll position and state.
@@ -282,8 +346,22 @@ function handleReloadMessage(message) {
 
         case 'morph_html':
             console.log('[Storyville] DOM morph requested for story:', storyId);
-            const html = message.html;
+            let html = message.html;
+            if (!html && message.patch) {
+                html = applyHtmlPatch(message.patch, message.base_hash, storyId);
+                if (html === null) {
+                    // Ask for full HTML next time by announcing the page again
+                    console.warn('[Storyville] Cannot apply HTML patch, reloading iframe');
+                    lastStoryHtml = null;
+                    sendPageInfo();
+                    if (!reloadIframe()) {
+                        window.location.reload();
+                    }
+                    break;
+                }
+            }
             if (html) {
+                lastStoryHtml = { storyId, html };
                 handleMorphHtml(html, storyId);
             } else {
                 console.error('[Storyville] No HTML payload in morph_html message');
@@ -305,6 +383,41 @@ function handleReloadMessage(message) {
     }
 }
 
+/**
+ * Handle one server message.
+ *
+ * @param {Object} message - Parsed WebSocket message
+ */
+function handleMessage(message) {
+    if (message.type === 'reload') {
+        // Check if this is new format (has change_type) or old format
+        if (message.change_type) {
+            handleReloadMessage(message);
+        } else {
+            // Legacy fallback for old format
+            console.log('[Storyville] Legacy reload message received, scheduling reload...');
+            scheduleReload();
+        }
+    }
+}
+
+/**
+ * Handle the messages of a batch frame in order.
+ * A full page reload makes the other messages moot, so it runs alone.
+ *
+ * @param {Object[]} messages - Parsed messages from the batch
+ */
+function handleBatchMessage(messages) {
+    const fullReload = messages.find((message) => message.change_type === 'full_reload');
+    if (fullReload) {
+        handleMessage(fullReload);
+        return;
+    }
+    for (const message of messages) {
+        handleMessage(message);
+    }
+}
+
 function scheduleReload() {
     console.log(`[Storyville] Scheduling reload in ${RELOAD_DEBOUNCE_DELAY}ms...`);
     // Clear any existing debounce timeout
@@ -349,15 +462,11 @@ function connect() {
                 const message = JSON.parse(event.data);
                 console.log('[Storyville] Parsed message:', message);
 
-                if (message.type === 'reload') {
-                    // Check if this is new format (has change_type) or old format
-                    if (message.change_type) {
-                        handleReloadMessage(message);
-                    } else {
-                        // Legacy fallback for old format
-                        console.log('[Storyville] Legacy reload message received, scheduling reload...');
-                        scheduleReload();
-                    }
+                if (message.type === 'batch') {
+                    // Everything from one rebuild arrives in a single frame
+                    handleBatchMessage(message.messages || []);
+                } else {
+                    handleMessage(message);
                 }
             } catch (e) {
                 console.error('[Storyville] Failed to parse WebSocket message:', e);
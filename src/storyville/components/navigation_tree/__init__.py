@@ -1,8 +1,9 @@
 """NavigationTree component for hierarchical sidebar navigation."""
 
 from storyville.components.navigation_tree.navigation_tree import (
+    NavigationIndex,
     NavigationTree,
     parse_current_path,
 )
 
-__all__ = ["NavigationTree", "parse_current_path"]
+__all__ = ["NavigationIndex", "NavigationTree", "parse_current_path"]
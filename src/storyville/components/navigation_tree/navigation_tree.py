@@ -122,3 +122,79 @@ class NavigationTree:
               {section_items}
             </nav>
         """)
+
+
+class NavigationIndex:
+    """Navigation tree rendered once per build, with per-page open state.
+
+    NavigationTree builds the whole tree of nodes on every call, so
+    rendering it for every page is O(pages x stories). NavigationIndex
+    renders the tree once with everything collapsed and records where
+    each section's and subject's ``<details>`` tag starts. A page's
+    variant is then produced by swapping in the open tag for its active
+    section and subject, giving the same HTML as
+    ``NavigationTree(sections, resource_path)()`` as a string.
+
+    Example:
+        >>> index = NavigationIndex(catalog.items)
+        >>> nav_html = index.render("components/heading/story-0")
+    """
+
+    def __init__(self, sections: dict[str, Section]) -> None:
+        self.closed_html = str(NavigationTree(sections=sections)())
+
+        self._closed_tag = str(html(t"<details></details>")).removesuffix("</details>")
+        self._open_tag = str(html(t'<details open="open"></details>')).removesuffix(
+            "</details>"
+        )
+
+        # <details> tags appear in tree order: each section, then its subjects
+        keys: list[tuple[str, str | None]] = []
+        for sec_key, section in sections.items():
+            keys.append((sec_key, None))
+            keys.extend((sec_key, subj_key) for subj_key in section.items)
+
+        offsets: list[int] = []
+        offset = self.closed_html.find(self._closed_tag)
+        while offset != -1:
+            offsets.append(offset)
+            offset = self.closed_html.find(self._closed_tag, offset + 1)
+
+        if len(offsets) != len(keys):
+            msg = (
+                f"Expected {len(keys)} <details> tags in navigation, "
+                f"found {len(offsets)}"
+            )
+            raise ValueError(msg)
+        self._offsets = dict(zip(keys, offsets, strict=True))
+
+    def render(self, resource_path: str | None = "") -> str:
+        """Return the navigation HTML for the page at resource_path.
+
+        Args:
+            resource_path: Path in format "section/subject/story", or "".
+
+        Returns:
+            The navigation HTML with the active section and subject open.
+        """
+        section_name, subject_name, _story_name = parse_current_path(resource_path)
+        if section_name is None:
+            return self.closed_html
+        open_offsets = sorted(
+            {
+                self._offsets[key]
+                for key in ((section_name, None), (section_name, subject_name))
+                if key in self._offsets
+            }
+        )
+        if not open_offsets:
+            return self.closed_html
+
+        parts = []
+        start = 0
+        for offset in open_offsets:
+            parts.append(self.closed_html[start:offset])
+            parts.append(self._open_tag)
+            start = offset + len(self._closed_tag)
+        parts.append(self.closed_html[start:])
+        return "".join(parts)
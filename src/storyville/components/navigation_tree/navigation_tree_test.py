@@ -1,7 +1,7 @@
 """Tests for NavigationTree component."""
 
 from aria_testing import get_by_tag_name, get_text_content, query_all_by_tag_name
-from storyville.components.navigation_tree import NavigationTree
+from storyville.components.navigation_tree import NavigationIndex, NavigationTree
 from storyville.section import Section
 from storyville.story import Story
 from storyville.subject import Subject
@@ -263,3 +263,27 @@ def test_story_urls_use_section_and_subject_names():
     assert href == "/forms/inputs/story-0/index.html"
     assert "/forms/" in href
     assert "/inputs/" in href
+
+
+def test_navigation_index_matches_navigation_tree():
+    """NavigationIndex produces the same HTML as NavigationTree for every page."""
+    sections = {}
+    for sec_name in ("forms", "layout"):
+        section = Section(name=sec_name, title=sec_name.title())
+        for subj_name in ("inputs", "buttons"):
+            subject = Subject(name=subj_name, title=subj_name.title(), parent=section)
+            subject.items = [Story(title="First", parent=subject)]
+            section.items[subj_name] = subject
+        sections[sec_name] = section
+
+    index = NavigationIndex(sections)
+
+    for resource_path in (
+        "",
+        "forms",
+        "layout/buttons",
+        "layout/buttons/story-0",
+        "missing/inputs",
+    ):
+        expected = str(NavigationTree(sections=sections, resource_path=resource_path)())
+        assert index.render(resource_path) == expected
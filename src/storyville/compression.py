@@ -0,0 +1,221 @@
+"""Precompressed siblings for built output.
+
+Every page repeats the full navigation and the layout's assets are text,
+so the output compresses extremely well. A build can write
+``index.html.gz`` (and ``index.html.br`` when the brotli package is
+installed) next to each large text file, letting the server send the
+smallest variant a client accepts without compressing per request.
+
+A sibling carries its source's mtime, which is how unchanged files are
+recognized on the next build.
+"""
+
+import gzip
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Text formats worth compressing
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".css", ".js", ".mjs", ".svg", ".json"})
+
+# Files smaller than this gain too little to be worth a sibling
+MIN_COMPRESS_SIZE = 1024
+
+# Suffixes of every sibling this module may write, installed or not
+COMPRESSED_SUFFIXES = frozenset({".br", ".gz"})
+
+
+@dataclass(frozen=True)
+class Encoding:
+    """A content coding with its sibling file suffix.
+
+    Attributes:
+        name: The Content-Encoding token, e.g. "gzip"
+        suffix: The sibling file suffix, e.g. ".gz"
+        compress: Function compressing a file's bytes
+    """
+
+    name: str
+    suffix: str
+    compress: Callable[[bytes], bytes]
+
+
+def _gzip(data: bytes) -> bytes:
+    """Gzip data reproducibly (no timestamp in the header)."""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# Available encodings, most preferred first
+ENCODINGS: tuple[Encoding, ...] = (
+    *(() if brotli is None else (Encoding("br", ".br", brotli.compress),)),
+    Encoding("gzip", ".gz", _gzip),
+)
+
+
+@dataclass
+class CompressionStats:
+    """Counters for one precompression pass.
+
+    Attributes:
+        compressed: Files whose siblings were (re)written
+        unchanged: Files whose siblings were already current
+        removed: Stale siblings deleted
+    """
+
+    compressed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def is_compressible(path: str | os.PathLike[str]) -> bool:
+    """Check whether a file is a text format that gets compressed siblings.
+
+    Args:
+        path: The file path
+
+    Returns:
+        True if the file's suffix is in COMPRESSIBLE_SUFFIXES
+    """
+    return os.path.splitext(path)[1] in COMPRESSIBLE_SUFFIXES
+
+
+def accepted_encodings(accept_encoding: str) -> list[Encoding]:
+    """Pick the available encodings an Accept-Encoding header allows.
+
+    Args:
+        accept_encoding: The header value, e.g. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        Accepted encodings, most preferred first
+    """
+    accepted: set[str] = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(token.strip().lower())
+
+    if "*" in accepted:
+        return list(ENCODINGS)
+    return [encoding for encoding in ENCODINGS if encoding.name in accepted]
+
+
+def compress_file(path: Path) -> bool:
+    """Bring a file's compressed siblings up to date.
+
+    Siblings are written to a temporary file and renamed into place, so
+    a hard-linked sibling from a previous build generation is never
+    modified. A sibling that wouldn't be smaller than its source is
+    removed instead.
+
+    Args:
+        path: The file to compress
+
+    Returns:
+        True if any sibling was written, False if all were current
+    """
+    source_stat = path.stat()
+    data: bytes | None = None
+    written = False
+
+    for encoding in ENCODINGS:
+        sibling = path.with_name(f"{path.name}{encoding.suffix}")
+        try:
+            if sibling.stat().st_mtime_ns == source_stat.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+
+        if data is None:
+            data = path.read_bytes()
+        compressed = encoding.compress(data)
+        if len(compressed) >= len(data):
+            sibling.unlink(missing_ok=True)
+            continue
+
+        temp_path = sibling.with_name(f".{sibling.name}.tmp")
+        temp_path.write_bytes(compressed)
+        os.utime(temp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        os.replace(temp_path, sibling)
+        written = True
+
+    return written
+
+
+def remove_compressed_siblings(path: Path) -> None:
+    """Delete the compressed siblings of a file that is going away.
+
+    Args:
+        path: The source file
+    """
+    for suffix in COMPRESSED_SUFFIXES:
+        path.with_name(f"{path.name}{suffix}").unlink(missing_ok=True)
+
+
+def precompress_output(
+    output_dir: Path,
+    min_size: int = MIN_COMPRESS_SIZE,
+    max_workers: int | None = None,
+) -> CompressionStats:
+    """Write compressed siblings for the large text files in a build output.
+
+    zlib and brotli release the GIL while compressing, so files are
+    compressed on a thread pool. Siblings whose source is gone or has
+    shrunk below min_size are removed.
+
+    Args:
+        output_dir: The build output directory
+        min_size: Smallest file size, in bytes, that gets siblings
+        max_workers: Thread pool size (default: ThreadPoolExecutor's default)
+
+    Returns:
+        CompressionStats for the pass
+    """
+    stats = CompressionStats()
+    candidates: list[Path] = []
+    siblings: list[Path] = []
+
+    for dirpath, _dirnames, filenames in os.walk(output_dir):
+        directory = Path(dirpath)
+        for filename in filenames:
+            if filename.startswith("."):
+                # Manifests and temporary files
+                continue
+            path = directory / filename
+            if path.suffix in COMPRESSED_SUFFIXES:
+                if is_compressible(path.stem):
+                    siblings.append(path)
+            elif is_compressible(filename) and path.stat().st_size >= min_size:
+                candidates.append(path)
+
+    current = set(candidates)
+    for sibling in siblings:
+        if sibling.with_suffix("") not in current:
+            sibling.unlink()
+            stats.removed += 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for written in executor.map(compress_file, candidates):
+            if written:
+                stats.compressed += 1
+            else:
+                stats.unchanged += 1
+
+    return stats
@@ -0,0 +1,119 @@
+"""Compact patches between two versions of a story's HTML.
+
+A morph_html message normally carries a story's whole themed_story.html,
+although an edit usually changes a few elements. When a client already
+has the previous version, the server sends a patch against it instead.
+
+HTML is split into tokens that each end at a ">" (plus any trailing
+text), so a patch lines up with tag boundaries and is independent of
+how the browser counts characters. The client tokenizes the same way:
+``html.match(/[^>]*>|[^>]+/g)``. A patch is a list of
+``[start, end, replacement]`` operations, in ascending order, each
+replacing base tokens ``start:end`` with the replacement text. It is sent
+with the html_hash of its base, so the client only applies it to the
+HTML it was computed against.
+"""
+
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+
+_TOKEN = re.compile(r"[^>]*>|[^>]+")
+
+type HtmlPatch = list[tuple[int, int, str]]
+
+
+def tokenize_html(html: str) -> list[str]:
+    """Split HTML into tokens that each end at a ">".
+
+    Args:
+        html: The HTML text
+
+    Returns:
+        Tokens whose concatenation is the original text
+    """
+    return _TOKEN.findall(html)
+
+
+def html_hash(html: str) -> str:
+    """Short fingerprint of HTML, to check a patch's base.
+
+    The client computes the same CRC-32 of the UTF-8 text.
+
+    Args:
+        html: The HTML text
+
+    Returns:
+        The CRC-32 as 8 lowercase hex digits
+    """
+    return f"{zlib.crc32(html.encode('utf-8')):08x}"
+
+
+def diff_html(old: str, new: str) -> HtmlPatch:
+    """Compute the operations that turn old HTML into new HTML.
+
+    Args:
+        old: The HTML the client already has
+        new: The HTML to send
+
+    Returns:
+        The patch, empty if the texts are equal
+    """
+    old_tokens = tokenize_html(old)
+    new_tokens = tokenize_html(new)
+
+    # Edits are usually local; skip the common ends before matching
+    prefix = 0
+    limit = min(len(old_tokens), len(new_tokens))
+    while prefix < limit and old_tokens[prefix] == new_tokens[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while (
+        suffix < limit
+        and old_tokens[len(old_tokens) - 1 - suffix]
+        == new_tokens[len(new_tokens) - 1 - suffix]
+    ):
+        suffix += 1
+
+    old_middle = old_tokens[prefix : len(old_tokens) - suffix]
+    new_middle = new_tokens[prefix : len(new_tokens) - suffix]
+    matcher = SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+    return [
+        (prefix + i1, prefix + i2, "".join(new_middle[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_patch(old: str, patch: HtmlPatch) -> str:
+    """Apply a patch to the HTML it was computed against.
+
+    Args:
+        old: The base HTML
+        patch: Operations from diff_html
+
+    Returns:
+        The new HTML
+    """
+    tokens = tokenize_html(old)
+    for start, end, replacement in reversed(patch):
+        tokens[start:end] = [replacement]
+    return "".join(tokens)
+
+
+def compact_patch(old: str, new: str) -> HtmlPatch | None:
+    """Compute the patch from old to new, if it is smaller than new.
+
+    Args:
+        old: The HTML the client already has
+        new: The HTML to send
+
+    Returns:
+        The patch, or None when sending new in full is cheaper
+    """
+    patch = diff_html(old, new)
+    if len(json.dumps(patch)) >= len(json.dumps(new)):
+        return None
+    return patch
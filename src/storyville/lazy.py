@@ -0,0 +1,172 @@
+"""Render catalog pages on request for ``storyville serve --lazy``.
+
+Building every page before the server starts makes startup slow for large
+catalogs, while a developer only looks at a handful of stories. A
+LazySite loads the catalog tree and renders a page the first time it is
+requested, keeping recently used pages in an LRU cache. Static assets are
+served straight from their source files.
+
+The watcher calls rebuild() after a change, which reloads the catalog and
+empties the cache. The package's modules are cleared from sys.modules
+first, so stories.py and component modules are imported again with any
+edits.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from time import perf_counter, time_ns
+
+from storyville import PACKAGE_DIR
+from storyville.build import (
+    PageUnit,
+    _iter_page_units,
+    _package_input_dir,
+    _render_navigation,
+    _render_unit,
+)
+from storyville.catalog import clear_package_modules, make_catalog
+from storyville.site_files import SiteFile, site_file_from_bytes, site_file_from_path
+from storyville.static_assets.discovery import iter_static_files
+
+logger = logging.getLogger(__name__)
+
+# Most rendered pages kept in memory
+DEFAULT_CACHE_SIZE = 256
+
+
+class LazySite:
+    """A catalog whose pages are rendered when they are first requested.
+
+    Implements the SiteSource interface, so SiteFiles can serve it. All
+    rendering happens under a lock, since views share the catalog.
+
+    Attributes:
+        package_location: The package the catalog is loaded from
+        with_assertions: Whether to execute assertions during rendering
+        cache_size: Most rendered pages kept in the LRU cache
+        rendered: Number of page units rendered since the last reload
+    """
+
+    renders_on_request = True
+
+    def __init__(
+        self,
+        package_location: str,
+        with_assertions: bool = True,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        if cache_size < 1:
+            msg = f"cache_size must be at least 1, got {cache_size}"
+            raise ValueError(msg)
+        self.package_location = package_location
+        self.with_assertions = with_assertions
+        self.cache_size = cache_size
+        self.rendered = 0
+        self._lock = threading.Lock()
+        self._pages: OrderedDict[str, SiteFile] = OrderedDict()
+        self._static_files: dict[str, SiteFile] = {}
+        self.reload()
+
+    def reload(self) -> None:
+        """Import the catalog tree again and forget every rendered page."""
+        start = perf_counter()
+        clear_package_modules(self.package_location)
+        catalog = make_catalog(package_location=self.package_location)
+        navigation = _render_navigation(catalog)
+        units: dict[str, PageUnit] = {
+            path: unit
+            for unit in _iter_page_units(catalog)
+            for path in unit.output_paths
+        }
+        input_dir = _package_input_dir(self.package_location)
+        static_sources = {
+            f"static/{relative_file.as_posix()}": file_path
+            for file_path, relative_file in iter_static_files(PACKAGE_DIR, input_dir)
+        }
+
+        with self._lock:
+            self._catalog = catalog
+            self._navigation = navigation
+            self._units = units
+            self._static_sources = static_sources
+            self._pages.clear()
+            self._static_files.clear()
+            self.rendered = 0
+
+        logger.info(
+            f"Lazy catalog loaded: {len(units)} pages available, "
+            f"completed in {perf_counter() - start:.2f}s"
+        )
+
+    def rebuild(self, package_location: str, output_dir: Path) -> None:
+        """Rebuild callback for the watcher: reload instead of building.
+
+        Args:
+            package_location: Ignored; the site's own package is reloaded
+            output_dir: Ignored; nothing is written
+        """
+        self.reload()
+
+    def get(self, relative_path: str) -> SiteFile | None:
+        """Look up a page or static file, rendering the page if needed.
+
+        Args:
+            relative_path: e.g. "components/heading/story-0/index.html"
+
+        Returns:
+            The SiteFile, or None if the catalog has no such page or file
+        """
+        with self._lock:
+            site_file = self._pages.get(relative_path)
+            if site_file is not None:
+                self._pages.move_to_end(relative_path)
+                return site_file
+
+            source = self._static_sources.get(relative_path)
+            if source is not None:
+                return self._static_file(relative_path, source)
+
+            unit = self._units.get(relative_path)
+            if unit is None:
+                return None
+            return self._render(unit).get(relative_path)
+
+    def _render(self, unit: PageUnit) -> dict[str, SiteFile]:
+        """Render a unit's pages into the cache, evicting the oldest pages.
+
+        Returns:
+            The unit's pages, which may already be evicted from a tiny cache
+        """
+        start = perf_counter()
+        pages = _render_unit(
+            self._catalog, unit, self._navigation, self.with_assertions
+        )
+        mtime_ns = time_ns()
+        site_files = {
+            path: site_file_from_bytes(path, page_html.encode("utf-8"), mtime_ns)
+            for path, page_html in pages
+        }
+        for path, site_file in site_files.items():
+            self._pages[path] = site_file
+            self._pages.move_to_end(path)
+        while len(self._pages) > self.cache_size:
+            self._pages.popitem(last=False)
+        self.rendered += 1
+        logger.info(
+            f"Rendered {unit.output_paths[0]} on request "
+            f"in {perf_counter() - start:.2f}s"
+        )
+        return site_files
+
+    def _static_file(self, relative_path: str, source: Path) -> SiteFile | None:
+        """Index a static source file on first use."""
+        site_file = self._static_files.get(relative_path)
+        if site_file is None:
+            try:
+                site_file = site_file_from_path(source)
+            except FileNotFoundError:
+                return None
+            self._static_files[relative_path] = site_file
+        return site_file
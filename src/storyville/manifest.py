@@ -0,0 +1,603 @@
+"""Content-hash manifest for incremental builds.
+
+Each build records, per page unit, a hash of everything that went into
+rendering it: the stories.py source, story props, component source and
+the shared layout/navigation. The next incremental build recomputes the
+hashes and only re-renders units whose hash changed.
+
+The manifest also holds the dependency graph of the build: the source
+files of the user's package each page was rendered from, found by
+following imports from its stories.py and component modules. The hot
+reload watcher reverses it to rebuild and refresh only the pages a
+changed file affects.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+from collections.abc import Container, Iterable
+from dataclasses import dataclass, field, fields, is_dataclass
+from enum import Enum
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+from storyville import PACKAGE_DIR
+from storyville.nodes import get_package_path
+
+if TYPE_CHECKING:
+    from storyville.build import PageUnit
+    from storyville.catalog import Catalog
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".storyville-manifest.json"
+
+# Bump when the manifest layout or hashing scheme changes
+MANIFEST_VERSION = 3
+
+# Digest of Storyville's sources, keyed by each file's path, mtime and size
+_storyville_digests: dict[tuple[tuple[str, int, int], ...], str] = {}
+
+
+@dataclass
+class DependencyGraph:
+    """The source files each page of a build depends on.
+
+    Attributes:
+        pages: Primary page path -> source files its rendering depends on
+        shared: Source files every page depends on, such as the catalog's
+            stories.py and the themed layout
+        shared_digest: Hash of the inputs every page shares, including the
+            navigation; when it changes, every page is affected
+    """
+
+    pages: dict[str, list[str]] = field(default_factory=dict)
+    shared: list[str] = field(default_factory=list)
+    shared_digest: str = ""
+
+    @classmethod
+    def from_dict(cls, data: object) -> DependencyGraph:
+        """Read a graph saved in a manifest.
+
+        Args:
+            data: The "dependencies" value of a loaded manifest
+
+        Returns:
+            The graph, or an empty graph if the data isn't a valid one
+        """
+        if not isinstance(data, dict):
+            return cls()
+        pages = data.get("pages")
+        shared = data.get("shared")
+        if not isinstance(pages, dict) or not isinstance(shared, list):
+            return cls()
+        return cls(
+            pages={str(k): [str(p) for p in v] for k, v in pages.items()},
+            shared=[str(p) for p in shared],
+            shared_digest=str(data.get("shared_digest", "")),
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        """Return the graph as JSON-compatible data for the manifest."""
+        return {
+            "pages": dict(sorted(self.pages.items())),
+            "shared": self.shared,
+            "shared_digest": self.shared_digest,
+        }
+
+    def affected_pages(self, changed_paths: Iterable[str]) -> set[str] | None:
+        """Find the pages that depend on any of the changed files.
+
+        Args:
+            changed_paths: Paths of the changed source files
+
+        Returns:
+            Primary paths of the affected pages, or None when a changed file
+            is shared by every page or isn't a known dependency, so the
+            whole site may be affected
+        """
+        if not self.pages:
+            return None
+        shared = set(self.shared)
+        dependents: dict[str, set[str]] = {}
+        for page, sources in self.pages.items():
+            for source in sources:
+                dependents.setdefault(source, set()).add(page)
+
+        affected: set[str] = set()
+        for changed_path in changed_paths:
+            source = os.path.realpath(changed_path)
+            if source in shared or source not in dependents:
+                return None
+            affected |= dependents[source]
+        return affected
+
+
+@dataclass
+class BuildManifest:
+    """Map of output page paths to the input hash they were rendered from.
+
+    Attributes:
+        pages: Page path relative to the output dir -> input hash
+        dependencies: The source files each page was rendered from
+    """
+
+    pages: dict[str, str] = field(default_factory=dict)
+    dependencies: DependencyGraph = field(default_factory=DependencyGraph)
+
+    @classmethod
+    def load(cls, output_dir: Path) -> BuildManifest:
+        """Load the manifest from an output directory.
+
+        A missing, unreadable or outdated manifest yields an empty one,
+        which makes every page look changed.
+
+        Args:
+            output_dir: The build output directory
+
+        Returns:
+            The loaded manifest, or an empty manifest
+        """
+        manifest_path = output_dir / MANIFEST_NAME
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Ignoring unreadable build manifest %s: %s", manifest_path, e
+            )
+            return cls()
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls()
+        pages = data.get("pages")
+        if not isinstance(pages, dict):
+            return cls()
+        return cls(
+            pages={str(k): str(v) for k, v in pages.items()},
+            dependencies=DependencyGraph.from_dict(data.get("dependencies")),
+        )
+
+    def save(self, output_dir: Path) -> None:
+        """Write the manifest into the output directory.
+
+        Args:
+            output_dir: The build output directory
+        """
+        data = {
+            "version": MANIFEST_VERSION,
+            "pages": dict(sorted(self.pages.items())),
+            "dependencies": self.dependencies.to_dict(),
+        }
+        manifest_path = output_dir / MANIFEST_NAME
+        temp_path = manifest_path.with_name(f"{MANIFEST_NAME}.tmp")
+        temp_path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+        os.replace(temp_path, manifest_path)
+
+    def is_current(
+        self, unit: PageUnit, digest: str, output_dir: Path | Container[str]
+    ) -> bool:
+        """Check whether a unit's primary page is up to date in the output.
+
+        Args:
+            unit: The page unit to check
+            digest: The unit's freshly computed input hash
+            output_dir: The build output directory, or the relative paths
+                of an in-memory output
+
+        Returns:
+            True if the unit can be skipped
+        """
+        primary = unit.output_paths[0]
+        if self.pages.get(primary) != digest:
+            return False
+        if isinstance(output_dir, Path):
+            return (output_dir / primary).exists()
+        return primary in output_dir
+
+
+class Fingerprinter:
+    """Compute input hashes and source files for page units during one build.
+
+    File digests and module dependencies are cached for the lifetime of
+    the instance, so each source file is read at most once per build.
+    """
+
+    def __init__(
+        self,
+        catalog: Catalog,
+        package_location: str,
+        navigation: str,
+        with_assertions: bool,
+    ) -> None:
+        self.catalog = catalog
+        self.package_location = package_location
+        self._file_digests: dict[Path, str] = {}
+        self._module_sources: dict[str, frozenset[str]] = {}
+        # Dependencies are followed within the user's top-level package
+        top_level = package_location.split(".")[0]
+        self._package_root = get_package_path(top_level).resolve()
+        self.shared = self._shared_digest(navigation, with_assertions)
+
+    def _digest(self, *parts: str) -> str:
+        """Hash a sequence of strings into a hex digest."""
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(part.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def file_digest(self, path: Path | str | None) -> str:
+        """Return a cached content digest for a source file.
+
+        Args:
+            path: Path to the file, or None
+
+        Returns:
+            Hex digest of the contents, or "" if there is no readable file
+        """
+        if path is None:
+            return ""
+        path = Path(path)
+        cached = self._file_digests.get(path)
+        if cached is None:
+            try:
+                cached = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                cached = ""
+            self._file_digests[path] = cached
+        return cached
+
+    def object_digest(self, obj: object) -> str:
+        """Digest the source file that defines a callable or class.
+
+        Args:
+            obj: A component, template, assertion or layout callable
+
+        Returns:
+            Digest of its defining file, or of its repr when there is none
+        """
+        if obj is None:
+            return ""
+        if not isinstance(obj, (ModuleType, type)) and not callable(obj):
+            return self._digest(repr(obj))
+        try:
+            source_file = inspect.getsourcefile(obj)
+        except TypeError:
+            source_file = None
+        if source_file is None:
+            return self._digest(repr(obj))
+        return self.file_digest(source_file)
+
+    def value_digest(self, value: object) -> str:
+        """Digest a story prop in a form that is stable across processes.
+
+        Primitives are digested by repr and containers and dataclasses by
+        their contents. Anything else, such as a callable or a plain
+        object whose repr includes its memory address, is digested by its
+        qualified name and defining source instead.
+
+        Args:
+            value: The value to digest
+
+        Returns:
+            Hex digest of the value
+        """
+        if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+            return self._digest(repr(value))
+        if isinstance(value, Enum):
+            return self._digest(_qualified_name(type(value)), value.name)
+        if isinstance(value, (list, tuple)):
+            return self._digest(
+                type(value).__name__, *(self.value_digest(item) for item in value)
+            )
+        if isinstance(value, (set, frozenset)):
+            return self._digest(
+                type(value).__name__, *sorted(self.value_digest(item) for item in value)
+            )
+        if isinstance(value, dict):
+            return self._digest(
+                "dict",
+                *(
+                    f"{self.value_digest(key)}={self.value_digest(item)}"
+                    for key, item in value.items()
+                ),
+            )
+        if is_dataclass(value) and not isinstance(value, type):
+            return self._digest(
+                _qualified_name(type(value)),
+                self.object_digest(type(value)),
+                *(
+                    f"{item.name}={self.value_digest(getattr(value, item.name))}"
+                    for item in fields(value)
+                ),
+            )
+        if isinstance(value, (ModuleType, type)) or callable(value):
+            return self._digest(_qualified_name(value), self.object_digest(value))
+        kind = type(value)
+        return self._digest(_qualified_name(kind), self.object_digest(kind))
+
+    def module_digest(self, package_path: str) -> str:
+        """Digest the stories.py module for a node's package path.
+
+        Args:
+            package_path: The node's package path, e.g. ".components.heading"
+
+        Returns:
+            Digest of the stories.py source, or "" if the module isn't loaded
+        """
+        module = self._stories_module(package_path)
+        return self.file_digest(getattr(module, "__file__", None))
+
+    def _stories_module(self, package_path: str) -> ModuleType | None:
+        """Look up the loaded stories.py module for a node's package path."""
+        if package_path == ".":
+            module_name = f"{self.package_location}.stories"
+        else:
+            module_name = f"{self.package_location}{package_path}.stories"
+        return sys.modules.get(module_name)
+
+    def module_sources(self, module: ModuleType | None) -> frozenset[str]:
+        """Find the package source files a module depends on.
+
+        Modules, classes and functions in the module's namespace are
+        followed to the modules defining them, as long as those are in
+        the user's package. Anything else, such as Storyville or tdom, is
+        covered by the shared digest or not tracked.
+
+        Args:
+            module: A stories.py or component module, or None
+
+        Returns:
+            Resolved paths of the module's file and its dependencies
+        """
+        if module is None:
+            return frozenset()
+        cached = self._module_sources.get(module.__name__)
+        if cached is not None:
+            return cached
+
+        sources: set[str] = set()
+        seen: set[str] = set()
+        pending = [module]
+        while pending:
+            current = pending.pop()
+            if current.__name__ in seen:
+                continue
+            seen.add(current.__name__)
+            source = self._package_source(current)
+            if source is None:
+                continue
+            sources.add(source)
+            for value in list(vars(current).values()):
+                if isinstance(value, ModuleType):
+                    dependency: ModuleType | None = value
+                else:
+                    module_name = getattr(value, "__module__", None)
+                    if not isinstance(module_name, str):
+                        continue
+                    dependency = sys.modules.get(module_name)
+                if dependency is not None and dependency.__name__ not in seen:
+                    pending.append(dependency)
+
+        result = frozenset(sources)
+        self._module_sources[module.__name__] = result
+        return result
+
+    def object_sources(self, obj: object) -> frozenset[str]:
+        """Find the package source files the module defining obj depends on.
+
+        Args:
+            obj: A component, template, assertion or layout callable
+
+        Returns:
+            Resolved source paths, empty if obj isn't from the package
+        """
+        module_name = getattr(obj, "__module__", None)
+        if obj is None or not isinstance(module_name, str):
+            return frozenset()
+        return self.module_sources(sys.modules.get(module_name))
+
+    def _package_source(self, module: ModuleType) -> str | None:
+        """Return a module's resolved file if it is in the user's package."""
+        module_file = getattr(module, "__file__", None)
+        if module_file is None:
+            return None
+        path = Path(module_file).resolve()
+        if not path.is_relative_to(self._package_root):
+            return None
+        return str(path)
+
+    def shared_sources(self) -> frozenset[str]:
+        """Source files every page depends on: the catalog and its layout."""
+        return self.module_sources(
+            self._stories_module(self.catalog.package_path or ".")
+        ) | self.object_sources(self.catalog.themed_layout)
+
+    def unit_sources(self, unit: PageUnit) -> frozenset[str]:
+        """Find the package source files a page unit is rendered from.
+
+        Args:
+            unit: The page unit
+
+        Returns:
+            Resolved source paths, not including the shared sources
+        """
+        match unit.kind:
+            case "catalog" | "about" | "debug":
+                # These pages summarize every section
+                return frozenset().union(
+                    *(
+                        self.module_sources(self._stories_module(section.package_path))
+                        for section in self.catalog.items.values()
+                    )
+                )
+            case "section":
+                section = self.catalog.items[unit.section_key]
+                return self.module_sources(self._stories_module(section.package_path))
+            case "subject":
+                subject = self.catalog.items[unit.section_key].items[unit.subject_key]
+                return self.module_sources(
+                    self._stories_module(subject.package_path)
+                ) | self.object_sources(subject.target)
+            case "story":
+                subject = self.catalog.items[unit.section_key].items[unit.subject_key]
+                story = subject.items[unit.story_idx]
+                return frozenset().union(
+                    self.module_sources(self._stories_module(subject.package_path)),
+                    self.object_sources(story.target),
+                    self.object_sources(story.template),
+                    *(self.object_sources(assertion) for assertion in story.assertions),
+                )
+
+    def dependency_graph(self, units: Iterable[PageUnit]) -> DependencyGraph:
+        """Record the source files of every unit's primary page.
+
+        Args:
+            units: Every unit in the catalog
+
+        Returns:
+            The graph to store in the build's manifest
+        """
+        return DependencyGraph(
+            pages={
+                unit.output_paths[0]: sorted(self.unit_sources(unit)) for unit in units
+            },
+            shared=sorted(self.shared_sources()),
+            shared_digest=self.shared,
+        )
+
+    def _sources_digest(self, sources: Iterable[str]) -> str:
+        """Digest the contents of a set of source files."""
+        return self._digest(
+            *(f"{path}={self.file_digest(path)}" for path in sorted(sources))
+        )
+
+    def _shared_digest(self, navigation: str, with_assertions: bool) -> str:
+        """Digest inputs shared by every page.
+
+        Covers Storyville's own rendering code, the catalog root, the
+        themed layout, the navigation (which reflects every title) and
+        the static asset map, which holds fingerprinted names.
+        """
+        return self._digest(
+            _storyville_digest(),
+            self.module_digest(self.catalog.package_path or "."),
+            self.object_digest(self.catalog.themed_layout),
+            str(self.catalog.title),
+            navigation,
+            str(with_assertions),
+            self._static_assets_digest(),
+            self._sources_digest(self.shared_sources()),
+        )
+
+    def _static_assets_digest(self) -> str:
+        """Digest the catalog's static asset map, or "" when there is none."""
+        assets = self.catalog.static_assets
+        if assets is None:
+            return ""
+        return self._digest(*(f"{ref}={path}" for ref, path in sorted(assets.items())))
+
+    def unit_digest(self, unit: PageUnit) -> str:
+        """Compute the input hash for one page unit.
+
+        Args:
+            unit: The unit to fingerprint
+
+        Returns:
+            Hex digest of the unit's inputs
+        """
+        # Modules the page's stories.py and components import
+        sources = self._sources_digest(self.unit_sources(unit))
+        match unit.kind:
+            case "catalog" | "about" | "debug":
+                summary = [
+                    (key, section.title, section.description, len(section.items))
+                    for key, section in self.catalog.items.items()
+                ]
+                return self._digest(self.shared, unit.kind, repr(summary), sources)
+            case "section":
+                section = self.catalog.items[unit.section_key]
+                return self._digest(
+                    self.shared,
+                    unit.output_paths[0],
+                    self.module_digest(section.package_path),
+                    repr((section.title, section.description)),
+                    sources,
+                )
+            case "subject":
+                subject = self.catalog.items[unit.section_key].items[unit.subject_key]
+                return self._digest(
+                    self.shared,
+                    unit.output_paths[0],
+                    self.module_digest(subject.package_path),
+                    repr((subject.title, subject.description)),
+                    self.object_digest(subject.target),
+                    sources,
+                )
+            case "story":
+                subject = self.catalog.items[unit.section_key].items[unit.subject_key]
+                story = subject.items[unit.story_idx]
+                return self._digest(
+                    self.shared,
+                    unit.output_paths[0],
+                    self.module_digest(subject.package_path),
+                    repr((story.title, story.description)),
+                    self.value_digest(story.props),
+                    self.object_digest(story.target),
+                    self.object_digest(story.template),
+                    *(self.object_digest(assertion) for assertion in story.assertions),
+                    sources,
+                )
+
+
+def _storyville_digest() -> str:
+    """Digest Storyville's own rendering code.
+
+    The digest is kept between builds and only recomputed when a source
+    file is added, removed or has a new modification time or size.
+
+    Returns:
+        Hex digest of the contents of Storyville's modules
+    """
+    stats: list[tuple[str, int, int]] = []
+    for path in sorted(PACKAGE_DIR.rglob("*.py")):
+        if (
+            "templates" in path.parts
+            or path.name.startswith("test_")
+            or path.name.endswith("_test.py")
+        ):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stats.append((str(path), stat.st_mtime_ns, stat.st_size))
+    key = tuple(stats)
+    cached = _storyville_digests.get(key)
+    if cached is None:
+        h = hashlib.sha256()
+        for path, _, _ in key:
+            try:
+                h.update(hashlib.sha256(Path(path).read_bytes()).digest())
+            except OSError:
+                pass
+        cached = h.hexdigest()
+        # Only the digest of the current sources is worth keeping
+        _storyville_digests.clear()
+        _storyville_digests[key] = cached
+    return cached
+
+
+def _qualified_name(obj: object) -> str:
+    """Name an object by its module and qualified name, without its address."""
+    module = getattr(obj, "__module__", None) or ""
+    name = getattr(obj, "__qualname__", None) or getattr(obj, "__name__", None)
+    return f"{module}.{name or type(obj).__qualname__}"
@@ -0,0 +1,245 @@
+"""In-memory build output for the development server.
+
+In ``storyville serve --in-memory``, rebuilds render into a MemoryOutput
+instead of the output directory and the server reads pages straight from
+it. Nothing is written to disk unless the output is created with
+flush=True, in which case changed files are also written out after each
+build.
+
+A build assembles the next generation of files and publishes it with a
+single assignment, so readers always see a complete site. Files whose
+bytes didn't change keep their MemoryFile object, which lets the server's
+index skip rehashing them.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time_ns
+from typing import TYPE_CHECKING
+
+from storyville.static_assets.copying import SyncStats
+from storyville.static_assets.discovery import iter_static_files
+
+if TYPE_CHECKING:
+    from storyville.manifest import BuildManifest
+
+
+@dataclass(frozen=True)
+class MemoryFile:
+    """The bytes of one output file.
+
+    Attributes:
+        data: The file contents
+        mtime_ns: When the contents last changed, in nanoseconds
+    """
+
+    data: bytes
+    mtime_ns: int = field(default_factory=time_ns)
+
+    @property
+    def size(self) -> int:
+        """Size of the contents in bytes."""
+        return len(self.data)
+
+
+@dataclass(frozen=True)
+class _StaticSource:
+    """A static source file's stat signature and its loaded contents."""
+
+    signature: tuple[int, int, int]
+    file: MemoryFile
+
+
+class MemoryOutput:
+    """A built site held in memory as relative path -> MemoryFile.
+
+    Attributes:
+        flush: Whether builds also write changed files to the output directory
+        manifest: The build manifest of the current generation, for
+            incremental rebuilds
+        generation: Number of builds published so far
+    """
+
+    def __init__(self, flush: bool = False) -> None:
+        self.flush = flush
+        self.manifest: BuildManifest | None = None
+        self.generation = 0
+        self._files: dict[str, MemoryFile] = {}
+        self._flushed: dict[str, MemoryFile] = {}
+        self._static_sources: dict[Path, _StaticSource] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, relative_path: object) -> bool:
+        return relative_path in self._files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def get(self, relative_path: str) -> MemoryFile | None:
+        """Look up a file by its slash-separated path in the output.
+
+        Args:
+            relative_path: e.g. "components/index.html"
+
+        Returns:
+            The MemoryFile, or None if the output has no such file
+        """
+        return self._files.get(relative_path)
+
+    def read_text(self, relative_path: str) -> str:
+        """Read a file as UTF-8 text.
+
+        Args:
+            relative_path: e.g. "index.html"
+
+        Returns:
+            The decoded contents
+
+        Raises:
+            FileNotFoundError: If the output has no such file
+        """
+        memory_file = self._files.get(relative_path)
+        if memory_file is None:
+            msg = f"No such file in memory output: {relative_path}"
+            raise FileNotFoundError(msg)
+        return memory_file.data.decode("utf-8")
+
+    def snapshot(self) -> dict[str, MemoryFile]:
+        """Return a copy of the current files, to build the next generation on.
+
+        Returns:
+            A new dict sharing the current MemoryFile objects
+        """
+        return dict(self._files)
+
+    def publish(self, files: dict[str, MemoryFile], manifest: BuildManifest) -> None:
+        """Make a finished build the current generation.
+
+        Args:
+            files: Every file of the new generation
+            manifest: The new generation's build manifest
+        """
+        self._files = files
+        self.manifest = manifest
+        self.generation += 1
+
+    def flush_to(self, output_dir: Path) -> tuple[int, int]:
+        """Write files changed since the last flush to a directory.
+
+        Files that were flushed before and are no longer in the output are
+        deleted, and directories left empty are removed. Writes replace
+        files rather than overwriting them, like the disk build's writer.
+
+        Args:
+            output_dir: The directory to write to
+
+        Returns:
+            Tuple of (files written, files removed)
+        """
+        files = self._files
+        written = 0
+        removed = 0
+        created_dirs: set[Path] = set()
+
+        for relative_path, memory_file in files.items():
+            if self._flushed.get(relative_path) is memory_file:
+                continue
+            path = output_dir / relative_path
+            if path.parent not in created_dirs:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(path.parent)
+            temp_path = path.with_name(f".{path.name}.tmp")
+            temp_path.write_bytes(memory_file.data)
+            os.utime(temp_path, ns=(memory_file.mtime_ns, memory_file.mtime_ns))
+            os.replace(temp_path, path)
+            written += 1
+
+        for relative_path in sorted(self._flushed.keys() - files.keys()):
+            path = output_dir / relative_path
+            path.unlink(missing_ok=True)
+            removed += 1
+            parent = path.parent
+            while (
+                parent != output_dir and parent.is_dir() and not any(parent.iterdir())
+            ):
+                parent.rmdir()
+                parent = parent.parent
+
+        self._flushed = dict(files)
+        return written, removed
+
+    def load_static_assets(
+        self,
+        files: dict[str, MemoryFile],
+        storyville_base: Path,
+        input_dir: Path,
+        fingerprints: Mapping[str, str] | None = None,
+    ) -> SyncStats:
+        """Bring the static/ files of a generation in line with the sources.
+
+        Source files whose size, mtime and inode are unchanged since the
+        last build are not read again. Fingerprinted names share the
+        MemoryFile of the original name.
+
+        Args:
+            files: The generation being built, updated in place
+            storyville_base: Path to storyville installation (e.g., src/storyville)
+            input_dir: Path to user's input directory
+            fingerprints: Static reference -> fingerprinted reference, for
+                fingerprinted builds
+
+        Returns:
+            SyncStats where "copied" counts files read into memory
+        """
+        stats = SyncStats()
+        expected: set[str] = set()
+        sources: dict[Path, _StaticSource] = {}
+
+        for file_path, relative_file in iter_static_files(storyville_base, input_dir):
+            reference = f"static/{relative_file.as_posix()}"
+            stat_result = file_path.stat()
+            signature = (
+                stat_result.st_size,
+                stat_result.st_mtime_ns,
+                stat_result.st_ino,
+            )
+            source = self._static_sources.get(file_path)
+            if source is None or source.signature != signature:
+                data = file_path.read_bytes()
+                previous = files.get(reference)
+                if previous is not None and previous.data == data:
+                    memory_file = previous
+                else:
+                    memory_file = MemoryFile(data)
+                source = _StaticSource(signature, memory_file)
+
+            sources[file_path] = source
+            if files.get(reference) is source.file:
+                stats.unchanged += 1
+            else:
+                files[reference] = source.file
+                stats.copied += 1
+                stats.bytes_copied += source.file.size
+            expected.add(reference)
+
+            if fingerprints is not None and reference in fingerprints:
+                hashed = fingerprints[reference]
+                files[hashed] = source.file
+                expected.add(hashed)
+
+        for relative_path in [
+            path
+            for path in files
+            if path.startswith("static/") and path not in expected
+        ]:
+            del files[relative_path]
+            stats.removed += 1
+
+        self._static_sources = sources
+        return stats
@@ -32,11 +32,11 @@ class SectionView:
     resource_path: str = ""
     cached_navigation: str | None = None
 
-    def __call__(self) -> Node:
-        """Render the section to a tdom Node.
+    def layout(self) -> Layout:
+        """Build the Layout wrapping the section content.
 
         Returns:
-            A tdom Node representing the rendered section.
+            The Layout for this page, renderable as a Node or as a string.
         """
         # Conditionally create description paragraph
         description_p = (
@@ -61,13 +61,32 @@ class SectionView:
             content = html(t"<ul>{subject_items}</ul>")
 
         # Create the main content for this view wrapped with Layout (depth=1 for section pages in subdirectories)
-        view_content = html(t"""\
-<{Layout} view_title={self.section.title} site={self.site} depth={1} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+        return Layout(
+            view_title=self.section.title,
+            site=self.site,
+            children=html(t"""\
 <div>
 <h1>{self.section.title}</h1>
 {description_p}
 {content}
-</div>
-</{Layout}>""")
+</div>"""),
+            depth=1,
+            resource_path=self.resource_path,
+            cached_navigation=self.cached_navigation,
+        )
+
+    def __call__(self) -> Node:
+        """Render the section to a tdom Node.
 
-        return view_content
+        Returns:
+            A tdom Node representing the rendered section.
+        """
+        return self.layout()()
+
+    def render_html(self) -> str:
+        """Render the section to an HTML string using the compiled layout shell.
+
+        Returns:
+            The complete HTML document.
+        """
+        return self.layout().render_html()
@@ -0,0 +1,591 @@
+"""In-memory index of a built site for the development server.
+
+Starlette's StaticFiles stats and opens every requested file and builds
+its ETag from the file's mtime and size. SiteIndex walks the output tree
+once per rebuild instead: each file gets a strong ETag from a hash of its
+contents, small files keep their bytes in memory, and current .br/.gz
+siblings (see ``storyville build --precompress``) are recorded next to
+the file they encode. SiteFiles serves requests from that index alone,
+answering revalidations with 304 Not Modified.
+
+Files whose size, mtime and inode are unchanged keep their entry across
+refreshes, so a rebuild only hashes what it actually rewrote.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mimetypes
+import os
+import posixpath
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from pathlib import Path
+from typing import Protocol
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import URL, Headers
+from starlette.responses import (
+    FileResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    Response,
+)
+from starlette.types import Receive, Scope, Send
+
+from storyville.compression import (
+    COMPRESSED_SUFFIXES,
+    ENCODINGS,
+    accepted_encodings,
+    is_compressible,
+)
+from storyville.memory_output import MemoryOutput
+from storyville.static_assets import IMMUTABLE_CACHE_CONTROL, is_fingerprinted
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are streamed from disk instead of held in memory
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+# Total bytes of file contents held in memory by one index
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+NOT_FOUND_PAGE = "404.html"
+
+
+@dataclass(frozen=True)
+class Representation:
+    """One stored form of a file: the file itself or a compressed sibling.
+
+    Attributes:
+        path: Filesystem path of the stored bytes (for an in-memory
+            file, its path relative to the output)
+        size: Size in bytes
+        etag: Strong entity tag, quoted
+        encoding: Content-Encoding token, or None for the file itself
+        body: The bytes, if held in memory
+    """
+
+    path: Path
+    size: int
+    etag: str
+    encoding: str | None = None
+    body: bytes | None = None
+
+
+@dataclass(frozen=True)
+class SiteFile:
+    """A servable file in the output tree.
+
+    Attributes:
+        identity: The file's own bytes
+        media_type: Content-Type guessed from the file name
+        last_modified: HTTP date of the file's mtime
+        signature: (size, mtime_ns, inode) of the file and its siblings,
+            used to recognize unchanged files on refresh
+        encoded: Compressed representations, keyed by Content-Encoding
+    """
+
+    identity: Representation
+    media_type: str
+    last_modified: str
+    signature: tuple[tuple[int, int, int], ...]
+    encoded: dict[str, Representation] = field(default_factory=dict)
+
+    def select(self, accept_encoding: str) -> Representation:
+        """Pick the representation to send for an Accept-Encoding header.
+
+        Args:
+            accept_encoding: The request's Accept-Encoding header value
+
+        Returns:
+            The most preferred accepted compressed form, else the file itself
+        """
+        if self.encoded:
+            for encoding in accepted_encodings(accept_encoding):
+                representation = self.encoded.get(encoding.name)
+                if representation is not None:
+                    return representation
+        return self.identity
+
+    @property
+    def cached_bytes(self) -> int:
+        """Bytes of this file's representations held in memory."""
+        representations = (self.identity, *self.encoded.values())
+        return sum(len(r.body) for r in representations if r.body is not None)
+
+
+# (Content-Encoding, path, stat) of a current compressed sibling
+type _Sibling = tuple[str, Path, os.stat_result]
+
+
+def _signature(stat_result: os.stat_result) -> tuple[int, int, int]:
+    return stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino
+
+
+def _read(path: Path, size: int, budget: list[int]) -> tuple[str, bytes | None]:
+    """Hash a file, keeping its bytes if it fits within the memory budget.
+
+    Args:
+        path: The file to read
+        size: Its size from the walk's stat
+        budget: Single-item list holding the bytes still available
+
+    Returns:
+        Tuple of (hex digest, body or None)
+    """
+    if size <= MAX_CACHED_FILE_SIZE and size <= budget[0]:
+        body = path.read_bytes()
+        budget[0] -= len(body)
+        return hashlib.sha256(body).hexdigest(), body
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest(), None
+
+
+class SiteIndex:
+    """Index of every servable file of a built site.
+
+    The site is either a directory or a MemoryOutput (see ``storyville
+    serve --in-memory``), whose bytes are served without copying.
+
+    The index is empty until the first refresh(). Lookups read an
+    immutable snapshot, so a refresh running on another thread never
+    exposes a half-built index.
+
+    Attributes:
+        refreshed: Whether refresh() has run at least once
+    """
+
+    renders_on_request = False
+
+    def __init__(
+        self,
+        source: Path | MemoryOutput,
+        max_cached_bytes: int = MAX_CACHED_BYTES,
+    ):
+        self.source = source if isinstance(source, MemoryOutput) else Path(source)
+        self.max_cached_bytes = max_cached_bytes
+        self._files: dict[str, SiteFile] = {}
+        self.refreshed = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def get(self, relative_path: str) -> SiteFile | None:
+        """Look up a file by its slash-separated path under the root.
+
+        Args:
+            relative_path: e.g. "components/index.html"
+
+        Returns:
+            The SiteFile, or None if there is no such file
+        """
+        return self._files.get(relative_path)
+
+    def refresh(self) -> None:
+        """Re-read the output, rehashing only files that changed."""
+        with self._lock:
+            previous = self._files
+            files: dict[str, SiteFile] = {}
+            budget = [self.max_cached_bytes]
+            hashed = 0
+
+            if isinstance(self.source, MemoryOutput):
+                for key, memory_file in self.source.snapshot().items():
+                    signature = ((memory_file.size, memory_file.mtime_ns, 0),)
+                    entry = previous.get(key)
+                    if entry is not None and entry.signature == signature:
+                        files[key] = entry
+                        continue
+                    files[key] = site_file_from_bytes(
+                        key, memory_file.data, memory_file.mtime_ns, signature
+                    )
+                    hashed += 1
+
+            for key, path, stat_result, siblings in self._walk():
+                signature = (
+                    _signature(stat_result),
+                    *(_signature(s) for _encoding, _path, s in siblings),
+                )
+                entry = previous.get(key)
+                if (
+                    entry is not None
+                    and entry.signature == signature
+                    and entry.cached_bytes <= budget[0]
+                ):
+                    budget[0] -= entry.cached_bytes
+                    files[key] = entry
+                    continue
+
+                files[key] = self._load(path, stat_result, siblings, signature, budget)
+                hashed += 1
+
+            self._files = files
+            self.refreshed = True
+
+        logger.debug(f"Site index refreshed: {len(files)} files, {hashed} hashed")
+
+    def _walk(
+        self,
+    ) -> Iterator[tuple[str, Path, os.stat_result, list[_Sibling]]]:
+        """Yield (key, path, stat, siblings) for each servable file.
+
+        A .br/.gz file next to the compressible file it encodes is a
+        sibling, not a servable file of its own. Other .gz files, such
+        as archives under static/, are served as they are. A MemoryOutput
+        has nothing to walk.
+        """
+        if isinstance(self.source, MemoryOutput):
+            return
+        for dirpath, _dirnames, filenames in os.walk(self.source):
+            directory = Path(dirpath)
+            names = set(filenames)
+            for filename in filenames:
+                if filename.startswith("."):
+                    # Manifests and temporary files
+                    continue
+                base, suffix = os.path.splitext(filename)
+                if (
+                    suffix in COMPRESSED_SUFFIXES
+                    and is_compressible(base)
+                    and base in names
+                ):
+                    continue
+
+                path = directory / filename
+                try:
+                    stat_result = path.stat()
+                except FileNotFoundError:
+                    continue
+
+                siblings: list[_Sibling] = []
+                if is_compressible(filename):
+                    for encoding in ENCODINGS:
+                        sibling_name = f"{filename}{encoding.suffix}"
+                        if sibling_name not in names:
+                            continue
+                        sibling = directory / sibling_name
+                        try:
+                            sibling_stat = sibling.stat()
+                        except FileNotFoundError:
+                            continue
+                        # A sibling with any other mtime is stale
+                        if sibling_stat.st_mtime_ns == stat_result.st_mtime_ns:
+                            siblings.append((encoding.name, sibling, sibling_stat))
+
+                key = path.relative_to(self.source).as_posix()
+                yield key, path, stat_result, siblings
+
+    @staticmethod
+    def _load(
+        path: Path,
+        stat_result: os.stat_result,
+        siblings: list[_Sibling],
+        signature: tuple[tuple[int, int, int], ...],
+        budget: list[int],
+    ) -> SiteFile:
+        """Hash a file and its siblings into a new SiteFile."""
+        digest, body = _read(path, stat_result.st_size, budget)
+        etag = digest[:32]
+        identity = Representation(
+            path=path, size=stat_result.st_size, etag=f'"{etag}"', body=body
+        )
+
+        encoded: dict[str, Representation] = {}
+        for name, sibling, sibling_stat in siblings:
+            _digest, sibling_body = _read(sibling, sibling_stat.st_size, budget)
+            # Each representation needs its own strong validator
+            encoded[name] = Representation(
+                path=sibling,
+                size=sibling_stat.st_size,
+                etag=f'"{etag}-{name}"',
+                encoding=name,
+                body=sibling_body,
+            )
+
+        media_type, _ = mimetypes.guess_type(path.name)
+        return SiteFile(
+            identity=identity,
+            media_type=media_type or "text/plain",
+            last_modified=formatdate(stat_result.st_mtime, usegmt=True),
+            signature=signature,
+            encoded=encoded,
+        )
+
+
+def site_file_from_bytes(
+    relative_path: str,
+    data: bytes,
+    mtime_ns: int,
+    signature: tuple[tuple[int, int, int], ...] = (),
+) -> SiteFile:
+    """Hash bytes held in memory into a SiteFile that shares them.
+
+    Args:
+        relative_path: The file's path in the site, e.g. "index.html"
+        data: The file contents
+        mtime_ns: When the contents last changed, in nanoseconds
+        signature: Signature used by SiteIndex to recognize the file
+
+    Returns:
+        The SiteFile
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    path = Path(relative_path)
+    media_type, _ = mimetypes.guess_type(path.name)
+    return SiteFile(
+        identity=Representation(
+            path=path, size=len(data), etag=f'"{digest[:32]}"', body=data
+        ),
+        media_type=media_type or "text/plain",
+        last_modified=formatdate(mtime_ns / 1e9, usegmt=True),
+        signature=signature,
+    )
+
+
+def site_file_from_path(path: Path) -> SiteFile:
+    """Hash a file on disk into a SiteFile, keeping its bytes if small.
+
+    Args:
+        path: The file
+
+    Returns:
+        The SiteFile
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    stat_result = path.stat()
+    return SiteIndex._load(
+        path, stat_result, [], (_signature(stat_result),), [MAX_CACHED_FILE_SIZE]
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag.
+
+    If-None-Match uses weak comparison, so a W/ prefix is ignored.
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class _RangeNotSatisfiable(Exception):
+    """Raised when a requested byte range starts past the end of the file."""
+
+    def __init__(self, size: int):
+        super().__init__(f"Range not satisfiable for {size} bytes")
+        self.size = size
+
+
+def _byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Parse a Range header asking for a single range of bytes.
+
+    Like Starlette's FileResponse, only "bytes" ranges are supported. A
+    header this can't serve (another unit, several ranges, or a malformed
+    value) is ignored and the whole file is sent instead.
+
+    Args:
+        range_header: The request's Range header value
+        size: Size of the representation in bytes
+
+    Returns:
+        Inclusive (first, last) byte positions, or None to ignore the header
+
+    Raises:
+        _RangeNotSatisfiable: If the range lies entirely past the end
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first_text, separator, last_text = spec.strip().partition("-")
+    first_text, last_text = first_text.strip(), last_text.strip()
+    if not separator or not (first_text or last_text):
+        return None
+    if not all(text.isdigit() for text in (first_text, last_text) if text):
+        return None
+
+    if not first_text:
+        # A suffix range: the last N bytes
+        length = int(last_text)
+        if length == 0 or size == 0:
+            raise _RangeNotSatisfiable(size)
+        return max(size - length, 0), size - 1
+
+    first = int(first_text)
+    last = int(last_text) if last_text else size - 1
+    if last_text and last < first:
+        return None
+    if first >= size:
+        raise _RangeNotSatisfiable(size)
+    return first, min(last, size - 1)
+
+
+class SiteSource(Protocol):
+    """Where SiteFiles looks up the files it serves.
+
+    Attributes:
+        renders_on_request: Whether get() may do slow work, such as
+            rendering a page, and should run off the event loop
+    """
+
+    renders_on_request: bool
+
+    def get(self, relative_path: str) -> SiteFile | None:
+        """Look up a file by its slash-separated path in the site."""
+        ...
+
+
+class SiteFiles:
+    """ASGI app serving a built site from a SiteIndex or another SiteSource.
+
+    Behaves like StaticFiles with html=True: a directory serves its
+    index.html, a directory path without a trailing slash redirects to
+    one, and a missing file serves 404.html if the site has one.
+    Compressible files are sent as their preferred accepted .br/.gz
+    sibling when the build wrote one. Files with a content hash in their
+    name get a far-future immutable Cache-Control header. Uncompressed
+    files answer single-range requests with 206 Partial Content, so media
+    players can seek.
+    """
+
+    def __init__(self, index: SiteSource):
+        self.index = index
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+        if isinstance(self.index, SiteIndex) and not self.index.refreshed:
+            # Served without the app's lifespan; index once, off the loop
+            await run_in_threadpool(self.index.refresh)
+        if self.index.renders_on_request:
+            response = await run_in_threadpool(self.get_response, scope)
+        else:
+            response = self.get_response(scope)
+        await response(scope, receive, send)
+
+    def get_response(self, scope: Scope) -> Response:
+        """Build the response for an HTTP request scope."""
+        if scope["method"] not in ("GET", "HEAD"):
+            return PlainTextResponse(
+                "Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"}
+            )
+
+        route_path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and route_path.startswith(root_path):
+            route_path = route_path[len(root_path) :]
+        relative = posixpath.normpath(route_path.lstrip("/"))
+        if relative == "." or relative == "..":
+            relative = ""
+        elif relative.startswith("../"):
+            return PlainTextResponse("Not Found", status_code=404)
+
+        site_file = self.index.get(relative) if relative else None
+        if site_file is None:
+            if not relative or route_path.endswith("/"):
+                index_path = posixpath.join(relative, "index.html")
+                site_file = self.index.get(index_path)
+            elif self.index.get(posixpath.join(relative, "index.html")) is not None:
+                url = URL(scope=scope)
+                return RedirectResponse(url=url.replace(path=url.path + "/"))
+
+        if site_file is None:
+            not_found = self.index.get(NOT_FOUND_PAGE)
+            if not_found is None:
+                return PlainTextResponse("Not Found", status_code=404)
+            return self.file_response(not_found, scope, status_code=404)
+
+        return self.file_response(site_file, scope)
+
+    def file_response(
+        self, site_file: SiteFile, scope: Scope, status_code: int = 200
+    ) -> Response:
+        """Respond with a file's preferred representation, or 304.
+
+        Args:
+            site_file: The file to send
+            scope: The request scope
+            status_code: Status for a full response
+
+        Returns:
+            The response
+        """
+        request_headers = Headers(scope=scope)
+        representation = site_file.select(request_headers.get("accept-encoding", ""))
+
+        headers = {
+            "etag": representation.etag,
+            "last-modified": site_file.last_modified,
+        }
+        if site_file.encoded or is_compressible(site_file.identity.path):
+            headers["vary"] = "Accept-Encoding"
+        if is_fingerprinted(site_file.identity.path.name):
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+
+        if_none_match = request_headers.get("if-none-match")
+        if (
+            status_code == 200
+            and if_none_match is not None
+            and _etag_matches(if_none_match, representation.etag)
+        ):
+            return Response(status_code=304, headers=headers)
+
+        if representation.encoding is not None:
+            headers["content-encoding"] = representation.encoding
+
+        if representation.body is None:
+            # FileResponse answers Range requests itself
+            try:
+                stat_result = os.stat(representation.path)
+            except FileNotFoundError:
+                # Deleted since the last refresh
+                return PlainTextResponse("Not Found", status_code=404)
+            response = FileResponse(
+                representation.path,
+                status_code=status_code,
+                media_type=site_file.media_type,
+                stat_result=stat_result,
+            )
+            # Keep the index's validators instead of FileResponse's own
+            response.headers.update(headers)
+            return response
+
+        body = representation.body
+        if representation.encoding is None:
+            headers["accept-ranges"] = "bytes"
+            range_header = request_headers.get("range")
+            if_range = request_headers.get("if-range")
+            if (
+                status_code == 200
+                and range_header is not None
+                and if_range in (None, representation.etag, site_file.last_modified)
+            ):
+                try:
+                    byte_range = _byte_range(range_header, representation.size)
+                except _RangeNotSatisfiable as e:
+                    headers["content-range"] = f"bytes */{e.size}"
+                    return Response(status_code=416, headers=headers)
+                if byte_range is not None:
+                    first, last = byte_range
+                    headers["content-range"] = (
+                        f"bytes {first}-{last}/{representation.size}"
+                    )
+                    status_code = 206
+                    body = body[first : last + 1]
+
+        if scope["method"] == "HEAD":
+            headers["content-length"] = str(len(body))
+            body = b""
+        return Response(
+            body,
+            status_code=status_code,
+            media_type=site_file.media_type,
+            headers=headers,
+        )
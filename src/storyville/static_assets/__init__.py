@@ -4,32 +4,62 @@ This module provides utilities for discovering, copying, and managing static ass
 from both storyville core components and input directories.
 """
 
+from collections.abc import Mapping
 from pathlib import Path
 
-from storyville.static_assets.copying import copy_static_folder
-from storyville.static_assets.discovery import discover_static_folders
+from storyville.static_assets.copying import (
+    CopyStrategy,
+    SyncStats,
+    copy_static_folder,
+    place_file,
+    remove_orphans,
+    sync_file,
+)
+from storyville.static_assets.discovery import (
+    discover_static_folders,
+    iter_static_files,
+)
+from storyville.static_assets.fingerprint import (
+    ASSET_MANIFEST_NAME,
+    IMMUTABLE_CACHE_CONTROL,
+    AssetManifest,
+    is_fingerprinted,
+)
 from storyville.static_assets.models import StaticFolder
 from storyville.static_assets.paths import calculate_relative_static_path
 from storyville.static_assets.rewriting import (
     build_discovered_assets_map,
     rewrite_static_paths,
+    rewrite_static_paths_html,
 )
 from storyville.static_assets.validation import validate_no_collisions
 
 __all__ = [
+    "ASSET_MANIFEST_NAME",
+    "IMMUTABLE_CACHE_CONTROL",
+    "AssetManifest",
+    "CopyStrategy",
     "StaticFolder",
+    "SyncStats",
     "build_discovered_assets_map",
     "calculate_relative_static_path",
     "copy_all_static_assets",
     "copy_static_folder",
     "discover_static_folders",
+    "is_fingerprinted",
+    "place_file",
     "rewrite_static_paths",
+    "rewrite_static_paths_html",
+    "sync_all_static_assets",
     "validate_no_collisions",
 ]
 
 
 def copy_all_static_assets(
-    storyville_base: Path, input_dir: Path, output_dir: Path
+    storyville_base: Path,
+    input_dir: Path,
+    output_dir: Path,
+    strategy: CopyStrategy = CopyStrategy.COPY,
 ) -> int:
     """Discover and copy all static assets to a single static/ directory.
 
@@ -41,6 +71,8 @@ def copy_all_static_assets(
         storyville_base: Path to storyville installation (e.g., src/storyville)
         input_dir: Path to user's input directory
         output_dir: Path to output directory for built site
+        strategy: How to place each file: copy, hardlink, reflink or symlink,
+            falling back to a copy per file (default: copy)
 
     Returns:
         Number of static files copied
@@ -59,35 +91,91 @@ def copy_all_static_assets(
         - src/storyville/components/layout/static/pico.css
           -> output/static/components/layout/static/pico.css
     """
-    import shutil
-
     # Create single static output directory
     static_out = output_dir / "static"
     static_out.mkdir(parents=True, exist_ok=True)
 
-    # Discover from both sources
-    storyville_folders = discover_static_folders(storyville_base, "storyville")
-    input_folders = discover_static_folders(input_dir, "input_dir")
-
     # Copy all files to single static/ directory, preserving relative paths
     file_count = 0
-    for static_folder in storyville_folders + input_folders:
-        # Get the base path for this source type
-        base_path = (
-            storyville_base if static_folder.source_type == "storyville" else input_dir
+    for file_path, relative_file in iter_static_files(storyville_base, input_dir):
+        # Copy the file, creating parent directories as needed
+        place_file(file_path, static_out / relative_file, strategy)
+        file_count += 1
+
+    return file_count
+
+
+def sync_all_static_assets(
+    storyville_base: Path,
+    input_dir: Path,
+    output_dir: Path,
+    strategy: CopyStrategy = CopyStrategy.COPY,
+    fingerprints: Mapping[str, str] | None = None,
+) -> SyncStats:
+    """Bring output_dir/static/ in line with the discovered static assets.
+
+    Like copy_all_static_assets(), but only new or changed files are
+    copied (compared by size and mtime, then by content hash), and files
+    in output_dir/static/ that no longer have a source are deleted.
+    Rebuilding into an existing output therefore only copies what changed.
+
+    Args:
+        storyville_base: Path to storyville installation (e.g., src/storyville)
+        input_dir: Path to user's input directory
+        output_dir: Path to output directory for built site
+        strategy: How to place new or changed files (default: copy)
+        fingerprints: AssetManifest.assets; when given, each file is also
+            published under its fingerprinted name
+
+    Returns:
+        SyncStats with files copied, linked, unchanged and removed, and
+        bytes copied
+    """
+    static_out = output_dir / "static"
+    static_out.mkdir(parents=True, exist_ok=True)
+
+    stats = SyncStats()
+    expected: set[Path] = set()
+    for file_path, relative_file in iter_static_files(storyville_base, input_dir):
+        dest_path = static_out / relative_file
+        # Later sources win on collisions, as with copy_all_static_assets()
+        expected.add(dest_path)
+        sync_file(file_path, dest_path, stats, strategy)
+
+        hashed_name = (
+            None
+            if fingerprints is None
+            else fingerprints.get(f"static/{relative_file.as_posix()}")
         )
+        # Files missing from the manifest are only served by their plain name
+        if hashed_name is not None:
+            hashed_path = output_dir / hashed_name
+            expected.add(hashed_path)
+            # The name changes with the content, so an existing file is current
+            if not hashed_path.exists():
+                _place_fingerprinted(file_path, dest_path, hashed_path, strategy)
 
-        for file_path in static_folder.source_path.rglob("*"):
-            if file_path.is_file():
-                # Calculate relative path from base directory
-                relative_file = file_path.relative_to(base_path)
-                dest_path = static_out / relative_file
+    remove_orphans(static_out, expected, stats)
+    return stats
 
-                # Create parent directories if needed
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-                # Copy the file
-                shutil.copy2(file_path, dest_path)
-                file_count += 1
+def _place_fingerprinted(
+    source: Path, dest: Path, hashed_path: Path, strategy: CopyStrategy
+) -> None:
+    """Publish a static file under its fingerprinted name.
 
-    return file_count
+    A copied or reflinked dest is independent of the source, so the
+    fingerprinted name can share its data through a hard link. Linked
+    dests would change along with the source, breaking the promise of
+    the hashed name, so those files are copied instead.
+
+    Args:
+        source: The source file
+        dest: The file just synced into output_dir/static/
+        hashed_path: The fingerprinted destination
+        strategy: How dest was placed
+    """
+    if strategy in (CopyStrategy.COPY, CopyStrategy.REFLINK):
+        place_file(dest, hashed_path, CopyStrategy.HARDLINK)
+    else:
+        place_file(source, hashed_path, CopyStrategy.COPY)
@@ -1,24 +1,141 @@
 """Static folder copying utilities."""
 
+import errno
+import hashlib
 import logging
+import os
+import stat
+from dataclasses import dataclass
+from enum import StrEnum
 from pathlib import Path
-from shutil import copytree
+from shutil import copy2, copystat, copytree
 
+from storyville.compression import COMPRESSED_SUFFIXES
 from storyville.static_assets.models import StaticFolder
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# ioctl that clones a file's extents (Linux btrfs/xfs); fcntl.FICLONE is 3.12+
+_FICLONE: int | None = getattr(fcntl, "FICLONE", None)
+
+
+class CopyStrategy(StrEnum):
+    """How static files are placed in the output directory.
+
+    Every strategy other than COPY falls back to a plain copy, per file,
+    when the filesystem can't do it (e.g. hard links across devices).
+    """
+
+    COPY = "copy"
+    HARDLINK = "hardlink"
+    REFLINK = "reflink"
+    SYMLINK = "symlink"
+
+
+def _reflink(source: Path, dest: Path) -> bool:
+    """Clone source into dest without copying data where the filesystem allows.
+
+    Tries the FICLONE ioctl, then os.copy_file_range(), which shares
+    extents on filesystems that support it and copies in-kernel otherwise.
+
+    Args:
+        source: The source file
+        dest: The destination file, which must not exist
+
+    Returns:
+        True if dest shares source's data, False if it may have been copied
+
+    Raises:
+        OSError: If neither mechanism is available
+    """
+    with source.open("rb") as src, dest.open("xb") as dst:
+        try:
+            if fcntl is None or _FICLONE is None:
+                raise OSError(errno.EOPNOTSUPP, "FICLONE is not available")
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            cloned = True
+        except OSError:
+            if not hasattr(os, "copy_file_range"):
+                raise
+            remaining = os.fstat(src.fileno()).st_size
+            while remaining > 0:
+                count = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if count == 0:
+                    break
+                remaining -= count
+            cloned = False
+    copystat(source, dest)
+    return cloned
+
+
+def place_file(
+    source: Path, dest: Path, strategy: CopyStrategy = CopyStrategy.COPY
+) -> bool:
+    """Put source at dest using a copy strategy.
+
+    The file is placed at a temporary path that is renamed over dest, so
+    a hard-linked dest from a previous build generation is never modified.
+    If the strategy isn't supported for this file, it is copied instead.
+
+    Args:
+        source: The source file
+        dest: The destination file
+        strategy: How to place the file
+
+    Returns:
+        True if the file's data was copied, False if dest shares it with source
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = dest.with_name(f".{dest.name}.tmp")
+    temp_path.unlink(missing_ok=True)
+
+    copied = True
+    placed = False
+    if strategy is not CopyStrategy.COPY:
+        try:
+            match strategy:
+                case CopyStrategy.HARDLINK:
+                    temp_path.hardlink_to(source)
+                    copied = False
+                case CopyStrategy.SYMLINK:
+                    temp_path.symlink_to(source.resolve())
+                    copied = False
+                case CopyStrategy.REFLINK:
+                    copied = not _reflink(source, temp_path)
+            placed = True
+        except OSError as e:
+            logger.debug(f"Cannot {strategy} {source}, copying instead: {e}")
+            temp_path.unlink(missing_ok=True)
 
-def copy_static_folder(static_folder: StaticFolder, output_dir: Path) -> None:
+    if not placed:
+        copy2(source, temp_path)
+    os.replace(temp_path, dest)
+    return copied
+
+
+def copy_static_folder(
+    static_folder: StaticFolder,
+    output_dir: Path,
+    strategy: CopyStrategy = CopyStrategy.COPY,
+) -> None:
     """Copy a static folder to the output directory.
 
     This function uses shutil.copytree to recursively copy all contents from the
     source static folder to the calculated output location. It creates parent
     directories as needed and handles existing directories gracefully.
 
+    With a strategy other than COPY, each file is hard-linked, reflinked or
+    symlinked instead, falling back to a copy for files where that fails.
+
     Args:
         static_folder: The StaticFolder instance to copy
         output_dir: The base output directory for the built site
+        strategy: How to place each file (default: copy)
 
     Raises:
         OSError: If copying fails due to permissions or disk issues
@@ -53,11 +170,15 @@ def copy_static_folder(static_folder: StaticFolder, output_dir: Path) -> None:
     # Create parent directories if needed
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    def place(src: str, dst: str) -> None:
+        place_file(Path(src), Path(dst), strategy)
+
     # Copy the entire static folder
     try:
         copytree(
             static_folder.source_path,
             output_path,
+            copy_function=copy2 if strategy is CopyStrategy.COPY else place,
             dirs_exist_ok=True,
         )
         logger.debug(
@@ -70,3 +191,132 @@ def copy_static_folder(static_folder: StaticFolder, output_dir: Path) -> None:
         )
         logger.error(error_msg)
         raise
+
+
+@dataclass
+class SyncStats:
+    """Counters for one static asset sync.
+
+    Attributes:
+        copied: Files copied because they were new or changed
+        linked: New or changed files linked or cloned instead of copied
+        unchanged: Files already up to date in the output
+        removed: Orphaned files deleted from the output
+        bytes_copied: Total size of the copied files
+    """
+
+    copied: int = 0
+    linked: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    bytes_copied: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of static files now in the output."""
+        return self.copied + self.linked + self.unchanged
+
+
+def _file_digest(path: Path) -> bytes:
+    """Return the SHA-256 digest of a file's contents."""
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def _is_up_to_date(
+    source: Path, source_stat: os.stat_result, dest: Path, strategy: CopyStrategy
+) -> bool:
+    """Check whether dest already holds the contents of source.
+
+    Links are checked first: a symlink is current only under the SYMLINK
+    strategy, and a hard link to source only under HARDLINK. Otherwise
+    size and mtime are compared; copy2 preserves mtimes, so a file copied
+    by a previous sync matches on those alone. Same-sized files with
+    differing mtimes are compared by content hash.
+
+    Args:
+        source: The source file
+        source_stat: The source file's stat result
+        dest: The destination file
+        strategy: How files are being placed
+
+    Returns:
+        True if dest can be left alone
+    """
+    try:
+        dest_stat = dest.lstat()
+    except FileNotFoundError:
+        return False
+
+    if stat.S_ISLNK(dest_stat.st_mode):
+        return strategy is CopyStrategy.SYMLINK and dest.readlink() == source.resolve()
+    if strategy is CopyStrategy.SYMLINK:
+        return False
+    if os.path.samestat(dest_stat, source_stat):
+        return strategy is CopyStrategy.HARDLINK
+
+    if dest_stat.st_size != source_stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == source_stat.st_mtime_ns:
+        return True
+    if _file_digest(source) != _file_digest(dest):
+        return False
+
+    # Same content: align the mtime so the next sync is a stat() away
+    os.utime(dest, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    return True
+
+
+def sync_file(
+    source: Path,
+    dest: Path,
+    stats: SyncStats,
+    strategy: CopyStrategy = CopyStrategy.COPY,
+) -> None:
+    """Place source at dest unless dest is already up to date.
+
+    Args:
+        source: The source file
+        dest: The destination file
+        stats: Counters to update
+        strategy: How to place the file if it changed (default: copy)
+    """
+    source_stat = source.stat()
+    if _is_up_to_date(source, source_stat, dest, strategy):
+        stats.unchanged += 1
+        return
+
+    if place_file(source, dest, strategy):
+        stats.copied += 1
+        stats.bytes_copied += source_stat.st_size
+    else:
+        stats.linked += 1
+
+
+def remove_orphans(root: Path, expected: set[Path], stats: SyncStats) -> None:
+    """Delete files under root that aren't expected, pruning empty directories.
+
+    Compressed siblings of expected files (see storyville.compression)
+    are kept; precompression manages those.
+
+    Args:
+        root: The directory to clean
+        expected: Paths of files that should remain
+        stats: Counters to update
+    """
+    if not root.is_dir():
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        directory = Path(dirpath)
+        for filename in filenames:
+            path = directory / filename
+            if path in expected or (
+                path.suffix in COMPRESSED_SUFFIXES and path.with_suffix("") in expected
+            ):
+                continue
+            path.unlink()
+            stats.removed += 1
+            logger.debug(f"Removed orphaned static file {path}")
+        if directory != root and not any(directory.iterdir()):
+            directory.rmdir()
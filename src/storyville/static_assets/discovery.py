@@ -1,5 +1,6 @@
 """Static folder discovery utilities."""
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Literal
 
@@ -71,3 +72,34 @@ def discover_static_folders(
         static_folders.append(static_folder)
 
     return static_folders
+
+
+def iter_static_files(
+    storyville_base: Path, input_dir: Path
+) -> Iterator[tuple[Path, Path]]:
+    """Yield every static file with its path relative to output_dir/static/.
+
+    Storyville's folders come first, so on a collision the input_dir file
+    is yielded last and wins.
+
+    Args:
+        storyville_base: Path to storyville installation (e.g., src/storyville)
+        input_dir: Path to user's input directory
+
+    Yields:
+        Tuples of (source file, path relative to the static output directory)
+    """
+    # Discover from both sources
+    storyville_folders = discover_static_folders(storyville_base, "storyville")
+    input_folders = discover_static_folders(input_dir, "input_dir")
+
+    for static_folder in storyville_folders + input_folders:
+        # Get the base path for this source type
+        base_path = (
+            storyville_base if static_folder.source_type == "storyville" else input_dir
+        )
+
+        for file_path in static_folder.source_path.rglob("*"):
+            if file_path.is_file():
+                # Calculate relative path from base directory
+                yield file_path, file_path.relative_to(base_path)
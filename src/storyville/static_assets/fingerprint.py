@@ -0,0 +1,132 @@
+"""Content-hashed file names for static assets.
+
+A fingerprinted build gives every static file a second name embedding a
+hash of its contents, e.g. ``pico-main.3f9a1c2b7d.css``, and pages link
+to that name. A changed file gets a new name, so browsers and CDNs can
+cache fingerprinted files forever. The original names stay in place for
+references between static files, such as fonts loaded from CSS.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from storyville.static_assets.discovery import iter_static_files
+from storyville.static_assets.rewriting import DiscoveredAssets
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+
+# Bump when the asset manifest layout changes
+ASSET_MANIFEST_VERSION = 1
+
+# Hex digits of the content hash kept in a file name
+FINGERPRINT_LENGTH = 10
+
+# Cache-Control for files whose name changes with their content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_FINGERPRINTED_NAME = re.compile(rf"\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}(\.[^./]+)?$")
+
+
+def fingerprinted_path(path: str, digest: str) -> str:
+    """Insert a content hash before a path's file extension.
+
+    Args:
+        path: A slash-separated path, e.g. "static/a/pico-main.css"
+        digest: Hex digest of the file's contents
+
+    Returns:
+        The fingerprinted path
+
+    Example:
+        >>> fingerprinted_path("static/all.min.css", "3f9a1c2b7d0e")
+        'static/all.min.3f9a1c2b7d.css'
+    """
+    directory, slash, name = path.rpartition("/")
+    stem, dot, suffix = name.rpartition(".")
+    fingerprint = digest[:FINGERPRINT_LENGTH]
+    if not stem:
+        # No extension (or a dotfile): append the hash
+        return f"{path}.{fingerprint}"
+    return f"{directory}{slash}{stem}.{fingerprint}{dot}{suffix}"
+
+
+def is_fingerprinted(name: str) -> bool:
+    """Check whether a file name carries a content hash.
+
+    Args:
+        name: A file name or path
+
+    Returns:
+        True if the name looks like the output of fingerprinted_path()
+    """
+    return _FINGERPRINTED_NAME.search(name) is not None
+
+
+@dataclass
+class AssetManifest:
+    """Map of static asset references to their fingerprinted references.
+
+    Attributes:
+        assets: Reference such as "static/components/layout/static/pico-main.css"
+            -> fingerprinted reference in the same directory
+    """
+
+    assets: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_sources(cls, storyville_base: Path, input_dir: Path) -> AssetManifest:
+        """Hash every static file that a build would publish.
+
+        Args:
+            storyville_base: Path to storyville installation (e.g., src/storyville)
+            input_dir: Path to user's input directory
+
+        Returns:
+            The manifest for the current sources
+        """
+        assets: dict[str, str] = {}
+        for file_path, relative_file in iter_static_files(storyville_base, input_dir):
+            with file_path.open("rb") as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            reference = f"static/{relative_file.as_posix()}"
+            assets[reference] = fingerprinted_path(reference, digest)
+        return cls(assets=assets)
+
+    def discovered_assets(self) -> DiscoveredAssets:
+        """Return the manifest as a map for rewrite_static_paths().
+
+        Returns:
+            DiscoveredAssets resolving each reference to its fingerprinted path
+        """
+        return DiscoveredAssets(
+            {reference: Path(hashed) for reference, hashed in self.assets.items()}
+        )
+
+    def dumps(self) -> str:
+        """Serialize the manifest as it is written to asset-manifest.json.
+
+        Returns:
+            The JSON document
+        """
+        data = {
+            "version": ASSET_MANIFEST_VERSION,
+            "assets": dict(sorted(self.assets.items())),
+        }
+        return json.dumps(data, indent=1)
+
+    def save(self, output_dir: Path) -> None:
+        """Write the manifest into the output directory.
+
+        Args:
+            output_dir: The build output directory
+        """
+        manifest_path = output_dir / ASSET_MANIFEST_NAME
+        temp_path = manifest_path.with_name(f"{ASSET_MANIFEST_NAME}.tmp")
+        temp_path.write_text(self.dumps(), encoding="utf-8")
+        os.replace(temp_path, manifest_path)
@@ -3,12 +3,142 @@
 This module provides utilities for rewriting static asset paths in HTML to be
 relative based on page depth using tdom tree walking. This is an opt-in feature
 that components must explicitly use by calling rewrite_static_paths().
+rewrite_static_paths_html() does the same to already serialized HTML.
 """
 
+import logging
+import re
+from html import escape, unescape
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal, Self
 
-from tdom import Element, Fragment, Node
+from tdom import Node
+
+from storyville.utils import STATIC_PATH_ATTRS, iter_elements, static_path_prefix
+
+logger = logging.getLogger(__name__)
+
+# Reference prefixes that point at discovered static assets
+_STATIC_PREFIXES = ("static/", "storyville_static/")
+
+# A serialized href/src attribute holding a static reference
+_STATIC_ATTR_VALUE = re.compile(
+    rf'(\s(?:{"|".join(STATIC_PATH_ATTRS)})=")'
+    rf'((?:{"|".join(_STATIC_PREFIXES)})[^"]*)"'
+)
+
+
+def _filename_key(asset_ref: str) -> tuple[str, str]:
+    """Split a reference into its (prefix, filename) index key.
+
+    Example:
+        >>> _filename_key("static/components/nav/static/nav.css")
+        ('static', 'nav.css')
+    """
+    return asset_ref.split("/", 1)[0], asset_ref.rsplit("/", 1)[-1]
+
+
+def _build_filename_index(
+    assets: dict[str, Path],
+) -> tuple[dict[tuple[str, str], Path], dict[tuple[str, str], list[Path]]]:
+    """Index asset paths by (prefix, filename).
+
+    Args:
+        assets: Dictionary mapping asset references to full output paths
+
+    Returns:
+        Tuple of (index of unique filenames, filenames matching several paths)
+    """
+    candidates: dict[tuple[str, str], list[Path]] = {}
+    for key, path in assets.items():
+        paths = candidates.setdefault(_filename_key(key), [])
+        if path not in paths:
+            paths.append(path)
+
+    index = {key: paths[0] for key, paths in candidates.items() if len(paths) == 1}
+    ambiguous = {key: paths for key, paths in candidates.items() if len(paths) > 1}
+    return index, ambiguous
+
+
+class DiscoveredAssets(dict[str, Path]):
+    """Asset references mapped to output paths, indexed by filename.
+
+    A dict, so it can be used wherever a plain mapping of references is
+    expected. The (prefix, filename) index used for short references is
+    built on first lookup and rebuilt after the mapping changes; every
+    mutating dict method drops it, along with the cache key.
+
+    Attributes:
+        ambiguous: Short references that match several files, with the
+            candidate paths. These are never resolved.
+    """
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self.ambiguous: dict[str, list[Path]] = {}
+        self._index: dict[tuple[str, str], Path] | None = None
+        self._cache_key: frozenset[tuple[str, Path]] | None = None
+
+    def _changed(self) -> None:
+        """Forget everything derived from the mapping."""
+        self._index = None
+        self._cache_key = None
+
+    def __setitem__(self, key: str, value: Path) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other: Any) -> Self:
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def update(self, *args: Any, **kwargs: Path) -> None:
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self) -> tuple[str, Path]:
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key: str, default: Path) -> Path:
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    @property
+    def cache_key(self) -> frozenset[tuple[str, Path]]:
+        """A hashable snapshot of the mapping, for caches that depend on it."""
+        if self._cache_key is None:
+            self._cache_key = frozenset(self.items())
+        return self._cache_key
+
+    def lookup_filename(self, asset_ref: str) -> Path | None:
+        """Find the single asset with the reference's prefix and filename.
+
+        Args:
+            asset_ref: A reference such as "static/nav.css"
+
+        Returns:
+            The asset's output path, or None if there is no unique match
+        """
+        if self._index is None:
+            self._index, _ambiguous = _build_filename_index(self)
+        return self._index.get(_filename_key(asset_ref))
 
 
 def calculate_relative_static_path(
@@ -46,24 +176,25 @@ def calculate_relative_static_path(
         - depth=2: ../../../static/ or ../../../storyville_static/
     """
     # Calculate the relative prefix (number of "../" segments)
-    relative_prefix = "../" * (page_depth + 1)
+    relative_prefix = static_path_prefix(page_depth + 1)
 
     # Return the complete relative path
     return f"{relative_prefix}{asset_path}"
 
 
 def _walk_and_rewrite_element(
-    element: Element,
+    element: Node,
     page_depth: int,
     discovered_assets: dict[str, Path],
 ) -> None:
     """Walk an element and its children, rewriting static paths in place.
 
-    This function recursively traverses the node tree and modifies attribute
-    values for static asset references directly on the nodes.
+    The tree is visited in a single iterative pass. The "../" prefix is
+    computed once for the page depth, and each distinct reference is
+    resolved once per call, however often it appears on the page.
 
     Args:
-        element: The element to process
+        element: The element (or fragment) to process
         page_depth: The depth of the page in the site hierarchy
         discovered_assets: Dictionary mapping asset references to full output paths
 
@@ -72,40 +203,29 @@ def _walk_and_rewrite_element(
         - Only processes 'src' and 'href' attributes
         - Only rewrites paths starting with "static/" or "storyville_static/"
     """
-    # Check if this element has attributes
-    if hasattr(element, "attrs") and isinstance(element.attrs, dict):
-        # Check for src and href attributes
-        for attr_name in ["src", "href"]:
-            if attr_name in element.attrs:
-                attr_value = element.attrs[attr_name]
-
-                # Only process static paths
-                if isinstance(attr_value, str) and (
-                    attr_value.startswith("static/")
-                    or attr_value.startswith("storyville_static/")
-                ):
-                    # Resolve the asset
-                    resolved = resolve_static_asset_path(attr_value, discovered_assets)
-
-                    if resolved is not None:
-                        # Determine source type
-                        source_type: Literal["storyville", "input_dir"] = (
-                            "storyville"
-                            if attr_value.startswith("storyville_static")
-                            else "input_dir"
-                        )
-
-                        # Calculate relative path and rewrite in place
-                        new_path = calculate_relative_static_path(
-                            resolved, page_depth, source_type
-                        )
-                        element.attrs[attr_name] = new_path
-
-    # Recursively process children
-    if hasattr(element, "children") and isinstance(element.children, list):
-        for child in element.children:
-            if isinstance(child, Element):
-                _walk_and_rewrite_element(child, page_depth, discovered_assets)
+    prefix = static_path_prefix(page_depth + 1)
+    rewritten: dict[str, str | None] = {}
+
+    for node in iter_elements(element):
+        attrs = node.attrs
+        for attr_name in STATIC_PATH_ATTRS:
+            attr_value = attrs.get(attr_name)
+
+            # Only process static paths
+            if not isinstance(attr_value, str) or not attr_value.startswith(
+                _STATIC_PREFIXES
+            ):
+                continue
+
+            if attr_value not in rewritten:
+                resolved = resolve_static_asset_path(attr_value, discovered_assets)
+                rewritten[attr_value] = (
+                    None if resolved is None else f"{prefix}{resolved}"
+                )
+
+            new_path = rewritten[attr_value]
+            if new_path is not None:
+                attrs[attr_name] = new_path
 
 
 def resolve_static_asset_path(
@@ -130,28 +250,25 @@ def resolve_static_asset_path(
 
     Note:
         - Handles both short references ("static/nav.css") and full references
-        - Returns None if asset is not found in discovered_assets
+        - Short references fall back to a (prefix, filename) index, which
+          DiscoveredAssets builds once; plain dicts are indexed per call
+        - Returns None if asset is not found, or if its filename is ambiguous
         - The returned path is relative to the output directory
     """
     # Try direct lookup first
     if asset_ref in discovered_assets:
-        # Return the path as a string, relative to output dir
-        full_path = discovered_assets[asset_ref]
-        # Extract just the parts after output dir (e.g., "static/components/...")
         # The full_path should already be structured correctly from discovery
-        return str(full_path)
+        return str(discovered_assets[asset_ref])
 
-    # Try to find a matching asset by filename
     # asset_ref might be "static/nav.css" but discovered might be
-    # "static/components/nav/static/nav.css"
-    filename = asset_ref.split("/")[-1]
-    prefix = asset_ref.split("/")[0]  # "static" or "storyville_static"
-
-    for key, path in discovered_assets.items():
-        if key.endswith(filename) and key.startswith(prefix):
-            return str(path)
+    # "static/components/nav/static/nav.css": look it up by filename
+    if isinstance(discovered_assets, DiscoveredAssets):
+        path = discovered_assets.lookup_filename(asset_ref)
+    else:
+        index, _ambiguous = _build_filename_index(discovered_assets)
+        path = index.get(_filename_key(asset_ref))
 
-    return None
+    return None if path is None else str(path)
 
 
 def validate_static_reference(
@@ -182,6 +299,12 @@ def validate_static_reference(
     if resolved is not None:
         return (True, resolved)
 
+    if isinstance(discovered_assets, DiscoveredAssets):
+        candidates = discovered_assets.ambiguous.get(asset_ref)
+        if candidates:
+            matches = ", ".join(str(path) for path in candidates)
+            return (False, f"Ambiguous asset reference: {asset_ref} matches {matches}")
+
     return (False, f"Asset not found: {asset_ref}")
 
 
@@ -221,27 +344,62 @@ def rewrite_static_paths(
         - Works directly with node tree, avoiding string conversion and regex
         - Modifies the node tree in place and returns it
     """
-    # Handle different node types
-    if isinstance(node, Element):
-        _walk_and_rewrite_element(node, page_depth, discovered_assets)
-    elif isinstance(node, Fragment):
-        # Fragment contains a list of children - walk each one
-        if hasattr(node, "children") and isinstance(node.children, list):
-            for child in node.children:
-                if isinstance(child, Element):
-                    _walk_and_rewrite_element(child, page_depth, discovered_assets)
+    # Handles both Element and Fragment roots
+    _walk_and_rewrite_element(node, page_depth, discovered_assets)
 
     return node
 
 
+def rewrite_static_paths_html(
+    html: str,
+    page_depth: int,
+    discovered_assets: dict[str, Path],
+) -> str:
+    """Rewrite static asset paths in serialized HTML based on page depth.
+
+    Produces the same markup as rewrite_static_paths() followed by
+    serialization, without walking the node tree: one regular expression
+    pass finds the href/src attributes holding static references, and each
+    distinct reference is resolved once.
+
+    Args:
+        html: The serialized HTML
+        page_depth: The depth of the page in the site hierarchy
+        discovered_assets: Dictionary mapping asset references to full output paths
+
+    Returns:
+        The HTML with resolved references made relative; references that
+        don't resolve are left as they are
+
+    Example:
+        >>> assets = {"static/nav.css": Path("static/components/nav/static/nav.css")}
+        >>> rewrite_static_paths_html('<link href="static/nav.css" />', 2, assets)
+        '<link href="../../../static/components/nav/static/nav.css" />'
+    """
+    prefix = static_path_prefix(page_depth + 1)
+    rewritten: dict[str, str] = {}
+
+    def replace(match: re.Match[str]) -> str:
+        value = match.group(2)
+        new_value = rewritten.get(value)
+        if new_value is None:
+            resolved = resolve_static_asset_path(unescape(value), discovered_assets)
+            new_value = value if resolved is None else prefix + escape(resolved)
+            rewritten[value] = new_value
+        return f'{match.group(1)}{new_value}"'
+
+    return _STATIC_ATTR_VALUE.sub(replace, html)
+
+
 def build_discovered_assets_map(
     storyville_base: Path, input_dir: Path, output_dir: Path
-) -> dict[str, Path]:
+) -> DiscoveredAssets:
     """Build a mapping of asset references to full output paths.
 
     Discovers all static folders from both sources and builds a dictionary
     mapping short asset references to their full output paths for use with
-    rewrite_static_paths().
+    rewrite_static_paths(). Full references map to themselves, so they
+    resolve with a direct lookup too.
 
     Args:
         storyville_base: Path to storyville installation (e.g., src/storyville)
@@ -249,7 +407,7 @@ def build_discovered_assets_map(
         output_dir: Path to output directory for built site
 
     Returns:
-        Dictionary mapping asset references like "static/nav.css" to full paths
+        DiscoveredAssets mapping asset references like "static/nav.css" to full paths
 
     Example:
         >>> from pathlib import Path
@@ -264,6 +422,8 @@ def build_discovered_assets_map(
     Note:
         - Discovers assets from both src/storyville and input_dir
         - Maps short references to full output paths
+        - A short reference shared by several files is ambiguous: it is
+          logged here, recorded in ``ambiguous`` and never resolved
         - Used by rewrite_static_paths() for path resolution
     """
     from storyville.static_assets.discovery import discover_static_folders
@@ -272,11 +432,11 @@ def build_discovered_assets_map(
     storyville_folders = discover_static_folders(storyville_base, "storyville")
     input_folders = discover_static_folders(input_dir, "input_dir")
 
-    # Build the mapping
-    assets: dict[str, Path] = {}
+    # Short reference -> every full path it could mean
+    short_refs: dict[str, list[Path]] = {}
+    assets = DiscoveredAssets()
 
-    # Process storyville folders
-    for static_folder in storyville_folders:
+    for static_folder in storyville_folders + input_folders:
         output_path = static_folder.calculate_output_path(output_dir)
 
         # List all files in the static folder
@@ -286,31 +446,25 @@ def build_discovered_assets_map(
                     # Calculate the relative path from static folder to file
                     rel_file = file_path.relative_to(static_folder.source_path)
 
-                    # Create short reference: "storyville_static/filename"
-                    short_ref = f"storyville_static/{rel_file.name}"
-
-                    # Create full path: "storyville_static/components/nav/static/filename"
+                    # Full path: "storyville_static/components/nav/static/filename"
+                    # or "static/components/nav/static/filename"
                     full_rel = output_path.relative_to(output_dir) / rel_file
-
-                    assets[short_ref] = full_rel
-
-    # Process input_dir folders
-    for static_folder in input_folders:
-        output_path = static_folder.calculate_output_path(output_dir)
-
-        # List all files in the static folder
-        if static_folder.source_path.exists():
-            for file_path in static_folder.source_path.rglob("*"):
-                if file_path.is_file():
-                    # Calculate the relative path from static folder to file
-                    rel_file = file_path.relative_to(static_folder.source_path)
-
-                    # Create short reference: "static/filename"
-                    short_ref = f"static/{rel_file.name}"
-
-                    # Create full path: "static/components/nav/static/filename"
-                    full_rel = output_path.relative_to(output_dir) / rel_file
-
-                    assets[short_ref] = full_rel
+                    assets[full_rel.as_posix()] = full_rel
+
+                    # Short reference: "storyville_static/filename" or "static/filename"
+                    short_ref = f"{static_folder.output_prefix}/{rel_file.name}"
+                    short_refs.setdefault(short_ref, []).append(full_rel)
+
+    for short_ref, paths in short_refs.items():
+        if len(paths) == 1:
+            assets[short_ref] = paths[0]
+        else:
+            assets.ambiguous[short_ref] = paths
+            logger.warning(
+                "Ambiguous static asset reference %s matches %d files: %s",
+                short_ref,
+                len(paths),
+                ", ".join(str(path) for path in paths),
+            )
 
     return assets
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from functools import cached_property
 from typing import TYPE_CHECKING
 
 from tdom import Node, html
@@ -36,6 +37,19 @@ class StoryView:
     cached_navigation: str | None = None
     with_assertions: bool = True
 
+    @cached_property
+    def rendered_instance(self) -> Node | None:
+        """The story's component instance, constructed once per view.
+
+        Story.instance calls the target on every access. The assertions,
+        the story page and the themed story page all share this node
+        instead, so each component tree is built once per page.
+
+        Returns:
+            Node instance from the story target, or None if no target exists.
+        """
+        return self.story.instance
+
     def _execute_assertions(self, with_assertions: bool = True) -> None:
         """Execute assertions against the rendered story instance.
 
@@ -47,7 +61,7 @@ class StoryView:
             return
 
         # Get rendered element from story instance
-        rendered_element = self.story.instance
+        rendered_element = self.rendered_instance
         if rendered_element is None:
             return
 
@@ -111,19 +125,14 @@ class StoryView:
 
         return badges
 
-    def __call__(self) -> Node:
-        """Render the story to a tdom Node.
+    def layout(self) -> Layout:
+        """Build the Layout wrapping the story content (modes B and C).
+
+        Assertions must already have run so their badges can be shown.
 
         Returns:
-            A tdom Node representing the rendered story.
+            The Layout for this page, renderable as a Node or as a string.
         """
-        # Execute assertions if enabled (after story.instance is available)
-        self._execute_assertions(with_assertions=self.with_assertions)
-
-        # Mode A: Custom template rendering
-        if self.story.template is not None:
-            return self.story.template()
-
         # Render badges as tdom Nodes
         badge_nodes = self._render_badges()
 
@@ -140,8 +149,7 @@ class StoryView:
 
             if badge_nodes:
                 # Header with badges and iframe
-                return html(t"""\
-<{Layout} view_title={self.story.title} site={self.site} depth={3} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+                content = html(t"""\
 <div>
 <div class="story-header" style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1rem;">
   <div class="story-header-left">
@@ -154,26 +162,22 @@ class StoryView:
 {description_p}
 <p>Props: <code>{str(self.story.props)}</code></p>
 <iframe src="./themed_story.html" style="{iframe_style}"></iframe>
-</div>
-</{Layout}>""")
+</div>""")
             else:
                 # Header without badges and iframe
-                return html(t"""\
-<{Layout} view_title={self.story.title} site={self.site} depth={3} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+                content = html(t"""\
 <div>
 <h1>{self.story.title}</h1>
 {description_p}
 <p>Props: <code>{str(self.story.props)}</code></p>
 <iframe src="./themed_story.html" style="{iframe_style}"></iframe>
-</div>
-</{Layout}>""")
+</div>""")
 
-        # Mode B: Default layout rendering wrapped with Layout (depth=2 for story pages)
+        # Mode B: Default layout rendering
         # Use flexbox for header layout with title on left, badges on right
-        if badge_nodes:
+        elif badge_nodes:
             # Header with badges (construct using tdom html)
-            return html(t"""\
-<{Layout} view_title={self.story.title} site={self.site} depth={3} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+            content = html(t"""\
 <div>
 <div class="story-header" style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1rem;">
   <div class="story-header-left">
@@ -186,20 +190,56 @@ class StoryView:
 {description_p}
 <p>Props: <code>{str(self.story.props)}</code></p>
 <div>
-{self.story.instance}
-</div>
+{self.rendered_instance}
 </div>
-</{Layout}>""")
+</div>""")
         else:
             # Header without badges (original layout)
-            return html(t"""\
-<{Layout} view_title={self.story.title} site={self.site} depth={3} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+            content = html(t"""\
 <div>
 <h1>{self.story.title}</h1>
 {description_p}
 <p>Props: <code>{str(self.story.props)}</code></p>
 <div>
-{self.story.instance}
-</div>
+{self.rendered_instance}
 </div>
-</{Layout}>""")
+</div>""")
+
+        # Wrap with Layout (depth=3 for story pages)
+        return Layout(
+            view_title=self.story.title,
+            site=self.site,
+            children=content,
+            depth=3,
+            resource_path=self.resource_path,
+            cached_navigation=self.cached_navigation,
+        )
+
+    def __call__(self) -> Node:
+        """Render the story to a tdom Node.
+
+        Returns:
+            A tdom Node representing the rendered story.
+        """
+        # Execute assertions if enabled (after rendered_instance is available)
+        self._execute_assertions(with_assertions=self.with_assertions)
+
+        # Mode A: Custom template rendering
+        if self.story.template is not None:
+            return self.story.template()
+
+        return self.layout()()
+
+    def render_html(self) -> str:
+        """Render the story to an HTML string using the compiled layout shell.
+
+        Returns:
+            The rendered page as a string.
+        """
+        self._execute_assertions(with_assertions=self.with_assertions)
+
+        # Mode A: Custom templates control the whole page
+        if self.story.template is not None:
+            return str(self.story.template())
+
+        return self.layout().render_html()
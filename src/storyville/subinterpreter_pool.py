@@ -3,52 +3,88 @@
 This module provides functionality to create and manage a pool of Python
 subinterpreters using InterpreterPoolExecutor. Subinterpreters allow fresh
 module imports on each build, enabling true hot reloading of stories.py files.
+
+Each interpreter imports the framework modules in WARMUP_MODULES when it
+starts, and create_pool() starts every interpreter in the background, so
+a rebuild finds an idle interpreter that only has to import the user's
+package. User modules are still cleared before every build.
 """
 
 import asyncio
 import logging
 import sys
-from concurrent.futures import InterpreterPoolExecutor
+from collections.abc import Callable, Collection
+from concurrent.futures import Future, InterpreterPoolExecutor, wait
+from functools import partial
 from pathlib import Path
+from time import monotonic
+
+from storyville.build import BuildCancelled
 
 logger = logging.getLogger(__name__)
 
 # Capture sys.path at module load time to pass to subinterpreters
 _MAIN_SYS_PATH = sys.path.copy()
 
+# Seconds allowed for a build in a subinterpreter
+BUILD_TIMEOUT = 60.0
+
+# Seconds between checks of should_cancel while a build runs
+CANCEL_POLL_INTERVAL = 0.05
+
+# Interpreters in the pool; builds never overlap, so one is always idle
+DEFAULT_POOL_SIZE = 2
+
+# Framework modules every build needs, imported when an interpreter starts
+WARMUP_MODULES = (
+    "tdom",
+    "storyville",
+    "storyville.build",
+    "storyville.static_assets",
+)
+
 
-def warmup_interpreter() -> bool:
+def warmup_interpreter(sys_path: list[str] | None = None) -> bool:
     """Warm up a subinterpreter by pre-importing common modules.
 
-    This function is designed to be submitted to an InterpreterPoolExecutor
-    to pre-load commonly used modules, reducing build latency.
+    This function is the pool's initializer, so it runs once in each
+    interpreter, before the first task that interpreter runs. It can also
+    be submitted to an InterpreterPoolExecutor directly.
 
     Imports:
-        - storyville: Core framework module
-        - tdom: Template rendering module
+        The modules in WARMUP_MODULES: tdom and the storyville build
+        machinery, but never the user's package
+
+    Args:
+        sys_path: Python sys.path to use in the subinterpreter (default: None,
+            keep the interpreter's own)
 
     Returns:
         bool: True if warm-up completed successfully, False on error
 
     Note:
         This is a module-level callable compatible with InterpreterPoolExecutor.
-        Import errors are logged but don't cause the warm-up to fail completely.
+        Errors are logged but never raised: a failing initializer would break
+        the pool, while a failed warm-up only makes the first build slower.
     """
+    import importlib
     import logging
+    import sys
 
     logger = logging.getLogger(__name__)
 
-    try:
-        # Pre-import storyville module
-        import storyville  # noqa: F401
+    if sys_path is not None:
+        sys.path.clear()
+        sys.path.extend(sys_path)
 
-        # Pre-import tdom module
-        import tdom  # noqa: F401
+    try:
+        for module_name in WARMUP_MODULES:
+            importlib.import_module(module_name)
 
         logger.info("Interpreter warm-up completed successfully")
         return True
 
-    except ImportError as e:
+    except Exception as e:
         logger.error(f"Warm-up import failed: {e}")
         return False
 
@@ -66,32 +102,9 @@ def _clear_user_modules(package_location: str) -> None:
         This function must be called from within a subinterpreter.
         It preserves core modules (storyville, tdom) while clearing user modules.
     """
-    import logging
-    import sys
-
-    logger = logging.getLogger(__name__)
-
-    # Extract the top-level package name from package_location
-    # e.g., "examples.basic" -> "examples"
-    package_prefix = package_location.split(".")[0]
+    from storyville.catalog import clear_package_modules
 
-    # Find all modules that belong to the user's package
-    modules_to_clear = [
-        module_name
-        for module_name in list(sys.modules.keys())
-        if module_name.startswith(package_prefix + ".") or module_name == package_prefix
-    ]
-
-    # Clear the modules
-    for module_name in modules_to_clear:
-        del sys.modules[module_name]
-
-    if modules_to_clear:
-        logger.info(
-            f"Cleared {len(modules_to_clear)} user modules from sys.modules: {package_prefix}.*"
-        )
-    else:
-        logger.info(f"No cached modules found for {package_prefix}.*")
+    clear_package_modules(package_location)
 
 
 def _build_site_in_interpreter(
@@ -99,6 +112,11 @@ def _build_site_in_interpreter(
     output_dir_str: str,
     sys_path: list[str],
     with_assertions: bool = True,
+    incremental: bool = False,
+    atomic: bool = False,
+    static_strategy: str = "copy",
+    cancel_path: str | None = None,
+    pages: list[str] | None = None,
 ) -> None:
     """Execute build_site in a subinterpreter.
 
@@ -111,6 +129,13 @@ def _build_site_in_interpreter(
         output_dir_str: Output directory path as string (Path objects can't cross interpreter boundary)
         sys_path: Python sys.path to use in the subinterpreter
         with_assertions: Whether to enable assertions during rendering (default: True)
+        incremental: Whether to only re-render changed pages (default: False)
+        atomic: Whether to stage the build and swap it into place (default: False)
+        static_strategy: How static assets are placed in the output (default: copy)
+        cancel_path: The build stops with BuildCancelled once a file exists at
+            this path (default: None)
+        pages: Primary page paths to re-render in a targeted rebuild
+            (default: None)
 
     Note:
         This function runs inside a subinterpreter and writes directly to disk.
@@ -121,6 +146,7 @@ def _build_site_in_interpreter(
     import logging
     import os
     import sys
+    from functools import partial
     from pathlib import Path
 
     # Set up sys.path in the subinterpreter to match the main interpreter
@@ -139,11 +165,18 @@ def _build_site_in_interpreter(
 
     try:
         # Import build_site fresh in this subinterpreter
-        from storyville.build import build_site
+        from storyville.build import BuildCancelled, build_site
+        from storyville.static_assets import CopyStrategy
 
         # Convert string path back to Path object
         output_dir = Path(output_dir_str)
 
+        # Objects like Events can't cross the interpreter boundary, so the
+        # main interpreter asks for cancellation by creating a file
+        should_cancel = (
+            None if cancel_path is None else partial(os.path.exists, cancel_path)
+        )
+
         logger.info(
             f"Starting build in subinterpreter: {package_location} -> {output_dir}"
         )
@@ -153,10 +186,18 @@ def _build_site_in_interpreter(
             package_location=package_location,
             output_dir=output_dir,
             with_assertions=with_assertions,
+            incremental=incremental,
+            atomic=atomic,
+            static_strategy=CopyStrategy(static_strategy),
+            should_cancel=should_cancel,
+            pages=pages,
         )
 
         logger.info("Build in subinterpreter completed successfully")
 
+    except BuildCancelled:
+        logger.info("Build in subinterpreter cancelled")
+        raise
     except Exception as e:
         logger.error(f"Build in subinterpreter failed: {e}", exc_info=True)
         raise
@@ -167,21 +208,35 @@ def build_in_subinterpreter(
     package_location: str,
     output_dir: Path,
     with_assertions: bool = True,
+    incremental: bool = False,
+    atomic: bool = False,
+    static_strategy: str = "copy",
+    should_cancel: Callable[[], bool] | None = None,
+    pages: Collection[str] | None = None,
 ) -> None:
     """Execute a build in a subinterpreter with module isolation.
 
     This function:
     1. Submits the build task to the interpreter pool
     2. The subinterpreter clears user modules before building (fresh imports)
-    3. Waits for completion
+    3. Waits for completion, asking the build to stop once should_cancel
+       returns True
 
     Args:
         pool: The InterpreterPoolExecutor to use
         package_location: Package location to build from
         output_dir: Output directory to write the built site to
         with_assertions: Whether to enable assertions during rendering (default: True)
+        incremental: Whether to only re-render changed pages (default: False)
+        atomic: Whether to stage the build and swap it into place (default: False)
+        static_strategy: How static assets are placed in the output (default: copy)
+        should_cancel: Polled every CANCEL_POLL_INTERVAL while the build runs
+            (default: None)
+        pages: Primary page paths to re-render in a targeted rebuild
+            (default: None)
 
     Raises:
+        BuildCancelled: If the build stopped because should_cancel asked it to
         Exception: If build fails in the subinterpreter
 
     Note:
@@ -189,6 +244,9 @@ def build_in_subinterpreter(
         to ensure fresh imports. This handles the case where different interpreters
         from the pool are used for consecutive builds. Core modules (storyville, tdom)
         remain cached for performance across builds in the same interpreter.
+
+        Cancellation is signalled through a marker file next to the output
+        directory, which the build in the subinterpreter checks between pages.
     """
     logger.info(
         f"Submitting build to subinterpreter pool: {package_location} -> {output_dir}"
@@ -197,6 +255,10 @@ def build_in_subinterpreter(
     # Convert Path to string (Path objects can't cross interpreter boundary)
     output_dir_str = str(output_dir)
 
+    cancel_path = output_dir.with_name(f".{output_dir.name}.cancel")
+    cancel_path.unlink(missing_ok=True)
+    cancel_requested = False
+
     try:
         # Submit build task to pool and wait for completion
         # Pass sys.path so subinterpreter can find all modules
@@ -206,22 +268,50 @@ def build_in_subinterpreter(
             output_dir_str,
             _MAIN_SYS_PATH,
             with_assertions,
+            incremental,
+            atomic,
+            str(static_strategy),
+            None if should_cancel is None else str(cancel_path),
+            None if pages is None else sorted(pages),
         )
-        future.result(timeout=60.0)  # 60 second timeout for build
+        if should_cancel is None:
+            future.result(timeout=BUILD_TIMEOUT)
+        else:
+            deadline = monotonic() + BUILD_TIMEOUT
+            while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+                if not cancel_requested and should_cancel():
+                    cancel_path.touch()
+                    cancel_requested = True
+                if monotonic() >= deadline:
+                    break
+            # Raises TimeoutError if the deadline passed first
+            future.result(timeout=0)
 
         logger.info("Build in subinterpreter completed successfully")
 
     except Exception as e:
+        if cancel_requested:
+            logger.info("Build in subinterpreter cancelled")
+            raise BuildCancelled("Build cancelled") from e
         logger.error(f"Build in subinterpreter failed: {e}", exc_info=True)
         # Re-raise to allow caller to handle the error
         raise
 
+    finally:
+        if cancel_requested:
+            cancel_path.unlink(missing_ok=True)
+
 
 async def rebuild_callback_subinterpreter(
     package_location: str,
     output_dir: Path,
     pool: InterpreterPoolExecutor,
     with_assertions: bool = True,
+    incremental: bool = False,
+    atomic: bool = False,
+    static_strategy: str = "copy",
+    should_cancel: Callable[[], bool] | None = None,
+    pages: Collection[str] | None = None,
 ) -> None:
     """Async callback for rebuilding using subinterpreters.
 
@@ -234,8 +324,16 @@ async def rebuild_callback_subinterpreter(
         output_dir: Output directory to write the built site to
         pool: The InterpreterPoolExecutor to use for building
         with_assertions: Whether to enable assertions during rendering (default: True)
+        incremental: Whether to only re-render changed pages (default: False)
+        atomic: Whether to stage the build and swap it into place (default: False)
+        static_strategy: How static assets are placed in the output (default: copy)
+        should_cancel: Returns True once the build's result is no longer
+            wanted, e.g. because newer changes arrived (default: None)
+        pages: Primary page paths to re-render in a targeted rebuild
+            (default: None)
 
     Raises:
+        BuildCancelled: If the build stopped because should_cancel asked it to
         Exception: If build fails in the subinterpreter
 
     Note:
@@ -253,42 +351,103 @@ async def rebuild_callback_subinterpreter(
             package_location,
             output_dir,
             with_assertions,
+            incremental,
+            atomic,
+            static_strategy,
+            should_cancel,
+            pages,
         )
 
         logger.info("Async rebuild callback completed successfully")
 
+    except BuildCancelled:
+        raise
     except Exception as e:
         logger.error(f"Async rebuild callback failed: {e}", exc_info=True)
         # Re-raise to allow watcher to handle the error
         raise
 
 
-def create_pool() -> InterpreterPoolExecutor:
+def _start_interpreter() -> int:
+    """No-op task that makes the pool start an interpreter.
+
+    The pool's initializer has already warmed the interpreter by the time
+    this runs.
+
+    Returns:
+        The ID of the interpreter it ran in
+    """
+    from concurrent import interpreters
+
+    return interpreters.get_current().id
+
+
+def create_pool(
+    pool_size: int = DEFAULT_POOL_SIZE, warm: bool = True
+) -> InterpreterPoolExecutor:
     """Create a pool of subinterpreters for running builds.
 
-    Creates an InterpreterPoolExecutor with a pool size of 2 interpreters.
-    The interpreters start clean with no pre-imported modules to ensure
-    complete module isolation.
+    Each interpreter runs warmup_interpreter() when it starts, importing the
+    framework modules ahead of its first build. With warm=True, every
+    interpreter is started in the background right away, so cold imports
+    happen while the developer is still editing instead of during a
+    rebuild. User modules are never pre-imported, and builds clear them
+    before importing the user's package afresh.
+
+    Args:
+        pool_size: Number of interpreters (default: DEFAULT_POOL_SIZE)
+        warm: Whether to start and warm up every interpreter now instead of
+            on first use (default: True)
 
     Returns:
-        InterpreterPoolExecutor: The created pool with 2 clean interpreters
+        InterpreterPoolExecutor: The created pool
+
+    Raises:
+        ValueError: If pool_size is less than 1
 
     Note:
         The pool should be shut down using shutdown_pool() when no longer needed.
     """
-    pool_size = 2
+    if pool_size < 1:
+        msg = f"pool_size must be at least 1, got {pool_size}"
+        raise ValueError(msg)
 
     logger.info(f"Creating interpreter pool with size={pool_size}")
 
-    # Create the pool with exactly 2 interpreters
-    # No warmup - start with completely clean interpreters for guaranteed fresh imports
-    pool = InterpreterPoolExecutor(max_workers=pool_size)
+    pool = InterpreterPoolExecutor(
+        max_workers=pool_size,
+        initializer=warmup_interpreter,
+        initargs=(_MAIN_SYS_PATH,),
+    )
 
-    logger.info(f"Interpreter pool created with {pool_size} clean interpreters")
+    if warm:
+        # The executor starts a new interpreter for a task unless one is
+        # idle, and none is until its initializer and first task finish, so
+        # pool_size no-op tasks submitted together start every interpreter
+        start = monotonic()
+        for _ in range(pool_size):
+            future = pool.submit(_start_interpreter)
+            future.add_done_callback(partial(_log_warmup, start))
+        logger.info(f"Warming up {pool_size} interpreters in the background")
+    else:
+        logger.info(f"Interpreter pool created with {pool_size} interpreters")
 
     return pool
 
 
+def _log_warmup(start: float, future: Future[int]) -> None:
+    """Report the outcome of a task that started an interpreter."""
+    if future.cancelled():
+        return
+    if future.exception() is not None:
+        logger.warning("Interpreter failed to start; the pool starts it on demand")
+        return
+    logger.info(
+        f"Interpreter {future.result()} started and warmed up in "
+        f"{monotonic() - start:.2f}s"
+    )
+
+
 def shutdown_pool(pool: InterpreterPoolExecutor) -> None:
     """Gracefully shutdown the interpreter pool.
 
@@ -33,11 +33,11 @@ class SubjectView:
     resource_path: str = ""
     cached_navigation: str | None = None
 
-    def __call__(self) -> Node:
-        """Render the subject to a tdom Node.
+    def layout(self) -> Layout:
+        """Build the Layout wrapping the subject content.
 
         Returns:
-            A tdom Node representing the rendered subject.
+            The Layout for this page, renderable as a Node or as a string.
         """
         # Conditionally create description paragraph
         description_p = (
@@ -55,16 +55,14 @@ class SubjectView:
 
         # Render stories or empty state
         if not self.subject.items:
-            # Empty state - wrapped with Layout (depth=2 for subject pages)
-            view_content = html(t"""\
-<{Layout} view_title={self.subject.title} site={self.site} depth={2} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+            # Empty state
+            content = html(t"""\
 <div>
 <h1>{self.subject.title}</h1>
 {description_p}
 <p>Target: {target_name}</p>
 <p>No stories defined for this component</p>
-</div>
-</{Layout}>""")
+</div>""")
         else:
             # Build story cards as a list - create individual li elements
             story_items = []
@@ -75,9 +73,8 @@ class SubjectView:
                     html(t'<li><a href="{story_url}">{story.title}</a></li>')
                 )
 
-            # Create the main content wrapped with Layout (depth=2 for subject pages)
-            view_content = html(t"""\
-<{Layout} view_title={self.subject.title} site={self.site} depth={2} resource_path={self.resource_path} cached_navigation={self.cached_navigation}>
+            # Create the main content with the story list
+            content = html(t"""\
 <div>
 <h1>{self.subject.title}</h1>
 {description_p}
@@ -85,7 +82,30 @@ class SubjectView:
 <ul>
 {story_items}
 </ul>
-</div>
-</{Layout}>""")
+</div>""")
+
+        # Wrap with Layout (depth=2 for subject pages)
+        return Layout(
+            view_title=self.subject.title,
+            site=self.site,
+            children=content,
+            depth=2,
+            resource_path=self.resource_path,
+            cached_navigation=self.cached_navigation,
+        )
+
+    def __call__(self) -> Node:
+        """Render the subject to a tdom Node.
 
-        return view_content
+        Returns:
+            A tdom Node representing the rendered subject.
+        """
+        return self.layout()()
+
+    def render_html(self) -> str:
+        """Render the subject to an HTML string using the compiled layout shell.
+
+        Returns:
+            The complete HTML document.
+        """
+        return self.layout().render_html()
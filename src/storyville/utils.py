@@ -1,14 +1,63 @@
 """General utility functions for Storyville."""
 
+import re
+
 from tdom import Element, Fragment, Node
 
+# Attributes that can hold a static asset URL
+STATIC_PATH_ATTRS = ("href", "src")
+
+# A serialized href/src attribute whose value starts with static/
+_STATIC_ATTR = re.compile(rf'(\s(?:{"|".join(STATIC_PATH_ATTRS)})=")static/')
+
+
+def static_path_prefix(depth: int) -> str:
+    """Return the "../" prefix that leads from a page at depth to the site root.
+
+    Args:
+        depth: The depth of the page in the output directory (0 = root)
+
+    Returns:
+        "../" repeated depth times, or "" at the root
+    """
+    return "../" * depth if depth > 0 else ""
+
+
+def iter_elements(node: Node) -> list[Element]:
+    """Collect the elements reachable from node in a single iterative pass.
+
+    Descends through element children only, like the original recursive
+    walkers, without recursion or per-node hasattr() checks.
+
+    Args:
+        node: The Element or Fragment to start from
+
+    Returns:
+        Every reachable Element (order is unspecified)
+    """
+    if isinstance(node, Element):
+        stack = [node]
+    elif isinstance(node, Fragment):
+        stack = [child for child in node.children if isinstance(child, Element)]
+    else:
+        return []
+
+    elements: list[Element] = []
+    while stack:
+        element = stack.pop()
+        elements.append(element)
+        stack.extend(child for child in element.children if isinstance(child, Element))
+    return elements
+
 
 def rewrite_static_paths(node: Node, depth: int) -> Node:
     """Rewrite static/ paths based on page depth.
 
-    This function walks the node tree and rewrites href/src attributes
-    that start with "static/" to include the correct ../ prefix based
-    on the page's depth in the output directory.
+    This function walks the node tree once and rewrites href/src
+    attributes that start with "static/" to include the correct ../
+    prefix based on the page's depth in the output directory. The prefix
+    is computed once per call. When the tree is serialized right away,
+    rewrite_static_paths_html() avoids the walk.
 
     Args:
         node: The node tree to rewrite
@@ -23,44 +72,44 @@ def rewrite_static_paths(node: Node, depth: int) -> Node:
         >>> rewritten = rewrite_static_paths(node, depth=1)
         >>> # href is now "../../static/style.css"
     """
+    # We need ../ for each directory level, which IS depth:
+    # - index.html (0 dirs deep) -> static/
+    # - components/index.html (1 dir deep) -> ../static/
+    # - components/heading/index.html (2 dirs deep) -> ../../static/
+    prefix = static_path_prefix(depth)
+    if not prefix:
+        # Root pages keep their paths, so there is nothing to walk
+        return node
 
-    def walk_element(element: Element) -> None:
-        # Rewrite static/ paths in href and src attributes
-        if hasattr(element, "attrs") and isinstance(element.attrs, dict):
-            for attr_name in ["href", "src"]:
-                if attr_name in element.attrs:
-                    attr_value = element.attrs[attr_name]
-                    if isinstance(attr_value, str) and attr_value.startswith("static/"):
-                        # Add ../ prefix based on depth
-                        # depth=0: static/file.css (no prefix)
-                        # depth=1: ../../static/file.css (up 2 levels to get to root from section/subject/)
-                        # For section pages at root (components/index.html), depth=0 but need ../
-                        # Wait, sections are at depth 0 too since they're at root level
-                        # The issue is: index.html is at root (depth 0) -> needs "static/"
-                        # components/index.html is ALSO at depth 0 (sections at root) -> needs "../static/"
-                        # components/heading/index.html is at depth 1 -> needs "../../static/"
-
-                        # Actually, for file-based paths:
-                        # - index.html (0 dirs deep) -> static/
-                        # - components/index.html (1 dir deep) -> ../static/
-                        # - components/heading/index.html (2 dirs deep) -> ../../static/
-                        # So we need ../ for each directory level, which IS depth
-                        prefix = "../" * depth if depth > 0 else ""
-                        element.attrs[attr_name] = f"{prefix}{attr_value}"
-
-        # Recursively process children
-        if hasattr(element, "children") and isinstance(element.children, list):
-            for child in element.children:
-                if isinstance(child, Element):
-                    walk_element(child)
-
-    # Handle both Element and Fragment types
-    if isinstance(node, Element):
-        walk_element(node)
-    elif isinstance(node, Fragment):
-        if hasattr(node, "children") and isinstance(node.children, list):
-            for child in node.children:
-                if isinstance(child, Element):
-                    walk_element(child)
+    for element in iter_elements(node):
+        attrs = element.attrs
+        for attr_name in STATIC_PATH_ATTRS:
+            attr_value = attrs.get(attr_name)
+            if isinstance(attr_value, str) and attr_value.startswith("static/"):
+                attrs[attr_name] = prefix + attr_value
 
     return node
+
+
+def rewrite_static_paths_html(html: str, depth: int) -> str:
+    """Rewrite static/ paths in serialized HTML based on page depth.
+
+    Produces the same markup as rewrite_static_paths() followed by
+    serialization, without walking the node tree: one regular expression
+    pass finds the href/src attributes that start with "static/".
+
+    Args:
+        html: The serialized HTML
+        depth: The depth of the page in the output directory (0 = root)
+
+    Returns:
+        The HTML with each static/ attribute value prefixed with ../ per level
+
+    Example:
+        >>> rewrite_static_paths_html('<img src="static/logo.png" />', depth=1)
+        '<img src="../static/logo.png" />'
+    """
+    prefix = static_path_prefix(depth)
+    if not prefix:
+        return html
+    return _STATIC_ATTR.sub(rf"\g<1>{prefix}static/", html)
@@ -29,11 +29,11 @@ class AboutView:
     site: Catalog
     cached_navigation: str | None = None
 
-    def __call__(self) -> Node:
-        """Render the about page to a tdom Node.
+    def layout(self) -> Layout:
+        """Build the Layout wrapping the about page content.
 
         Returns:
-            A tdom Node representing the rendered about page.
+            The Layout for this page, renderable as a Node or as a string.
         """
         # Create the main content for this view
         content = html(t"""\
@@ -51,7 +51,26 @@ class AboutView:
 </div>""")
 
         # Wrap content in Layout with About title
-        return html(t"""\
-<{Layout} view_title="About" site={self.site} depth={0} cached_navigation={self.cached_navigation}>
-{content}
-</{Layout}>""")
+        return Layout(
+            view_title="About",
+            site=self.site,
+            children=content,
+            depth=0,
+            cached_navigation=self.cached_navigation,
+        )
+
+    def __call__(self) -> Node:
+        """Render the about page to a tdom Node.
+
+        Returns:
+            A tdom Node representing the rendered about page.
+        """
+        return self.layout()()
+
+    def render_html(self) -> str:
+        """Render the about page to an HTML string using the compiled layout shell.
+
+        Returns:
+            The complete HTML document.
+        """
+        return self.layout().render_html()
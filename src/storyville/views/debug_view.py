@@ -29,11 +29,11 @@ class DebugView:
     site: Catalog
     cached_navigation: str | None = None
 
-    def __call__(self) -> Node:
-        """Render the debug page to a tdom Node.
+    def layout(self) -> Layout:
+        """Build the Layout wrapping the debug page content.
 
         Returns:
-            A tdom Node representing the rendered debug page.
+            The Layout for this page, renderable as a Node or as a string.
         """
         # Create the main content for this view
         content = html(t"""\
@@ -50,7 +50,26 @@ class DebugView:
 </div>""")
 
         # Wrap content in Layout with Debug title
-        return html(t"""\
-<{Layout} view_title="Debug" site={self.site} depth={0} cached_navigation={self.cached_navigation}>
-{content}
-</{Layout}>""")
+        return Layout(
+            view_title="Debug",
+            site=self.site,
+            children=content,
+            depth=0,
+            cached_navigation=self.cached_navigation,
+        )
+
+    def __call__(self) -> Node:
+        """Render the debug page to a tdom Node.
+
+        Returns:
+            A tdom Node representing the rendered debug page.
+        """
+        return self.layout()()
+
+    def render_html(self) -> str:
+        """Render the debug page to an HTML string using the compiled layout shell.
+
+        Returns:
+            The complete HTML document.
+        """
+        return self.layout().render_html()
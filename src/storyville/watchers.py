@@ -3,18 +3,24 @@
 import asyncio
 import inspect
 import logging
-from collections.abc import Awaitable, Callable
+import threading
+from collections.abc import Awaitable, Callable, Iterable
 from enum import Enum
 from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING
 
 from watchfiles import Change, awatch
 
+if TYPE_CHECKING:
+    from storyville.manifest import DependencyGraph
+
 logger = logging.getLogger(__name__)
 
 # Static file extensions to watch in src/storyville/ and input directories
 STATIC_EXTENSIONS = {".css", ".js", ".png", ".jpg", ".jpeg", ".svg", ".ico", ".gif"}
 
-# Debounce delay in seconds
+# Quiet period in seconds: a rebuild starts once no change arrived for this long
 DEBOUNCE_DELAY = 0.3
 
 
@@ -108,6 +114,100 @@ def classify_change(changed_path: Path) -> tuple[ChangeType, str | None]:
     return ChangeType.NON_STORY, None
 
 
+class ChangeCoalescer:
+    """Collect file changes until the watched paths have been quiet.
+
+    Every change set is added, whenever it arrives; a path changed several
+    times is kept once, with its latest change. The coalescer becomes
+    ready once quiet_period has passed since the last change, so a burst
+    of editor saves costs one rebuild and no change is ever dropped.
+
+    Args:
+        quiet_period: Seconds without changes before the batch is ready
+        clock: Monotonic clock, replaceable for testing
+    """
+
+    def __init__(
+        self,
+        quiet_period: float = DEBOUNCE_DELAY,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.quiet_period = quiet_period
+        self._clock = clock
+        self._pending: dict[str, Change | int] = {}
+        self._last_change_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, changes: Iterable[tuple[Change | int, str]]) -> None:
+        """Add a change set, restarting the quiet period if it isn't empty.
+
+        Args:
+            changes: (change type, path) pairs from watchfiles
+        """
+        added = False
+        for change_type, changed_path in changes:
+            # Re-insert so paths stay in order of their latest change
+            self._pending.pop(changed_path, None)
+            self._pending[changed_path] = change_type
+            added = True
+        if added:
+            self._last_change_time = self._clock()
+
+    def ready(self) -> bool:
+        """Whether changes are pending and the quiet period has passed."""
+        return bool(self._pending) and (
+            self._clock() - self._last_change_time >= self.quiet_period
+        )
+
+    def drain(self) -> list[tuple[Change | int, str]]:
+        """Take every pending change, leaving the coalescer empty.
+
+        Returns:
+            (change type, path) pairs, one per changed path
+        """
+        changes = [
+            (change_type, changed_path)
+            for changed_path, change_type in self._pending.items()
+        ]
+        self._pending.clear()
+        return changes
+
+
+def _accepts_keyword(callback: Callable[..., object], name: str) -> bool:
+    """Check whether a rebuild callback takes an optional keyword argument.
+
+    Args:
+        callback: The rebuild callback, possibly a functools.partial
+        name: The argument, e.g. "should_cancel" or "pages"
+
+    Returns:
+        True if the callback can be passed the argument
+    """
+    try:
+        parameters = inspect.signature(callback).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in parameters
+
+
+def story_id_for_page(page_path: str) -> str | None:
+    """Extract the story ID from the primary page path of a story.
+
+    Args:
+        page_path: e.g. "components/heading/story-0/index.html"
+
+    Returns:
+        The story ID, e.g. "components/heading/story-0", or None if the
+        page isn't a story page
+    """
+    parent, _, name = page_path.rpartition("/")
+    if name == "index.html" and parent.rpartition("/")[2].startswith("story-"):
+        return parent
+    return None
+
+
 def read_story_html(output_dir: Path, story_id: str) -> str | None:
     """Read the HTML content of a story's themed_story.html file.
 
@@ -148,19 +248,22 @@ def read_story_html(output_dir: Path, story_id: str) -> str | None:
 async def watch_and_rebuild(
     content_path: Path,
     storyville_path: Path | None,
-    rebuild_callback: Callable[[str, Path], None]
-    | Callable[[str, Path], Awaitable[None]],
+    rebuild_callback: Callable[..., None] | Callable[..., Awaitable[None]],
     broadcast_callback: Callable[[], Awaitable[None]],
     package_location: str,
     output_dir: Path,
     ready_event: asyncio.Event | None = None,
+    after_rebuild: Callable[[], Awaitable[None]] | None = None,
+    dependencies: "Callable[[], DependencyGraph | None] | None" = None,
+    story_html: Callable[[str], str | None] | None = None,
 ) -> None:
     """Watch source files, rebuild on changes, and trigger browser reload.
 
     Single unified watcher that:
     1. Monitors content and storyville static files for changes
     2. Monitors all static/ folders in both content_path and storyville_path
-    3. Triggers rebuild via rebuild_callback when changes detected
+    3. Triggers rebuild via rebuild_callback once changes stop arriving
+       for DEBOUNCE_DELAY; every change of the burst goes into that rebuild
     4. Broadcasts reload to WebSocket clients after successful rebuild
 
     This replaces the previous dual-watcher approach (watch_input_directory +
@@ -172,19 +275,43 @@ async def watch_and_rebuild(
     - For GLOBAL_ASSET changes: sends iframe reload broadcast to all stories
     - For NON_STORY changes: sends full reload broadcast to non-story pages
 
+    With dependencies, the changed files are looked up in the dependency
+    graph of the last build. When every change is a known dependency of
+    some pages, a rebuild callback taking pages only re-renders those, and
+    viewers of the affected stories get a morph_html message. A changed
+    file shared by every page, or one that isn't in the graph, and a
+    rebuild that changed the navigation or layout, all fall back to the
+    classification below.
+
+    Rebuilds run in the background while changes keep being collected. When
+    a new change set is ready before the running rebuild has finished, that
+    rebuild is superseded: a callback taking should_cancel is asked to stop,
+    other async callbacks are cancelled and sync ones are left to finish.
+    Its result is never broadcast. Watching carries on meanwhile, and once
+    it has finished one rebuild covers its changes and every newer one.
+
     Args:
         content_path: Path to content directory to monitor
         storyville_path: Optional path to src/storyville/ directory
         rebuild_callback: Function to call to rebuild site (e.g., build_site)
-                         Can be sync or async
+                         Can be sync or async, and may take should_cancel
+                         and pages keyword arguments
         broadcast_callback: Async function to call to broadcast reload (e.g., broadcast_reload_async)
                            DEPRECATED: Use targeted broadcast functions instead
         package_location: Package location to pass to rebuild_callback
         output_dir: Output directory to pass to rebuild_callback
         ready_event: Optional Event to signal when watcher is ready (for testing)
+        after_rebuild: Optional async function awaited after each successful
+                      rebuild, before any broadcast (e.g., to re-index the output)
+        dependencies: Optional function returning the dependency graph of the
+                      last build, or None if there is none
+        story_html: Optional function returning a story's themed_story.html
+                    by story_id, for outputs that aren't on disk (default:
+                    read it from output_dir)
     """
     # Import targeted broadcast functions
     from storyville.websocket import (
+        batched_broadcasts,
         broadcast_full_reload_async,
         broadcast_global_reload_async,
         broadcast_story_reload_async,
@@ -197,109 +324,93 @@ async def watch_and_rebuild(
 
     logger.info("Starting unified watcher for paths: %s", watch_paths)
 
-    # Track last change time for debouncing
-    last_change_time: float = 0.0
-
-    try:
-        # Use yield_on_timeout to ensure we can signal ready even without initial changes
-        async for changes in awatch(
-            *watch_paths, yield_on_timeout=True, rust_timeout=100
-        ):
-            # Signal that watcher is ready on first iteration (even if no changes)
-            if ready_event and not ready_event.is_set():
-                ready_event.set()
-                logger.debug("Watcher ready event set")
-
-            # Filter changes based on path
-            relevant_changes = []
-            for change_type, changed_path in changes:
-                path_obj = Path(changed_path)
-
-                # Skip Python cache files
-                if "__pycache__" in path_obj.parts or path_obj.suffix == ".pyc":
-                    continue
-
-                # Check if change is in content directory
-                try:
-                    path_obj.relative_to(content_path)
-                    # Accept all files in content directory
-                    relevant_changes.append((change_type, changed_path))
-                    continue
-                except ValueError:
-                    pass
-
-                # Check if change is in storyville directory
-                if storyville_path:
-                    try:
-                        path_obj.relative_to(storyville_path)
-                        # Only accept static files in storyville directory
-                        # This includes all files in static/ folders
-                        if (
-                            path_obj.suffix.lower() in STATIC_EXTENSIONS
-                            or "static" in path_obj.parts
-                        ):
-                            relevant_changes.append((change_type, changed_path))
-                    except ValueError:
-                        pass
-
-            if not relevant_changes:
-                continue
-
-            # Implement simple debouncing (use monotonic clock, independent of event loop)
-            from time import monotonic as _monotonic
-
-            current_time = _monotonic()
-            if current_time - last_change_time < DEBOUNCE_DELAY:
-                logger.debug("Debouncing file changes (too soon after last change)")
-                continue
-
-            last_change_time = current_time
-
-            # Log changes with classification
-            for change_type, changed_path in relevant_changes:
-                change_name = (
-                    Change(change_type).name
-                    if isinstance(change_type, int)
-                    else change_type
-                )
-                logger.info("Detected %s: %s", change_name, changed_path)
-
-                # Classify the change to understand its impact
-                # Note: This classification happens BEFORE rebuild, so we're analyzing
-                # the source file path, not the output path. After rebuild, we'll
-                # classify the output changes to determine targeted broadcasts.
-                path_obj = Path(changed_path)
-                classification, story_id = classify_change(path_obj)
+    # Changes wait here until the paths have been quiet for DEBOUNCE_DELAY
+    coalescer = ChangeCoalescer()
+
+    # Rebuilds run as a task so that newer changes can supersede them
+    is_async_callback = inspect.iscoroutinefunction(rebuild_callback)
+    cancellable = _accepts_keyword(rebuild_callback, "should_cancel")
+    targetable = _accepts_keyword(rebuild_callback, "pages")
+    build_task: asyncio.Task[None] | None = None
+    superseded = threading.Event()
+    in_flight_changes: list[tuple[Change | int, str]] = []
+    pending_changes = ChangeCoalescer()
+
+    async def rebuild_and_broadcast(
+        relevant_changes: list[tuple[Change | int, str]],
+        superseded: threading.Event,
+    ) -> None:
+        """Rebuild for a change set, then broadcast unless it was superseded."""
+        # Trigger rebuild
+        logger.info("Triggering rebuild...")
+        try:
+            # Pages that depend on the changed files, per the last build
+            graph = None
+            if dependencies is not None:
+                graph = await asyncio.to_thread(dependencies)
+            affected = None
+            if graph is not None:
+                affected = graph.affected_pages(path for _, path in relevant_changes)
+            if affected is not None:
                 logger.info(
-                    "Change classification: type=%s, story_id=%s",
-                    classification.value,
-                    story_id,
+                    "Targeted rebuild: %d pages depend on the changed files",
+                    len(affected),
                 )
 
-            # Trigger rebuild
-            logger.info("Triggering rebuild...")
-            try:
-                # Check if callback is async (coroutine function)
-                if inspect.iscoroutinefunction(rebuild_callback):
-                    # Async callback - await it directly
-                    # Runtime check ensures this is Awaitable, but type checker can't infer
-                    await rebuild_callback(package_location, output_dir)  # type: ignore[misc]
-                else:
-                    # Sync callback - call it directly
-                    rebuild_callback(package_location, output_dir)
-
-                logger.info("Rebuild completed successfully")
-
-                # After successful build, determine which broadcast to send
-                # based on the classification of changes in the OUTPUT directory
-                logger.info("Broadcasting reload to WebSocket clients...")
-
-                # Collect classifications from output changes
-                # We need to determine what was actually built/changed
-                has_global_change = False
-                story_changes: set[str] = set()
-                has_non_story_change = False
+            options: dict[str, object] = {}
+            if cancellable:
+                options["should_cancel"] = superseded.is_set
+            if targetable and affected is not None:
+                options["pages"] = affected
+
+            # Check if callback is async (coroutine function)
+            if is_async_callback:
+                # Async callback - await it directly
+                result = rebuild_callback(package_location, output_dir, **options)
+                if inspect.isawaitable(result):
+                    await result
+            else:
+                # Sync callback - run it on a worker thread, so changes keep
+                # arriving and can supersede it
+                await asyncio.to_thread(
+                    rebuild_callback, package_location, output_dir, **options
+                )
 
+            if superseded.is_set():
+                logger.info("Rebuild superseded by newer changes, not broadcasting")
+                return
+
+            logger.info("Rebuild completed successfully")
+
+            if after_rebuild is not None:
+                await after_rebuild()
+
+            if graph is not None and affected is not None and dependencies is not None:
+                rebuilt = await asyncio.to_thread(dependencies)
+                if rebuilt is None or rebuilt.shared_digest != graph.shared_digest:
+                    # The navigation or layout changed, and with it every page
+                    logger.info("Shared page inputs changed, not targeting pages")
+                    affected = None
+
+            # After successful build, determine which broadcast to send
+            # based on the classification of changes in the OUTPUT directory
+            logger.info("Broadcasting reload to WebSocket clients...")
+
+            # Collect classifications from output changes
+            # We need to determine what was actually built/changed
+            has_global_change = False
+            story_changes: set[str] = set()
+            has_non_story_change = False
+
+            if affected is not None:
+                # The dependency graph says exactly which pages changed
+                for page_path in affected:
+                    story_id = story_id_for_page(page_path)
+                    if story_id is None:
+                        has_non_story_change = True
+                    else:
+                        story_changes.add(story_id)
+            else:
                 for change_type, changed_path in relevant_changes:
                     path_obj = Path(changed_path)
 
@@ -337,9 +448,11 @@ async def watch_and_rebuild(
                         has_non_story_change = True
                         logger.info("Detected non-story change: %s", path_obj)
 
-                # Broadcast based on classifications
-                # Priority: global > story-specific > non-story
-                try:
+            # Broadcast based on classifications
+            # Priority: global > story-specific > non-story
+            # Each client gets everything from this rebuild in one frame
+            try:
+                with batched_broadcasts():
                     if has_global_change:
                         # Global asset change - reload all story iframes
                         logger.info(
@@ -348,16 +461,19 @@ async def watch_and_rebuild(
                         await broadcast_global_reload_async()
                         logger.info("Global reload broadcast sent")
 
-                    elif story_changes:
+                    elif story_changes or has_non_story_change:
                         # Story-specific changes - morph each affected story
-                        for story_id in story_changes:
+                        for story_id in sorted(story_changes):
                             logger.info(
                                 "Broadcasting story-specific reload with DOM morph: %s",
                                 story_id,
                             )
 
                             # Read the HTML content for this story
-                            html_content = read_story_html(output_dir, story_id)
+                            if story_html is None:
+                                html_content = read_story_html(output_dir, story_id)
+                            else:
+                                html_content = story_html(story_id)
 
                             if html_content:
                                 await broadcast_story_reload_async(
@@ -370,12 +486,14 @@ async def watch_and_rebuild(
                                     story_id,
                                 )
                                 await broadcast_global_reload_async()
+                                # One global reload covers every story
+                                break
 
-                    elif has_non_story_change:
-                        # Non-story change - full reload for non-story pages
-                        logger.info("Broadcasting full reload for non-story pages")
-                        await broadcast_full_reload_async()
-                        logger.info("Full reload broadcast sent")
+                        if has_non_story_change:
+                            # Non-story change - full reload for non-story pages
+                            logger.info("Broadcasting full reload for non-story pages")
+                            await broadcast_full_reload_async()
+                            logger.info("Full reload broadcast sent")
 
                     else:
                         # Default fallback - use the provided broadcast callback
@@ -386,13 +504,124 @@ async def watch_and_rebuild(
                         await broadcast_callback()
                         logger.info("Legacy reload broadcast sent")
 
-                except Exception as e:
-                    logger.error("Broadcast failed: %s", e, exc_info=True)
-                    # Continue watching even if broadcast fails
-
             except Exception as e:
-                logger.error("Rebuild failed: %s", e, exc_info=True)
-                # Continue watching even if build fails (don't broadcast on failure)
+                logger.error("Broadcast failed: %s", e, exc_info=True)
+                # Continue watching even if broadcast fails
+
+        except Exception as e:
+            if superseded.is_set():
+                logger.info("Superseded rebuild stopped: %s", e)
+                return
+            logger.error("Rebuild failed: %s", e, exc_info=True)
+            # Continue watching even if build fails (don't broadcast on failure)
+
+    def start_rebuild(relevant_changes: list[tuple[Change | int, str]]) -> None:
+        """Start a rebuild task for a change set."""
+        nonlocal build_task, superseded, in_flight_changes
+        superseded = threading.Event()
+        in_flight_changes = relevant_changes
+        build_task = asyncio.create_task(
+            rebuild_and_broadcast(relevant_changes, superseded)
+        )
+        build_task.add_done_callback(start_pending_rebuild)
+
+    def start_pending_rebuild(finished: asyncio.Task[None]) -> None:
+        """Once a superseded rebuild finishes, rebuild for its and newer changes."""
+        if not len(pending_changes):
+            return
+        merged = ChangeCoalescer()
+        merged.add(in_flight_changes)
+        merged.add(pending_changes.drain())
+        start_rebuild(merged.drain())
+
+    try:
+        # Use yield_on_timeout to ensure we can signal ready even without initial changes
+        async for changes in awatch(
+            *watch_paths, yield_on_timeout=True, rust_timeout=100
+        ):
+            # Signal that watcher is ready on first iteration (even if no changes)
+            if ready_event and not ready_event.is_set():
+                ready_event.set()
+                logger.debug("Watcher ready event set")
+
+            # Filter changes based on path
+            relevant_changes = []
+            for change_type, changed_path in changes:
+                path_obj = Path(changed_path)
+
+                # Skip Python cache files
+                if "__pycache__" in path_obj.parts or path_obj.suffix == ".pyc":
+                    continue
+
+                # Check if change is in content directory
+                try:
+                    path_obj.relative_to(content_path)
+                    # Accept all files in content directory
+                    relevant_changes.append((change_type, changed_path))
+                    continue
+                except ValueError:
+                    pass
+
+                # Check if change is in storyville directory
+                if storyville_path:
+                    try:
+                        path_obj.relative_to(storyville_path)
+                        # Only accept static files in storyville directory
+                        # This includes all files in static/ folders
+                        if (
+                            path_obj.suffix.lower() in STATIC_EXTENSIONS
+                            or "static" in path_obj.parts
+                        ):
+                            relevant_changes.append((change_type, changed_path))
+                    except ValueError:
+                        pass
+
+            # Trailing-edge debounce: keep collecting while changes arrive,
+            # then rebuild once for all of them. awatch yields an empty set
+            # every rust_timeout, which is when a quiet period can end.
+            coalescer.add(relevant_changes)
+            if not coalescer.ready():
+                if relevant_changes:
+                    logger.debug(
+                        "Coalescing file changes: %d paths pending", len(coalescer)
+                    )
+                continue
+
+            relevant_changes = coalescer.drain()
+
+            # Log changes with classification
+            for change_type, changed_path in relevant_changes:
+                change_name = (
+                    Change(change_type).name
+                    if isinstance(change_type, int)
+                    else change_type
+                )
+                logger.info("Detected %s: %s", change_name, changed_path)
+
+                # Classify the change to understand its impact
+                # Note: This classification happens BEFORE rebuild, so we're analyzing
+                # the source file path, not the output path. After rebuild, we'll
+                # classify the output changes to determine targeted broadcasts.
+                path_obj = Path(changed_path)
+                classification, story_id = classify_change(path_obj)
+                logger.info(
+                    "Change classification: type=%s, story_id=%s",
+                    classification.value,
+                    story_id,
+                )
+
+            if build_task is not None and not build_task.done():
+                # The in-flight build is working from stale sources: ask it
+                # to stop, and keep watching. Builds share the output, so the
+                # merged rebuild starts once the stale one has finished.
+                logger.info("New changes arrived, superseding the in-flight rebuild")
+                superseded.set()
+                if is_async_callback and not cancellable:
+                    build_task.cancel()
+                pending_changes.add(relevant_changes)
+                continue
+
+            start_rebuild(relevant_changes)
 
     except asyncio.CancelledError:
         logger.info("Unified watcher stopped")
@@ -409,3 +638,9 @@ async def watch_and_rebuild(
             return
         logger.error("Unified watcher runtime error: %s", e, exc_info=True)
         return
+
+    finally:
+        pending_changes.drain()
+        if build_task is not None and not build_task.done():
+            superseded.set()
+            build_task.cancel()
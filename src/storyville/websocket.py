@@ -1,14 +1,39 @@
-"""WebSocket endpoint for hot reload functionality."""
+"""WebSocket endpoint for hot reload functionality.
+
+Each connection gets an Outbox: a bounded queue of outbound messages
+drained by the connection's own task. Broadcasts only enqueue, so one slow
+or stalled browser tab can't hold up delivery to the others. A client
+whose queue is full, or whose send doesn't finish within SEND_TIMEOUT, is
+evicted: its connection is closed and the browser reconnects.
+
+Connections live in a ConnectionRegistry, which indexes them by the page
+type and story they are viewing, so a targeted broadcast only visits the
+clients it is sent to.
+
+The registry also remembers the story HTML each client was last sent.
+Later morphs for that story carry only a patch against it (see
+storyville.html_patch) when that is smaller than the full HTML.
+
+Inside batched_broadcasts(), messages are held back and each client then
+gets everything from that block as a single frame. Messages are
+serialized once per broadcast and frames are assembled from those
+strings, so nothing is encoded again per client.
+"""
 
 import asyncio
 import json
 import logging
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import asdict, dataclass
 from enum import Enum
 from pathlib import PurePath
 
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
+from storyville.html_patch import HtmlPatch, compact_patch, html_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,12 +69,17 @@ class ReloadMessage:
         change_type: Type of reload to perform (iframe_reload, morph_html, full_reload)
         story_id: Story identifier if applicable (for story-specific changes)
         html: HTML content for morphing (only for morph_html change_type)
+        patch: Patch against the HTML the client was last sent, instead of html
+        base_hash: html_hash() of that HTML, so the client can check it
+            patches the right version
     """
 
     type: str  # Always "reload"
     change_type: str  # "iframe_reload", "morph_html", or "full_reload"
     story_id: str | None = None
     html: str | None = None
+    patch: HtmlPatch | None = None
+    base_hash: str | None = None
 
     def to_json(self) -> str:
         """Serialize message to JSON string.
@@ -62,11 +92,237 @@ class ReloadMessage:
         return json.dumps({k: v for k, v in data.items() if v is not None})
 
 
-# Module-level set to track active WebSocket connections
-_active_connections: set[WebSocket] = set()
+# Most messages waiting for one client before it is evicted
+SEND_QUEUE_SIZE = 32
+
+# Seconds one send may take before the client is evicted
+SEND_TIMEOUT = 5.0
+
+# Close code sent to evicted clients ("Try Again Later")
+EVICTED_CLOSE_CODE = 1013
+
+
+class Outbox:
+    """Outbound message queue for one connection, drained by its own task.
+
+    Attributes:
+        websocket: The connection the messages are sent to
+        evicted: Whether the client was dropped as a slow consumer
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int = SEND_QUEUE_SIZE) -> None:
+        self.websocket = websocket
+        self.evicted = False
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self._task = asyncio.create_task(self._drain())
+
+    def offer(self, message_text: str) -> bool:
+        """Queue a message without waiting.
+
+        Args:
+            message_text: The serialized message
+
+        Returns:
+            False if the queue is full
+        """
+        try:
+            self._queue.put_nowait(message_text)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def join(self) -> None:
+        """Wait until every queued message has been sent or dropped."""
+        await self._queue.join()
+
+    def evict(self) -> None:
+        """Drop the client: stop sending and close its connection."""
+        self.evicted = True
+        self.close()
+
+    def close(self) -> None:
+        """Stop the drain task, discarding unsent messages."""
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    async def _drain(self) -> None:
+        """Send queued messages one at a time, evicting on failure or timeout."""
+        try:
+            while True:
+                message_text = await self._queue.get()
+                try:
+                    await asyncio.wait_for(
+                        self.websocket.send_text(message_text), SEND_TIMEOUT
+                    )
+                except TimeoutError:
+                    logger.warning(
+                        "Evicting slow WebSocket client: send took over %.1fs",
+                        SEND_TIMEOUT,
+                    )
+                    self._drop()
+                    break
+                except Exception as e:
+                    logger.warning("Failed to send to WebSocket client: %s", e)
+                    self._drop()
+                    break
+                finally:
+                    self._queue.task_done()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._discard_queued()
+
+        if self.evicted:
+            try:
+                await asyncio.wait_for(
+                    self.websocket.close(code=EVICTED_CLOSE_CODE), SEND_TIMEOUT
+                )
+            except Exception as e:
+                logger.debug("Could not close evicted WebSocket client: %s", e)
+
+    def _drop(self) -> None:
+        """Forget the connection after a failed send and close it."""
+        _remove_connection(self.websocket)
+        self.evicted = True
 
-# Module-level dict to track page metadata per connection
-_connection_metadata: dict[WebSocket, PageMetadata] = {}
+    def _discard_queued(self) -> None:
+        """Mark unsent messages done so join() doesn't wait for them."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+
+
+class ConnectionRegistry:
+    """The open WebSocket connections, indexed by the page they are viewing.
+
+    Connections are indexed by page type and, for story pages, by story_id
+    once their page_info message arrives. Lookups return new lists, so
+    callers may remove connections while iterating.
+    """
+
+    def __init__(self) -> None:
+        self._outboxes: dict[WebSocket, Outbox] = {}
+        self._metadata: dict[WebSocket, PageMetadata] = {}
+        self._by_page_type: dict[PageType, set[WebSocket]] = {}
+        self._by_story: dict[str, set[WebSocket]] = {}
+        self._sent_html: dict[WebSocket, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._outboxes)
+
+    def __contains__(self, websocket: object) -> bool:
+        return websocket in self._outboxes
+
+    def __iter__(self) -> Iterator[WebSocket]:
+        return iter(list(self._outboxes))
+
+    def add(self, websocket: WebSocket, outbox: Outbox) -> None:
+        """Register a new connection, before its page is known.
+
+        Args:
+            websocket: The accepted connection
+            outbox: The connection's outbound queue
+        """
+        self._outboxes[websocket] = outbox
+
+    def set_metadata(self, websocket: WebSocket, metadata: PageMetadata) -> None:
+        """Record the page a connection is viewing and reindex it.
+
+        Metadata for a connection that isn't registered is ignored.
+
+        Args:
+            websocket: The connection
+            metadata: The page it reported in its page_info message
+        """
+        if websocket not in self._outboxes:
+            return
+        self._unindex(websocket)
+        self._sent_html.pop(websocket, None)
+        self._metadata[websocket] = metadata
+        self._by_page_type.setdefault(metadata.page_type, set()).add(websocket)
+        if metadata.page_type == PageType.STORY and metadata.story_id is not None:
+            self._by_story.setdefault(metadata.story_id, set()).add(websocket)
+
+    def metadata(self, websocket: WebSocket) -> PageMetadata | None:
+        """Look up the page a connection is viewing, if it has said."""
+        return self._metadata.get(websocket)
+
+    def sent_html(self, websocket: WebSocket) -> str | None:
+        """Look up the story HTML a connection was last sent."""
+        return self._sent_html.get(websocket)
+
+    def record_sent_html(self, websocket: WebSocket, html: str) -> None:
+        """Remember the story HTML queued for a connection.
+
+        Args:
+            websocket: The connection; ignored if it isn't registered
+            html: The full HTML the client will have after the message
+        """
+        if websocket in self._outboxes:
+            self._sent_html[websocket] = html
+
+    def outbox(self, websocket: WebSocket) -> Outbox | None:
+        """Look up a connection's outbound queue."""
+        return self._outboxes.get(websocket)
+
+    def outboxes(self) -> list[Outbox]:
+        """Return the outbound queues of every connection."""
+        return list(self._outboxes.values())
+
+    def viewing(self, page_type: PageType) -> list[WebSocket]:
+        """Return the connections viewing a type of page."""
+        return list(self._by_page_type.get(page_type, ()))
+
+    def viewing_story(self, story_id: str) -> list[WebSocket]:
+        """Return the connections viewing a story's page."""
+        return list(self._by_story.get(story_id, ()))
+
+    def remove(self, websocket: WebSocket) -> Outbox | None:
+        """Forget a connection and drop it from every index.
+
+        Args:
+            websocket: The connection
+
+        Returns:
+            The connection's outbox, or None if it wasn't registered
+        """
+        self._unindex(websocket)
+        self._metadata.pop(websocket, None)
+        self._sent_html.pop(websocket, None)
+        return self._outboxes.pop(websocket, None)
+
+    def clear(self) -> None:
+        """Forget every connection."""
+        self._outboxes.clear()
+        self._metadata.clear()
+        self._by_page_type.clear()
+        self._by_story.clear()
+        self._sent_html.clear()
+
+    def _unindex(self, websocket: WebSocket) -> None:
+        """Drop a connection from the page type and story indexes."""
+        metadata = self._metadata.get(websocket)
+        if metadata is None:
+            return
+        page_type_connections = self._by_page_type[metadata.page_type]
+        page_type_connections.discard(websocket)
+        if not page_type_connections:
+            del self._by_page_type[metadata.page_type]
+        story_id = metadata.story_id
+        if story_id is not None and story_id in self._by_story:
+            story_connections = self._by_story[story_id]
+            story_connections.discard(websocket)
+            if not story_connections:
+                del self._by_story[story_id]
+
+
+# The open WebSocket connections
+_registry = ConnectionRegistry()
+
+# Messages held back per connection inside batched_broadcasts()
+_pending_batch: ContextVar[dict[WebSocket, list[str]] | None] = ContextVar(
+    "_pending_batch", default=None
+)
 
 # Store reference to the event loop managing websocket connections
 _websocket_loop: asyncio.AbstractEventLoop | None = None
@@ -136,13 +392,13 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     global _websocket_loop
 
     await websocket.accept()
-    _active_connections.add(websocket)
+    _registry.add(websocket, Outbox(websocket))
 
     # Store reference to the event loop managing this connection
     if _websocket_loop is None:
         _websocket_loop = asyncio.get_running_loop()
 
-    logger.info("WebSocket client connected (total: %d)", len(_active_connections))
+    logger.info("WebSocket client connected (total: %d)", len(_registry))
 
     try:
         # Wait for initial page metadata message from client
@@ -174,7 +430,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                     metadata = PageMetadata(
                         page_url=page_url, page_type=page_type, story_id=story_id
                     )
-                    _connection_metadata[websocket] = metadata
+                    _registry.set_metadata(websocket, metadata)
 
                     logger.info(
                         "Page metadata received: url=%s, type=%s, story_id=%s",
@@ -193,17 +449,99 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     finally:
-        # Clean up connection and metadata
-        _active_connections.discard(websocket)
-        _connection_metadata.pop(websocket, None)
+        # Clean up connection, metadata and outbox
+        _remove_connection(websocket)
 
         # Clear loop reference if no connections remain
-        if not _active_connections:
+        if not _registry:
             _websocket_loop = None
 
-        logger.info(
-            "WebSocket client removed (remaining: %d)", len(_active_connections)
-        )
+        logger.info("WebSocket client removed (remaining: %d)", len(_registry))
+
+
+def _remove_connection(websocket: WebSocket) -> None:
+    """Forget a connection and stop its outbox."""
+    outbox = _registry.remove(websocket)
+    if outbox is not None:
+        outbox.close()
+
+
+def _fan_out(connections: Iterable[WebSocket], message_text: str) -> int:
+    """Queue a message for each connection without waiting for delivery.
+
+    Clients whose outbox is full are slow consumers and get evicted.
+    Inside batched_broadcasts(), the message is held back instead.
+
+    Args:
+        connections: The connections to send to
+        message_text: The serialized message
+
+    Returns:
+        Number of clients the message was queued for
+    """
+    pending = _pending_batch.get()
+    if pending is not None:
+        held = 0
+        for connection in connections:
+            if connection in _registry:
+                pending.setdefault(connection, []).append(message_text)
+                held += 1
+        return held
+
+    queued = 0
+    for connection in list(connections):
+        outbox = _registry.outbox(connection)
+        if outbox is None:
+            continue
+        if outbox.offer(message_text):
+            queued += 1
+            continue
+        logger.warning("Evicting slow WebSocket client: send queue is full")
+        _registry.remove(connection)
+        outbox.evict()
+    return queued
+
+
+@contextmanager
+def batched_broadcasts() -> Generator[None]:
+    """Send the messages of several broadcasts as one frame per client.
+
+    Use it around the broadcasts for one rebuild. A client sent a single
+    message gets it unchanged; several are wrapped as
+    {"type": "batch", "messages": [...]}, in the order they were broadcast.
+    Only broadcasts from the current task are batched.
+    """
+    pending: dict[WebSocket, list[str]] = {}
+    token = _pending_batch.set(pending)
+    try:
+        yield
+    finally:
+        _pending_batch.reset(token)
+        _send_batches(pending)
+
+
+def _send_batches(pending: dict[WebSocket, list[str]]) -> None:
+    """Queue one frame per client for the messages held back for it."""
+    groups: dict[tuple[str, ...], list[WebSocket]] = {}
+    for connection, messages in pending.items():
+        # A client needs each distinct message only once
+        key = tuple(dict.fromkeys(messages))
+        groups.setdefault(key, []).append(connection)
+
+    for messages, connections in groups.items():
+        if len(messages) == 1:
+            frame = messages[0]
+        else:
+            frame = '{"type": "batch", "messages": [' + ", ".join(messages) + "]}"
+        _fan_out(connections, frame)
+
+    if pending:
+        logger.debug("Sent %d batched frames to %d clients", len(groups), len(pending))
+
+
+async def flush_outboxes() -> None:
+    """Wait until every queued message has been sent or dropped."""
+    await asyncio.gather(*(outbox.join() for outbox in _registry.outboxes()))
 
 
 async def broadcast_story_reload_async(story_id: str, html: str) -> None:
@@ -216,18 +554,12 @@ async def broadcast_story_reload_async(story_id: str, html: str) -> None:
         story_id: Story identifier to target (e.g., "components/heading/story-0")
         html: HTML content to morph into the story content area
     """
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
     # Filter connections to only those viewing this specific story
-    target_connections = [
-        conn
-        for conn in _active_connections
-        if conn in _connection_metadata
-        and _connection_metadata[conn].page_type == PageType.STORY
-        and _connection_metadata[conn].story_id == story_id
-    ]
+    target_connections = _registry.viewing_story(story_id)
 
     if not target_connections:
         logger.debug(
@@ -235,36 +567,65 @@ async def broadcast_story_reload_async(story_id: str, html: str) -> None:
         )
         return
 
-    # Create targeted message
-    message = ReloadMessage(
-        type="reload", change_type="morph_html", story_id=story_id, html=html
-    )
-    message_text = message.to_json()
-
     logger.info(
         "Broadcasting story reload: story_id=%s, targets=%d, change_type=morph_html",
         story_id,
         len(target_connections),
     )
 
-    # Send to target connections
-    disconnected: list[WebSocket] = []
+    # Clients that were sent the same HTML last time share one message
+    by_base: dict[str | None, list[WebSocket]] = {}
     for connection in target_connections:
-        try:
-            await connection.send_text(message_text)
-        except Exception as e:
-            logger.warning("Failed to send to WebSocket client: %s", e)
-            disconnected.append(connection)
+        by_base.setdefault(_registry.sent_html(connection), []).append(connection)
 
-    # Clean up disconnected clients
-    for connection in disconnected:
-        _active_connections.discard(connection)
-        _connection_metadata.pop(connection, None)
+    queued = 0
+    for base, connections in by_base.items():
+        if base is None:
+            message_text = _story_message_text(story_id, base, html)
+        else:
+            # Diffing a large story takes a while; keep the event loop free
+            message_text = await asyncio.to_thread(
+                _story_message_text, story_id, base, html
+            )
+        queued += _fan_out(connections, message_text)
+        for connection in connections:
+            _registry.record_sent_html(connection, html)
+
+    logger.debug("Story reload broadcast queued for %d clients", queued)
+
+
+def _story_message_text(story_id: str, base: str | None, html: str) -> str:
+    """Serialize a morph_html message, as a patch against base when smaller.
 
+    Args:
+        story_id: Story identifier
+        base: The HTML the clients were last sent for this story, if any
+        html: The new HTML
+
+    Returns:
+        The JSON message text
+    """
+    patch = None if base is None else compact_patch(base, html)
+    if base is None or patch is None:
+        message = ReloadMessage(
+            type="reload", change_type="morph_html", story_id=story_id, html=html
+        )
+    else:
+        message = ReloadMessage(
+            type="reload",
+            change_type="morph_html",
+            story_id=story_id,
+            patch=patch,
+            base_hash=html_hash(base),
+        )
+    message_text = message.to_json()
     logger.debug(
-        "Story reload broadcast complete: sent to %d clients",
-        len(target_connections) - len(disconnected),
+        "Story %s morph message: %d bytes for %d bytes of HTML",
+        story_id,
+        len(message_text),
+        len(html),
     )
+    return message_text
 
 
 async def broadcast_global_reload_async() -> None:
@@ -273,17 +634,12 @@ async def broadcast_global_reload_async() -> None:
     Sends iframe_reload message to all connections viewing story pages.
     This is triggered when global assets like themed_story.html or CSS/JS bundles change.
     """
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
     # Filter connections to only story pages (not non-story pages)
-    target_connections = [
-        conn
-        for conn in _active_connections
-        if conn in _connection_metadata
-        and _connection_metadata[conn].page_type == PageType.STORY
-    ]
+    target_connections = _registry.viewing(PageType.STORY)
 
     if not target_connections:
         logger.debug("No clients viewing stories, skipping global reload broadcast")
@@ -298,24 +654,9 @@ async def broadcast_global_reload_async() -> None:
         len(target_connections),
     )
 
-    # Send to target connections
-    disconnected: list[WebSocket] = []
-    for connection in target_connections:
-        try:
-            await connection.send_text(message_text)
-        except Exception as e:
-            logger.warning("Failed to send to WebSocket client: %s", e)
-            disconnected.append(connection)
-
-    # Clean up disconnected clients
-    for connection in disconnected:
-        _active_connections.discard(connection)
-        _connection_metadata.pop(connection, None)
+    queued = _fan_out(target_connections, message_text)
 
-    logger.debug(
-        "Global reload broadcast complete: sent to %d clients",
-        len(target_connections) - len(disconnected),
-    )
+    logger.debug("Global reload broadcast queued for %d clients", queued)
 
 
 async def broadcast_full_reload_async() -> None:
@@ -324,17 +665,12 @@ async def broadcast_full_reload_async() -> None:
     Sends full_reload message to all connections viewing non-story pages
     (documentation, section indexes, catalog index, etc.).
     """
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
     # Filter connections to only non-story pages
-    target_connections = [
-        conn
-        for conn in _active_connections
-        if conn in _connection_metadata
-        and _connection_metadata[conn].page_type == PageType.NON_STORY
-    ]
+    target_connections = _registry.viewing(PageType.NON_STORY)
 
     if not target_connections:
         logger.debug(
@@ -351,24 +687,9 @@ async def broadcast_full_reload_async() -> None:
         len(target_connections),
     )
 
-    # Send to target connections
-    disconnected: list[WebSocket] = []
-    for connection in target_connections:
-        try:
-            await connection.send_text(message_text)
-        except Exception as e:
-            logger.warning("Failed to send to WebSocket client: %s", e)
-            disconnected.append(connection)
-
-    # Clean up disconnected clients
-    for connection in disconnected:
-        _active_connections.discard(connection)
-        _connection_metadata.pop(connection, None)
+    queued = _fan_out(target_connections, message_text)
 
-    logger.debug(
-        "Full reload broadcast complete: sent to %d clients",
-        len(target_connections) - len(disconnected),
-    )
+    logger.debug("Full reload broadcast queued for %d clients", queued)
 
 
 def broadcast_story_reload(story_id: str, html: str) -> None:
@@ -382,7 +703,7 @@ def broadcast_story_reload(story_id: str, html: str) -> None:
     """
     import concurrent.futures
 
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
@@ -419,7 +740,7 @@ def broadcast_global_reload() -> None:
     """
     import concurrent.futures
 
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
@@ -456,7 +777,7 @@ def broadcast_full_reload() -> None:
     """
     import concurrent.futures
 
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
@@ -496,26 +817,14 @@ async def broadcast_reload_async() -> None:
     DEPRECATED: Use broadcast_story_reload_async, broadcast_global_reload_async,
     or broadcast_full_reload_async for targeted broadcasting.
     """
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
     message = json.dumps({"type": "reload"})
-    disconnected: list[WebSocket] = []
-
-    for connection in _active_connections:
-        try:
-            await connection.send_text(message)
-        except Exception as e:
-            logger.warning("Failed to send to WebSocket client: %s", e)
-            disconnected.append(connection)
-
-    # Clean up disconnected clients
-    for connection in disconnected:
-        _active_connections.discard(connection)
-        _connection_metadata.pop(connection, None)
+    queued = _fan_out(_registry, message)
 
-    logger.info("Broadcast reload to %d clients", len(_active_connections))
+    logger.info("Broadcast reload to %d clients", queued)
 
 
 def _clear_websocket_loop() -> None:
@@ -545,7 +854,7 @@ def broadcast_reload() -> None:
     import concurrent.futures
 
     # Early return if no clients connected
-    if not _active_connections:
+    if not _registry:
         logger.debug("No WebSocket clients to broadcast to")
         return
 
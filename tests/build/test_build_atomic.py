@@ -0,0 +1,118 @@
+"""Test atomic builds that stage output and swap it into place."""
+
+from pathlib import Path
+
+import pytest
+
+from storyville import build as build_module
+from storyville.build import BuildCancelled, build_catalog
+
+
+def _story_page(output_dir: Path) -> Path:
+    """Return the path of the first heading story page."""
+    return output_dir / "components" / "heading" / "story-0" / "index.html"
+
+
+def test_atomic_build_into_new_directory(tmp_path: Path) -> None:
+    """Test an atomic build creates the output and leaves no staging behind."""
+    output_dir = tmp_path / "site"
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=output_dir, atomic=True
+    )
+
+    assert (output_dir / "index.html").exists()
+    assert (output_dir / "static").is_dir()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["site"]
+
+
+def test_atomic_rebuild_reuses_unchanged_pages(tmp_path: Path) -> None:
+    """Test unchanged pages are carried over by hard link, not rewritten."""
+    output_dir = tmp_path / "site"
+    build_catalog(package_location="examples.minimal", output_dir=output_dir)
+    inode_before = _story_page(output_dir).stat().st_ino
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=output_dir, atomic=True
+    )
+
+    assert _story_page(output_dir).stat().st_ino == inode_before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["site"]
+
+
+def test_atomic_rebuild_does_not_touch_previous_files(tmp_path: Path) -> None:
+    """Test a changed page is replaced, leaving the old generation's file intact."""
+    output_dir = tmp_path / "site"
+    build_catalog(package_location="examples.minimal", output_dir=output_dir)
+    keep = tmp_path / "keep.html"
+    keep.hardlink_to(_story_page(output_dir))
+    _story_page(output_dir).write_text("stale")
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=output_dir, atomic=True
+    )
+
+    assert _story_page(output_dir).read_text() != "stale"
+    assert keep.read_text() == "stale"
+
+
+def test_atomic_build_flips_symlink(tmp_path: Path) -> None:
+    """Test a symlinked output is repointed and the old generation removed."""
+    first_generation = tmp_path / ".site.1"
+    build_catalog(package_location="examples.minimal", output_dir=first_generation)
+    output_dir = tmp_path / "site"
+    output_dir.symlink_to(first_generation.name)
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=output_dir, atomic=True
+    )
+
+    assert output_dir.is_symlink()
+    assert output_dir.resolve() != first_generation
+    assert not first_generation.exists()
+    assert (output_dir / "index.html").exists()
+
+
+def test_failed_atomic_build_keeps_previous_output(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a build that fails mid-way leaves the published output as it was."""
+    output_dir = tmp_path / "site"
+    build_catalog(package_location="examples.minimal", output_dir=output_dir)
+    index_before = (output_dir / "index.html").read_text()
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("static assets failed")
+
+    monkeypatch.setattr(build_module, "sync_all_static_assets", fail)
+    with pytest.raises(RuntimeError, match="static assets failed"):
+        build_catalog(
+            package_location="examples.minimal", output_dir=output_dir, atomic=True
+        )
+
+    assert (output_dir / "index.html").read_text() == index_before
+    assert (output_dir / "static").is_dir()
+
+
+def test_cancelled_atomic_build_keeps_previous_output(tmp_path: Path) -> None:
+    """Test a build cancelled between pages publishes nothing."""
+    output_dir = tmp_path / "site"
+    build_catalog(package_location="examples.minimal", output_dir=output_dir)
+    _story_page(output_dir).write_text("previous")
+    checks = 0
+
+    def should_cancel() -> bool:
+        nonlocal checks
+        checks += 1
+        # Let the reading phase and the first page through
+        return checks > 2
+
+    with pytest.raises(BuildCancelled):
+        build_catalog(
+            package_location="examples.minimal",
+            output_dir=output_dir,
+            atomic=True,
+            should_cancel=should_cancel,
+        )
+
+    assert _story_page(output_dir).read_text() == "previous"
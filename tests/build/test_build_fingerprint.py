@@ -0,0 +1,43 @@
+"""Test builds that link pages to fingerprinted static assets."""
+
+import json
+from pathlib import Path
+
+from storyville.build import build_catalog
+from storyville.static_assets import ASSET_MANIFEST_NAME
+
+PICO = "static/components/layout/static/pico-main.css"
+
+
+def _asset_manifest(output_dir: Path) -> dict[str, str]:
+    """Load the asset manifest written by a fingerprinted build."""
+    return json.loads((output_dir / ASSET_MANIFEST_NAME).read_text())["assets"]
+
+
+def test_fingerprinted_build_links_hashed_assets(tmp_path: Path) -> None:
+    """Test pages reference hashed names that exist next to the originals."""
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, fingerprint=True
+    )
+
+    hashed = _asset_manifest(tmp_path)[PICO]
+    assert (tmp_path / hashed).read_bytes() == (tmp_path / PICO).read_bytes()
+    assert f'href="{hashed}"' in (tmp_path / "index.html").read_text()
+    story_page = tmp_path / "components" / "heading" / "story-0" / "index.html"
+    assert f'href="../../../{hashed}"' in story_page.read_text()
+
+
+def test_plain_build_removes_fingerprinted_assets(tmp_path: Path) -> None:
+    """Test turning fingerprinting off drops the manifest and hashed files."""
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, fingerprint=True
+    )
+    hashed = _asset_manifest(tmp_path)[PICO]
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, incremental=True
+    )
+
+    assert not (tmp_path / ASSET_MANIFEST_NAME).exists()
+    assert not (tmp_path / hashed).exists()
+    assert f'href="{PICO}"' in (tmp_path / "index.html").read_text()
@@ -0,0 +1,237 @@
+"""Test incremental builds driven by the content-hash manifest."""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from storyville import manifest as manifest_module
+from storyville.build import build_catalog
+from storyville.catalog import make_catalog
+from storyville.manifest import (
+    MANIFEST_NAME,
+    BuildManifest,
+    DependencyGraph,
+    Fingerprinter,
+)
+
+
+class _PlainProp:
+    """A prop value whose repr includes its memory address."""
+
+
+def _callable_prop() -> str:
+    return "value"
+
+
+def test_full_build_writes_manifest(tmp_path: Path) -> None:
+    """Test every build records page hashes in the output directory."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+
+    manifest = BuildManifest.load(tmp_path)
+    assert "index.html" in manifest.pages
+    assert "components/heading/story-0/index.html" in manifest.pages
+    assert "components/heading/story-0/themed_story.html" in manifest.pages
+
+
+def test_build_without_manifest_removes_previous_manifest(tmp_path: Path) -> None:
+    """Test a build that skips fingerprinting leaves no outdated manifest."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+    build_catalog(
+        package_location="examples.minimal",
+        output_dir=tmp_path,
+        write_manifest=False,
+    )
+
+    assert (tmp_path / "index.html").exists()
+    assert not (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_incremental_build_always_writes_manifest(tmp_path: Path) -> None:
+    """Test write_manifest doesn't turn off the manifest incremental builds need."""
+    build_catalog(
+        package_location="examples.minimal",
+        output_dir=tmp_path,
+        incremental=True,
+        write_manifest=False,
+    )
+
+    assert "index.html" in BuildManifest.load(tmp_path).pages
+
+
+def test_storyville_digest_is_reused_until_sources_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test Storyville's sources are only hashed again when their stats change."""
+    monkeypatch.setattr(manifest_module, "PACKAGE_DIR", tmp_path)
+    monkeypatch.setattr(manifest_module, "_storyville_digests", {})
+    source = tmp_path / "module.py"
+    source.write_text("a = 1")
+    first = manifest_module._storyville_digest()
+    stat = source.stat()
+
+    # Same size and mtime: the cached digest is reused without reading
+    source.write_text("a = 2")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert manifest_module._storyville_digest() == first
+
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert manifest_module._storyville_digest() != first
+
+
+def test_manifest_round_trip(tmp_path: Path) -> None:
+    """Test a saved manifest loads back with the same pages."""
+    manifest = BuildManifest(
+        pages={"index.html": "abc", "a/index.html": "def"},
+        dependencies=DependencyGraph(
+            pages={"a/index.html": ["/src/a/stories.py"]},
+            shared=["/src/stories.py"],
+            shared_digest="123",
+        ),
+    )
+    manifest.save(tmp_path)
+
+    assert BuildManifest.load(tmp_path) == manifest
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not json", json.dumps({"version": -1, "pages": {"index.html": "abc"}})],
+)
+def test_unusable_manifest_loads_empty(tmp_path: Path, content: str) -> None:
+    """Test a corrupt or outdated manifest makes every page look changed."""
+    (tmp_path / MANIFEST_NAME).write_text(content)
+
+    assert BuildManifest.load(tmp_path).pages == {}
+
+
+def test_incremental_rebuild_skips_unchanged_pages(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an incremental rebuild with no changes renders and writes nothing."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    story_page = tmp_path / "components" / "heading" / "story-0" / "index.html"
+    mtime_before = story_page.stat().st_mtime_ns
+
+    caplog.set_level(logging.INFO)
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, incremental=True
+    )
+
+    assert story_page.stat().st_mtime_ns == mtime_before
+    assert any(
+        record.message.startswith("Incremental build: 0 of")
+        for record in caplog.records
+    )
+
+
+def test_incremental_rebuild_rerenders_missing_page(tmp_path: Path) -> None:
+    """Test a page deleted from the output is rendered again."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    story_page = tmp_path / "components" / "heading" / "story-0" / "index.html"
+    story_page.unlink()
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, incremental=True
+    )
+
+    assert story_page.exists()
+
+
+def test_incremental_rebuild_rerenders_changed_hash(tmp_path: Path) -> None:
+    """Test a page whose recorded hash differs is rewritten."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    section_page = tmp_path / "components" / "index.html"
+    section_page.write_text("stale")
+
+    manifest = BuildManifest.load(tmp_path)
+    manifest.pages["components/index.html"] = "outdated"
+    manifest.save(tmp_path)
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, incremental=True
+    )
+
+    assert section_page.read_text() != "stale"
+
+
+def test_incremental_rebuild_removes_stale_pages(tmp_path: Path) -> None:
+    """Test pages no longer in the catalog are removed with their directories."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    stale_page = tmp_path / "gone" / "index.html"
+    stale_page.parent.mkdir()
+    stale_page.write_text("old section")
+
+    manifest = BuildManifest.load(tmp_path)
+    manifest.pages["gone/index.html"] = "abc"
+    manifest.save(tmp_path)
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, incremental=True
+    )
+
+    assert not stale_page.exists()
+    assert not stale_page.parent.exists()
+    assert "gone/index.html" not in BuildManifest.load(tmp_path).pages
+
+
+def test_build_records_page_dependencies(tmp_path: Path) -> None:
+    """Test the manifest maps component modules to the pages using them."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+
+    from examples.minimal.components.heading import heading
+
+    heading_source = str(Path(heading.__file__).resolve())
+    dependencies = BuildManifest.load(tmp_path).dependencies
+    assert dependencies.affected_pages([heading_source]) == {
+        "components/heading/index.html",
+        "components/heading/story-0/index.html",
+    }
+
+
+def test_shared_or_unknown_sources_affect_every_page() -> None:
+    """Test files outside the graph, or shared by all pages, aren't targeted."""
+    dependencies = DependencyGraph(
+        pages={"a/index.html": ["/src/a/stories.py"]}, shared=["/src/stories.py"]
+    )
+
+    assert dependencies.affected_pages(["/src/a/stories.py"]) == {"a/index.html"}
+    assert dependencies.affected_pages(["/src/stories.py"]) is None
+    assert dependencies.affected_pages(["/src/b/stories.py"]) is None
+
+
+def test_targeted_rebuild_rerenders_requested_pages(tmp_path: Path) -> None:
+    """Test pages passed to a rebuild are rendered even if they look current."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    story_page = tmp_path / "components" / "heading" / "story-0" / "index.html"
+    section_page = tmp_path / "components" / "index.html"
+    story_page.write_text("stale")
+    section_page.write_text("kept")
+
+    build_catalog(
+        package_location="examples.minimal",
+        output_dir=tmp_path,
+        pages={"components/heading/story-0/index.html"},
+    )
+
+    assert story_page.read_text() != "stale"
+    assert section_page.read_text() == "kept"
+
+
+def test_prop_digests_do_not_depend_on_memory_addresses() -> None:
+    """Test props without a stable repr still get a stable digest."""
+    fingerprinter = Fingerprinter(
+        make_catalog("examples.minimal"), "examples.minimal", "", True
+    )
+
+    first = {"item": _PlainProp(), "on_click": _callable_prop, "size": 1}
+    second = {"item": _PlainProp(), "on_click": _callable_prop, "size": 1}
+    assert fingerprinter.value_digest(first) == fingerprinter.value_digest(second)
+
+    # Primitive values still change the digest
+    changed = {"item": _PlainProp(), "on_click": _callable_prop, "size": 2}
+    assert fingerprinter.value_digest(first) != fingerprinter.value_digest(changed)
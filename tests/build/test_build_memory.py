@@ -0,0 +1,91 @@
+"""Test builds into an in-memory output."""
+
+from pathlib import Path
+
+import pytest
+
+from storyville.build import build_catalog
+from storyville.memory_output import MemoryOutput
+
+PICO = "static/components/layout/static/pico-main.css"
+
+
+def test_memory_build_writes_nothing_to_disk(tmp_path: Path) -> None:
+    """Test pages and static assets land in memory, not the output dir."""
+    output_dir = tmp_path / "output"
+    memory = MemoryOutput()
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=output_dir, memory=memory
+    )
+
+    assert not output_dir.exists()
+    assert memory.generation == 1
+    assert "Minimal Catalog" in memory.read_text("index.html")
+    assert "components/heading/story-0/index.html" in memory
+    assert PICO in memory
+    assert memory.manifest is not None
+
+
+def test_memory_build_matches_disk_build(tmp_path: Path) -> None:
+    """Test a memory build stores the same pages as a disk build writes."""
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+    memory = MemoryOutput()
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path / "x", memory=memory
+    )
+
+    for path in tmp_path.rglob("*.html"):
+        relative_path = path.relative_to(tmp_path).as_posix()
+        assert memory.read_text(relative_path) == path.read_text()
+
+
+def test_memory_rebuild_keeps_unchanged_files(tmp_path: Path) -> None:
+    """Test a rebuild reuses the stored bytes of unchanged files."""
+    memory = MemoryOutput()
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, memory=memory
+    )
+    page = memory.get("index.html")
+    asset = memory.get(PICO)
+
+    build_catalog(
+        package_location="examples.minimal",
+        output_dir=tmp_path,
+        incremental=True,
+        memory=memory,
+    )
+
+    assert memory.generation == 2
+    assert memory.get("index.html") is page
+    assert memory.get(PICO) is asset
+
+
+def test_memory_build_flushes_changed_files(tmp_path: Path) -> None:
+    """Test a flushing memory output writes the site to the output dir."""
+    memory = MemoryOutput(flush=True)
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, memory=memory
+    )
+
+    assert (tmp_path / "index.html").read_text() == memory.read_text("index.html")
+    assert (tmp_path / PICO).exists()
+    index_mtime = (tmp_path / "index.html").stat().st_mtime_ns
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, memory=memory
+    )
+
+    assert (tmp_path / "index.html").stat().st_mtime_ns == index_mtime
+
+
+def test_memory_build_rejects_precompress(tmp_path: Path) -> None:
+    """Test precompressed siblings are only written by disk builds."""
+    with pytest.raises(ValueError, match="precompress"):
+        build_catalog(
+            package_location="examples.minimal",
+            output_dir=tmp_path,
+            precompress=True,
+            memory=MemoryOutput(),
+        )
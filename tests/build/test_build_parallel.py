@@ -0,0 +1,126 @@
+"""Test parallel page rendering with --jobs."""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from storyville import build as build_module
+from storyville.build import (
+    MAX_CHUNK_UNITS,
+    PageUnit,
+    _iter_page_units,
+    _iter_rendered_pages_parallel,
+    _partition_units,
+    build_catalog,
+)
+from storyville.catalog.helpers import make_catalog
+
+
+def _html_files(output_dir: Path) -> dict[str, str]:
+    """Map each built HTML file's relative path to its content."""
+    return {
+        str(path.relative_to(output_dir)): path.read_text()
+        for path in output_dir.rglob("*.html")
+    }
+
+
+def test_iter_page_units_covers_every_page() -> None:
+    """Test units exist for root pages and every section, subject and story."""
+    catalog = make_catalog("examples.minimal")
+    units = list(_iter_page_units(catalog))
+
+    assert units[:3] == [
+        PageUnit(kind="catalog"),
+        PageUnit(kind="about"),
+        PageUnit(kind="debug"),
+    ]
+    story_count = sum(
+        len(subject.items)
+        for section in catalog.items.values()
+        for subject in section.items.values()
+    )
+    assert len([u for u in units if u.kind == "story"]) == story_count
+
+
+def test_partition_units_keeps_every_unit() -> None:
+    """Test partitioning spreads units over chunks without losing any."""
+    units = [PageUnit(kind="section", section_key=f"s{i}") for i in range(10)]
+    chunks = _partition_units(units, jobs=2)
+
+    assert len(chunks) == 8
+    assert sorted(u.section_key for chunk in chunks for u in chunk) == sorted(
+        u.section_key for u in units
+    )
+
+
+def test_partition_units_never_empty() -> None:
+    """Test partitioning with fewer units than workers gives one unit per chunk."""
+    units = [PageUnit(kind="catalog")]
+    assert _partition_units(units, jobs=4) == [units]
+
+
+def test_partition_units_caps_chunk_size() -> None:
+    """Test large catalogs are split into more, smaller chunks."""
+    units = [PageUnit(kind="section", section_key=f"s{i}") for i in range(1000)]
+    chunks = _partition_units(units, jobs=2)
+
+    assert max(len(chunk) for chunk in chunks) <= MAX_CHUNK_UNITS
+    assert sum(len(chunk) for chunk in chunks) == 1000
+
+
+@pytest.mark.slow
+def test_parallel_build_matches_serial_build(tmp_path: Path) -> None:
+    """Test a parallel build writes the same pages as a serial build."""
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+
+    build_catalog(package_location="examples.minimal", output_dir=serial_dir)
+    build_catalog(package_location="examples.minimal", output_dir=parallel_dir, jobs=2)
+
+    assert _html_files(parallel_dir) == _html_files(serial_dir)
+
+
+@pytest.mark.slow
+def test_parallel_build_logs_worker_timings(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test per-worker timings are logged next to the phase timings."""
+    caplog.set_level(logging.INFO)
+
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path, jobs=2)
+
+    log_messages = [record.message for record in caplog.records]
+    worker_logs = [msg for msg in log_messages if msg.startswith("Rendering worker")]
+    assert worker_logs
+    assert all("pages in" in msg for msg in worker_logs)
+    assert len([msg for msg in log_messages if "Phase Rendering:" in msg]) == 1
+
+
+@pytest.mark.slow
+def test_parallel_rendering_cancels_queued_chunks_when_closed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a consumer that stops early doesn't wait for the remaining chunks."""
+    shutdowns: list[tuple[bool, bool]] = []
+
+    class RecordingExecutor(ProcessPoolExecutor):
+        def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+            shutdowns.append((wait, cancel_futures))
+            super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    monkeypatch.setattr(build_module, "ProcessPoolExecutor", RecordingExecutor)
+    units = list(_iter_page_units(make_catalog("examples.minimal")))
+    rendered = _iter_rendered_pages_parallel("examples.minimal", units, True, 2)
+
+    next(rendered)
+    rendered.close()
+
+    assert shutdowns == [(False, True)]
+
+
+def test_build_rejects_zero_jobs(tmp_path: Path) -> None:
+    """Test jobs must be a positive number of workers."""
+    with pytest.raises(ValueError, match="jobs must be at least 1"):
+        build_catalog(package_location="examples.minimal", output_dir=tmp_path, jobs=0)
@@ -0,0 +1,61 @@
+"""Test the optional precompression phase of a build."""
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from storyville.build import build_catalog
+from storyville.manifest import BuildManifest
+
+
+def test_precompressed_build_writes_siblings(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test pages and static text assets get .gz siblings."""
+    caplog.set_level(logging.INFO)
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, precompress=True
+    )
+
+    assert (tmp_path / "index.html.gz").exists()
+    assert (tmp_path / "static/components/layout/static/pico-main.css.gz").exists()
+    assert any(
+        record.message.startswith("Phase Compression:") for record in caplog.records
+    )
+
+
+def test_precompressed_rebuild_keeps_unchanged_siblings(tmp_path: Path) -> None:
+    """Test the static sync keeps siblings and unchanged ones aren't rewritten."""
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, precompress=True
+    )
+    css_sibling = tmp_path / "static/components/layout/static/pico-main.css.gz"
+    inode_before = css_sibling.stat().st_ino
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, precompress=True
+    )
+
+    assert css_sibling.stat().st_ino == inode_before
+
+
+def test_removed_page_loses_its_siblings(tmp_path: Path) -> None:
+    """Test an incremental build removes siblings along with stale pages."""
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, precompress=True
+    )
+    stale_page = tmp_path / "gone" / "index.html"
+    stale_page.parent.mkdir()
+    stale_page.write_text("old section")
+    (tmp_path / "gone" / "index.html.gz").write_bytes(b"old")
+    manifest = BuildManifest.load(tmp_path)
+    manifest.pages["gone/index.html"] = "abc"
+    manifest.save(tmp_path)
+
+    build_catalog(
+        package_location="examples.minimal", output_dir=tmp_path, incremental=True
+    )
+
+    assert not stale_page.parent.exists()
@@ -0,0 +1,94 @@
+"""Test the streaming page writer."""
+
+import logging
+from pathlib import Path
+from types import GeneratorType
+
+import pytest
+
+from storyville.build import (
+    _iter_rendered_pages,
+    _PageWriter,
+    _write_all_files,
+    build_catalog,
+)
+from storyville.catalog.helpers import make_catalog
+
+
+def test_write_all_files_creates_nested_pages(tmp_path: Path) -> None:
+    """Test pages are written with their parent directories created."""
+    pages = [("index.html", "<p>root</p>"), ("a/b/index.html", "<p>nested</p>")]
+
+    assert _write_all_files(tmp_path, pages) == (2, 0)
+    assert (tmp_path / "a" / "b" / "index.html").read_text() == "<p>nested</p>"
+
+
+def test_write_all_files_skips_identical_content(tmp_path: Path) -> None:
+    """Test identical pages are left alone, keeping their mtime."""
+    pages = [("index.html", "<p>same</p>")]
+    _write_all_files(tmp_path, pages)
+    mtime_before = (tmp_path / "index.html").stat().st_mtime_ns
+
+    assert _write_all_files(tmp_path, pages) == (0, 1)
+    assert (tmp_path / "index.html").stat().st_mtime_ns == mtime_before
+
+
+@pytest.mark.parametrize("new_html", ["<p>longer content</p>", "<p>SAME</p>"])
+def test_write_all_files_rewrites_changed_content(
+    tmp_path: Path, new_html: str
+) -> None:
+    """Test changed pages are rewritten, whether or not their size changed."""
+    _write_all_files(tmp_path, [("index.html", "<p>same</p>")])
+
+    assert _write_all_files(tmp_path, [("index.html", new_html)]) == (1, 0)
+    assert (tmp_path / "index.html").read_text() == new_html
+
+
+def test_page_writer_records_paths_with_small_queue(tmp_path: Path) -> None:
+    """Test the writer handles more pages than its queue holds."""
+    pages = [(f"p{i}/index.html", f"<p>{i}</p>") for i in range(10)]
+
+    with _PageWriter(tmp_path, max_pending=2) as writer:
+        for page in pages:
+            writer.put(page)
+
+    assert writer.written == 10
+    assert writer.paths == {path for path, _ in pages}
+    assert (tmp_path / "p9" / "index.html").read_text() == "<p>9</p>"
+
+
+def test_page_writer_reraises_write_errors(tmp_path: Path) -> None:
+    """Test an error on the writer thread surfaces in the building thread."""
+    (tmp_path / "blocked").write_text("a file where a directory should be")
+
+    with pytest.raises(OSError):
+        _write_all_files(tmp_path, [("blocked/index.html", "<p>page</p>")])
+
+
+def test_iter_rendered_pages_is_lazy() -> None:
+    """Test pages are rendered on demand rather than collected up front."""
+    catalog = make_catalog("examples.minimal")
+    pages = _iter_rendered_pages(catalog, with_assertions=False)
+
+    assert isinstance(pages, GeneratorType)
+    path, page_html = next(pages)
+    assert path == "index.html"
+    assert "<html" in page_html
+
+
+def test_writing_phase_logs_counts(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the Phase Writing log line reports written and skipped counts."""
+    caplog.set_level(logging.INFO)
+
+    build_catalog(package_location="examples.minimal", output_dir=tmp_path)
+
+    writing_logs = [
+        record.message
+        for record in caplog.records
+        if record.message.startswith("Phase Writing:")
+    ]
+    assert len(writing_logs) == 1
+    assert "wrote " in writing_logs[0]
+    assert "skipped 0 unchanged" in writing_logs[0]
@@ -30,7 +30,7 @@ def cleanup_websocket_loop():
     from storyville import websocket
 
     websocket._websocket_loop = None
-    websocket._active_connections.clear()
+    websocket._registry.clear()
 
 
 def pytest_collection_modifyitems(
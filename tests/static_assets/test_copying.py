@@ -4,7 +4,11 @@ from pathlib import Path
 
 import pytest
 
-from storyville.static_assets.copying import copy_static_folder
+from storyville.static_assets.copying import (
+    CopyStrategy,
+    copy_static_folder,
+    place_file,
+)
 from storyville.static_assets.models import StaticFolder
 
 
@@ -132,3 +136,69 @@ def test_copy_static_folder_empty_directory(tmp_path: Path) -> None:
     output_static = output_dir / "storyville_static" / "component" / "static"
     assert output_static.exists()
     assert output_static.is_dir()
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [CopyStrategy.HARDLINK, CopyStrategy.REFLINK, CopyStrategy.SYMLINK],
+)
+def test_copy_static_folder_with_strategy(
+    tmp_path: Path, strategy: CopyStrategy
+) -> None:
+    """Test every strategy produces the same files as a copy."""
+    source_dir = tmp_path / "source" / "static"
+    (source_dir / "assets").mkdir(parents=True)
+    (source_dir / "style.css").write_text("body { }")
+    (source_dir / "assets" / "icon.svg").write_text("<svg></svg>")
+    folder = StaticFolder(
+        source_path=source_dir,
+        source_type="storyville",
+        relative_path=Path("components/nav"),
+    )
+
+    output_dir = tmp_path / "output"
+    copy_static_folder(folder, output_dir, strategy)
+
+    output_static = folder.calculate_output_path(output_dir)
+    assert (output_static / "style.css").read_text() == "body { }"
+    assert (output_static / "assets" / "icon.svg").read_text() == "<svg></svg>"
+
+
+def test_place_file_hardlink_shares_inode(tmp_path: Path) -> None:
+    """Test the hardlink strategy links rather than copies."""
+    source = tmp_path / "style.css"
+    source.write_text("body { }")
+    dest = tmp_path / "out" / "style.css"
+
+    assert place_file(source, dest, CopyStrategy.HARDLINK) is False
+    assert dest.samefile(source)
+
+
+def test_place_file_symlink_points_at_source(tmp_path: Path) -> None:
+    """Test the symlink strategy links to the resolved source path."""
+    source = tmp_path / "style.css"
+    source.write_text("body { }")
+    dest = tmp_path / "out" / "style.css"
+
+    assert place_file(source, dest, CopyStrategy.SYMLINK) is False
+    assert dest.is_symlink()
+    assert dest.readlink() == source.resolve()
+
+
+def test_place_file_falls_back_to_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a file that can't be linked is copied instead."""
+    source = tmp_path / "style.css"
+    source.write_text("body { }")
+    dest = tmp_path / "out" / "style.css"
+
+    def cross_device(self: Path, target: Path) -> None:
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(Path, "hardlink_to", cross_device)
+
+    assert place_file(source, dest, CopyStrategy.HARDLINK) is True
+    assert dest.read_text() == "body { }"
+    assert not dest.samefile(source)
+    assert not (dest.parent / ".style.css.tmp").exists()
@@ -0,0 +1,98 @@
+"""Tests for content-hashed static asset names."""
+
+import json
+from pathlib import Path
+
+from storyville.static_assets import (
+    ASSET_MANIFEST_NAME,
+    AssetManifest,
+    is_fingerprinted,
+    sync_all_static_assets,
+)
+from storyville.static_assets.fingerprint import fingerprinted_path
+
+
+def _make_sources(tmp_path: Path) -> tuple[Path, Path]:
+    """Create a storyville base with one static file and an empty input dir."""
+    storyville_base = tmp_path / "storyville"
+    sv_static = storyville_base / "components" / "layout" / "static"
+    sv_static.mkdir(parents=True)
+    (sv_static / "style.css").write_text("body {}")
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    return storyville_base, input_dir
+
+
+def test_fingerprinted_path_inserts_hash_before_extension() -> None:
+    """Test the hash goes before the last extension, or at the end without one."""
+    digest = "0123456789abcdef"
+
+    assert fingerprinted_path("static/a/all.min.css", digest) == (
+        "static/a/all.min.0123456789.css"
+    )
+    assert fingerprinted_path("static/LICENSE", digest) == "static/LICENSE.0123456789"
+
+
+def test_is_fingerprinted() -> None:
+    """Test only names produced by fingerprinted_path are recognized."""
+    assert is_fingerprinted("pico-main.0123456789.css")
+    assert is_fingerprinted("LICENSE.0123456789")
+    assert not is_fingerprinted("pico-main.css")
+    assert not is_fingerprinted("all.min.css")
+
+
+def test_manifest_hashes_static_files(tmp_path: Path) -> None:
+    """Test every static file maps to a name that changes with its content."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    reference = "static/components/layout/static/style.css"
+
+    first = AssetManifest.from_sources(storyville_base, input_dir)
+    (storyville_base / "components/layout/static/style.css").write_text("main {}")
+    second = AssetManifest.from_sources(storyville_base, input_dir)
+
+    assert list(first.assets) == [reference]
+    assert is_fingerprinted(first.assets[reference])
+    assert first.assets[reference] != second.assets[reference]
+
+
+def test_manifest_resolves_through_discovered_assets(tmp_path: Path) -> None:
+    """Test the manifest plugs into the static path resolution machinery."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    manifest = AssetManifest.from_sources(storyville_base, input_dir)
+    reference = "static/components/layout/static/style.css"
+
+    assets = manifest.discovered_assets()
+
+    assert str(assets[reference]) == manifest.assets[reference]
+
+
+def test_manifest_save(tmp_path: Path) -> None:
+    """Test the manifest is written as JSON at the output root."""
+    manifest = AssetManifest(assets={"static/a.css": "static/a.0123456789.css"})
+
+    manifest.save(tmp_path)
+
+    data = json.loads((tmp_path / ASSET_MANIFEST_NAME).read_text())
+    assert data["assets"] == manifest.assets
+
+
+def test_sync_publishes_fingerprinted_copies(tmp_path: Path) -> None:
+    """Test the sync adds hashed names and removes them once outdated."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+    source = storyville_base / "components/layout/static/style.css"
+    reference = "static/components/layout/static/style.css"
+
+    first = AssetManifest.from_sources(storyville_base, input_dir)
+    sync_all_static_assets(
+        storyville_base, input_dir, output_dir, fingerprints=first.assets
+    )
+    source.write_text("main {}")
+    second = AssetManifest.from_sources(storyville_base, input_dir)
+    sync_all_static_assets(
+        storyville_base, input_dir, output_dir, fingerprints=second.assets
+    )
+
+    assert (output_dir / reference).read_text() == "main {}"
+    assert (output_dir / second.assets[reference]).read_text() == "main {}"
+    assert not (output_dir / first.assets[reference]).exists()
@@ -5,6 +5,7 @@ from pathlib import Path
 from tdom import html
 
 from storyville.static_assets.rewriting import (
+    DiscoveredAssets,
     build_discovered_assets_map,
     calculate_relative_static_path,
     resolve_static_asset_path,
@@ -212,6 +213,74 @@ class TestResolveStaticAssetPath:
         result = resolve_static_asset_path("static/missing.css", assets)
         assert result is None
 
+    def test_resolve_by_filename_requires_exact_name(self) -> None:
+        """Test the filename fallback doesn't match names that only share a suffix."""
+        assets = {"static/components/nav/static/mynav.css": Path("static/mynav.css")}
+        assert resolve_static_asset_path("static/nav.css", assets) is None
+
+    def test_resolve_ambiguous_filename(self) -> None:
+        """Test a filename shared by several assets is not resolved."""
+        assets = DiscoveredAssets(
+            {
+                "static/a/static/logo.png": Path("static/a/static/logo.png"),
+                "static/b/static/logo.png": Path("static/b/static/logo.png"),
+            }
+        )
+        assert resolve_static_asset_path("static/logo.png", assets) is None
+
+    def test_discovered_assets_index_tracks_updates(self) -> None:
+        """Test the filename index is rebuilt after the mapping changes."""
+        assets = DiscoveredAssets()
+        assert resolve_static_asset_path("static/nav.css", assets) is None
+
+        assets["static/components/nav/static/nav.css"] = Path("static/x/nav.css")
+        assert resolve_static_asset_path("static/nav.css", assets) == "static/x/nav.css"
+
+    def test_discovered_assets_index_tracks_update(self) -> None:
+        """Test update() rebuilds the filename index and cache key."""
+        assets = DiscoveredAssets()
+        cache_key = assets.cache_key
+        assert resolve_static_asset_path("static/nav.css", assets) is None
+
+        assets.update(
+            {"static/components/nav/static/nav.css": Path("static/x/nav.css")}
+        )
+
+        assert resolve_static_asset_path("static/nav.css", assets) == "static/x/nav.css"
+        assert assets.cache_key != cache_key
+
+    def test_discovered_assets_index_tracks_pop(self) -> None:
+        """Test pop() forgets the removed asset in lookups and the cache key."""
+        assets = DiscoveredAssets(
+            {"static/components/nav/static/nav.css": Path("static/x/nav.css")}
+        )
+        assert resolve_static_asset_path("static/nav.css", assets) == "static/x/nav.css"
+        cache_key = assets.cache_key
+
+        assets.pop("static/components/nav/static/nav.css")
+
+        assert resolve_static_asset_path("static/nav.css", assets) is None
+        assert assets.cache_key != cache_key
+
+    def test_discovered_assets_index_tracks_other_mutators(self) -> None:
+        """Test |=, setdefault(), popitem() and clear() also rebuild the index."""
+        assets = DiscoveredAssets()
+        assert resolve_static_asset_path("static/nav.css", assets) is None
+
+        assets |= {"static/components/nav/static/nav.css": Path("static/x/nav.css")}
+        assert resolve_static_asset_path("static/nav.css", assets) == "static/x/nav.css"
+
+        assets.setdefault(
+            "static/components/logo/static/logo.png", Path("static/l.png")
+        )
+        assert resolve_static_asset_path("static/logo.png", assets) == "static/l.png"
+
+        assets.popitem()
+        assert resolve_static_asset_path("static/logo.png", assets) is None
+
+        assets.clear()
+        assert resolve_static_asset_path("static/nav.css", assets) is None
+
 
 # Task 2.7: Tests for validation
 class TestValidateStaticReference:
@@ -264,6 +333,32 @@ class TestBuildDiscoveredAssetsMap:
         # Verify input_dir asset is in map
         assert "static/button.css" in assets
 
+    def test_ambiguous_short_references_reported(self, tmp_path: Path) -> None:
+        """Test files sharing a short reference are reported, not resolved."""
+        storyville_base = tmp_path / "src" / "storyville"
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        storyville_base.mkdir(parents=True)
+
+        for component in ("button", "card"):
+            static_dir = input_dir / "components" / component / "static"
+            static_dir.mkdir(parents=True)
+            (static_dir / "logo.png").write_bytes(b"png")
+
+        assets = build_discovered_assets_map(storyville_base, input_dir, output_dir)
+
+        assert "static/logo.png" not in assets
+        assert len(assets.ambiguous["static/logo.png"]) == 2
+        assert resolve_static_asset_path("static/logo.png", assets) is None
+        assert (
+            resolve_static_asset_path("static/components/card/static/logo.png", assets)
+            == "static/components/card/static/logo.png"
+        )
+        is_valid, error = validate_static_reference("static/logo.png", assets)
+        assert is_valid is False
+        assert error is not None
+        assert "Ambiguous asset reference" in error
+
     def test_empty_directories(self, tmp_path: Path) -> None:
         """Test building assets map with no static folders."""
         storyville_base = tmp_path / "src" / "storyville"
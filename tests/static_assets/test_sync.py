@@ -0,0 +1,148 @@
+"""Tests for incremental static asset syncing."""
+
+import os
+from pathlib import Path
+
+from storyville.static_assets import CopyStrategy, SyncStats, sync_all_static_assets
+from storyville.static_assets.copying import sync_file
+
+
+def _make_sources(tmp_path: Path) -> tuple[Path, Path]:
+    """Create a storyville base and input dir with one static file each."""
+    storyville_base = tmp_path / "storyville"
+    sv_static = storyville_base / "components" / "layout" / "static"
+    sv_static.mkdir(parents=True)
+    (sv_static / "style.css").write_text("body {}")
+
+    input_dir = tmp_path / "input"
+    input_static = input_dir / "components" / "button" / "static"
+    input_static.mkdir(parents=True)
+    (input_static / "button.js").write_text("export {};")
+
+    return storyville_base, input_dir
+
+
+def test_sync_copies_new_files(tmp_path: Path) -> None:
+    """Test a first sync copies every file and counts its bytes."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+
+    stats = sync_all_static_assets(storyville_base, input_dir, output_dir)
+
+    assert stats == SyncStats(copied=2, bytes_copied=len("body {}") + len("export {};"))
+    assert stats.total == 2
+    static_out = output_dir / "static"
+    assert (static_out / "components/layout/static/style.css").read_text() == "body {}"
+    assert (static_out / "components/button/static/button.js").exists()
+
+
+def test_sync_skips_unchanged_files(tmp_path: Path) -> None:
+    """Test a second sync copies nothing and leaves files untouched."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+    sync_all_static_assets(storyville_base, input_dir, output_dir)
+    dest = output_dir / "static/components/layout/static/style.css"
+    inode_before = dest.stat().st_ino
+
+    stats = sync_all_static_assets(storyville_base, input_dir, output_dir)
+
+    assert stats == SyncStats(unchanged=2)
+    assert dest.stat().st_ino == inode_before
+
+
+def test_sync_recopies_changed_files(tmp_path: Path) -> None:
+    """Test an edited source file is copied again."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+    sync_all_static_assets(storyville_base, input_dir, output_dir)
+    source = input_dir / "components/button/static/button.js"
+    source.write_text("export const changed = 1;")
+
+    stats = sync_all_static_assets(storyville_base, input_dir, output_dir)
+
+    assert stats.copied == 1
+    assert stats.unchanged == 1
+    dest = output_dir / "static/components/button/static/button.js"
+    assert dest.read_text() == "export const changed = 1;"
+
+
+def test_sync_file_compares_content_when_mtime_differs(tmp_path: Path) -> None:
+    """Test same-sized files are hashed rather than trusted or recopied."""
+    source = tmp_path / "a.css"
+    dest = tmp_path / "b.css"
+    source.write_text("same")
+    dest.write_text("same")
+    os.utime(dest, ns=(0, 0))
+
+    stats = SyncStats()
+    sync_file(source, dest, stats)
+    assert stats == SyncStats(unchanged=1)
+    assert dest.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+    dest.write_text("diff")
+    os.utime(dest, ns=(0, 0))
+    sync_file(source, dest, stats)
+    assert stats.copied == 1
+    assert dest.read_text() == "same"
+
+
+def test_sync_file_does_not_modify_hard_links(tmp_path: Path) -> None:
+    """Test a changed file is replaced, not written through an existing link."""
+    source = tmp_path / "source.css"
+    dest = tmp_path / "dest.css"
+    linked = tmp_path / "linked.css"
+    source.write_text("new content")
+    dest.write_text("old")
+    linked.hardlink_to(dest)
+
+    sync_file(source, dest, SyncStats())
+
+    assert dest.read_text() == "new content"
+    assert linked.read_text() == "old"
+
+
+def test_sync_removes_orphaned_files(tmp_path: Path) -> None:
+    """Test files without a source are deleted and empty directories pruned."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+    sync_all_static_assets(storyville_base, input_dir, output_dir)
+    (input_dir / "components/button/static/button.js").unlink()
+
+    stats = sync_all_static_assets(storyville_base, input_dir, output_dir)
+
+    assert stats.removed == 1
+    assert stats.total == 1
+    assert not (output_dir / "static/components/button").exists()
+    assert (output_dir / "static/components/layout/static/style.css").exists()
+
+
+def test_sync_hardlink_strategy_links_once(tmp_path: Path) -> None:
+    """Test hard-linked files count as linked, then as unchanged."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+
+    first = sync_all_static_assets(
+        storyville_base, input_dir, output_dir, CopyStrategy.HARDLINK
+    )
+    second = sync_all_static_assets(
+        storyville_base, input_dir, output_dir, CopyStrategy.HARDLINK
+    )
+
+    assert first == SyncStats(linked=2)
+    assert second == SyncStats(unchanged=2)
+    dest = output_dir / "static/components/layout/static/style.css"
+    assert dest.samefile(storyville_base / "components/layout/static/style.css")
+
+
+def test_sync_replaces_links_when_strategy_changes(tmp_path: Path) -> None:
+    """Test switching back to copy replaces symlinks with real files."""
+    storyville_base, input_dir = _make_sources(tmp_path)
+    output_dir = tmp_path / "output"
+    sync_all_static_assets(storyville_base, input_dir, output_dir, CopyStrategy.SYMLINK)
+
+    stats = sync_all_static_assets(storyville_base, input_dir, output_dir)
+
+    assert stats.copied == 2
+    dest = output_dir / "static/components/layout/static/style.css"
+    assert not dest.is_symlink()
+    assert dest.read_text() == "body {}"
@@ -212,3 +212,24 @@ def test_story_view_default_layout_complete_structure() -> None:
     nav = get_by_tag_name(main, "nav")
     assert nav is not None
     assert nav.attrs.get("aria-label") == "Breadcrumb"
+
+
+def test_story_view_constructs_instance_once() -> None:
+    """Test assertions and the default layout share one component instance."""
+    calls = 0
+
+    def counting_component():
+        """Component that counts how often it is constructed."""
+        nonlocal calls
+        calls += 1
+        return html(t"<p>Counted</p>")
+
+    seen = []
+    catalog = Catalog(title="Test Catalog")
+    story = Story(target=counting_component, assertions=[seen.append])
+    view = StoryView(story=story, site=catalog)
+    result = view()
+
+    assert calls == 1
+    assert seen == [view.rendered_instance]
+    assert get_text_content(get_by_tag_name(result, "p")) == "Counted"
@@ -7,6 +7,7 @@ import pytest
 from typer.testing import CliRunner
 
 from storyville.__main__ import app as cli_app
+from storyville.memory_output import MemoryOutput
 
 
 @pytest.fixture
@@ -119,3 +120,72 @@ def test_build_command_uses_direct_build(runner: CliRunner, tmp_path: Path) -> N
         mock_build.assert_called_once()
         assert mock_build.call_args.kwargs["package_location"] == "examples.minimal"
         assert mock_build.call_args.kwargs["output_dir"] == Path(output_dir).resolve()
+
+
+def test_serve_command_in_memory_uses_direct_builds(
+    runner: CliRunner, tmp_path: Path
+) -> None:
+    """Test --in-memory serves a MemoryOutput built in the main interpreter."""
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    with (
+        patch("storyville.__main__.uvicorn.run"),
+        patch("storyville.__main__.build_catalog") as mock_build,
+        patch("storyville.__main__.create_app") as mock_create_app,
+    ):
+        mock_create_app.return_value = MagicMock()
+
+        result = runner.invoke(
+            cli_app,
+            ["serve", "--in-memory", "--flush", "examples.minimal", str(output_dir)],
+        )
+
+        assert result.exit_code == 0
+        memory = mock_create_app.call_args.kwargs["memory"]
+        assert isinstance(memory, MemoryOutput)
+        assert memory.flush is True
+        assert mock_build.call_args.kwargs["memory"] is memory
+        assert mock_create_app.call_args.kwargs["use_subinterpreters"] is False
+
+
+def test_serve_command_lazy_skips_build(runner: CliRunner, tmp_path: Path) -> None:
+    """Test --lazy starts the server without building the catalog."""
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    with (
+        patch("storyville.__main__.uvicorn.run"),
+        patch("storyville.__main__.build_catalog") as mock_build,
+        patch("storyville.__main__.create_app") as mock_create_app,
+    ):
+        mock_create_app.return_value = MagicMock()
+
+        result = runner.invoke(
+            cli_app, ["serve", "--lazy", "examples.minimal", str(output_dir)]
+        )
+
+        assert result.exit_code == 0
+        mock_build.assert_not_called()
+        assert mock_create_app.call_args.kwargs["lazy"] is True
+        assert mock_create_app.call_args.kwargs["use_subinterpreters"] is False
+
+
+def test_serve_command_passes_pool_size(runner: CliRunner, tmp_path: Path) -> None:
+    """Test --pool-size configures the subinterpreter pool."""
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    with (
+        patch("storyville.__main__.uvicorn.run"),
+        patch("storyville.__main__.build_catalog"),
+        patch("storyville.__main__.create_app") as mock_create_app,
+    ):
+        mock_create_app.return_value = MagicMock()
+
+        result = runner.invoke(
+            cli_app, ["serve", "--pool-size", "4", "examples.minimal", str(output_dir)]
+        )
+
+        assert result.exit_code == 0
+        assert mock_create_app.call_args.kwargs["pool_size"] == 4
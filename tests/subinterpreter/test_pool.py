@@ -1,8 +1,17 @@
 """Tests for subinterpreter pool creation and lifecycle."""
 
+import time
+from concurrent import interpreters
 from concurrent.futures import InterpreterPoolExecutor
 
-from storyville.subinterpreter_pool import create_pool, shutdown_pool
+import pytest
+
+from storyville.subinterpreter_pool import (
+    _MAIN_SYS_PATH,
+    create_pool,
+    shutdown_pool,
+    warmup_interpreter,
+)
 
 
 def test_pool_creation_with_size_2() -> None:
@@ -26,3 +35,51 @@ def test_pool_shutdown_cleanup() -> None:
     # After shutdown, pool should be in shutdown state
     # (InterpreterPoolExecutor doesn't expose a public state attribute,
     # but we can verify no exceptions were raised)
+
+
+def _wait_for_interpreters(count: int, timeout: float = 30.0) -> int:
+    """Wait until at least count interpreters exist, returning how many do."""
+    deadline = time.monotonic() + timeout
+    while len(interpreters.list_all()) < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return len(interpreters.list_all())
+
+
+def test_warm_pool_starts_every_interpreter() -> None:
+    """Test that a warm pool starts as many interpreters as requested."""
+    before = len(interpreters.list_all())
+    pool = create_pool(pool_size=3)
+
+    try:
+        assert _wait_for_interpreters(before + 3) == before + 3
+    finally:
+        shutdown_pool(pool)
+
+
+def test_cold_pool_starts_interpreters_on_demand() -> None:
+    """Test that warm=False leaves starting interpreters to the first tasks."""
+    before = len(interpreters.list_all())
+    pool = create_pool(pool_size=3, warm=False)
+
+    try:
+        assert len(interpreters.list_all()) == before
+    finally:
+        shutdown_pool(pool)
+
+
+def test_pool_size_must_be_positive() -> None:
+    """Test that an empty pool is rejected."""
+    with pytest.raises(ValueError, match="at least 1"):
+        create_pool(pool_size=0)
+
+
+def test_warm_pool_imports_framework_modules() -> None:
+    """Test that warm-up runs in the pool's interpreters and succeeds."""
+    pool = create_pool(pool_size=1)
+
+    try:
+        # The interpreter was already warmed, so this is only a check
+        future = pool.submit(warmup_interpreter, _MAIN_SYS_PATH)
+        assert future.result(timeout=30) is True
+    finally:
+        shutdown_pool(pool)
@@ -1,14 +1,22 @@
 """Tests for the Starlette application factory."""
 
 import asyncio
+import json
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from starlette.applications import Starlette
 from starlette.testclient import TestClient
 
-from storyville.app import create_app
+from storyville.app import _rebuild_with_fresh_imports, create_app
 from storyville.build import build_site
+from storyville.memory_output import MemoryOutput
+from storyville.static_assets import (
+    ASSET_MANIFEST_NAME,
+    IMMUTABLE_CACHE_CONTROL,
+    CopyStrategy,
+)
 
 
 # Task Group 1 Tests: Application Factory
@@ -82,6 +90,99 @@ def test_serve_static_asset(tmp_path: Path) -> None:
     assert "pico" in response.text
 
 
+def test_fingerprinted_asset_is_cached_forever(tmp_path: Path) -> None:
+    """Test hashed asset names get an immutable Cache-Control header."""
+    build_site(
+        package_location="examples.minimal", output_dir=tmp_path, fingerprint=True
+    )
+    client = TestClient(create_app(tmp_path))
+    manifest = json.loads((tmp_path / ASSET_MANIFEST_NAME).read_text())
+    hashed = manifest["assets"]["static/components/layout/static/pico-main.css"]
+
+    hashed_response = client.get(f"/{hashed}")
+    plain_response = client.get("/static/components/layout/static/pico-main.css")
+
+    assert hashed_response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert "cache-control" not in plain_response.headers
+
+
+def test_precompressed_sibling_is_preferred(tmp_path: Path) -> None:
+    """Test a client accepting gzip gets the .gz sibling of a page."""
+    build_site(
+        package_location="examples.minimal", output_dir=tmp_path, precompress=True
+    )
+    client = TestClient(create_app(tmp_path))
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    identity_response = client.get("/", headers={"Accept-Encoding": "identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["vary"] == "Accept-Encoding"
+    # The test client decodes the body transparently
+    assert "Minimal Catalog" in response.text
+    assert "content-encoding" not in identity_response.headers
+
+
+def test_unchanged_page_is_revalidated_with_304(tmp_path: Path) -> None:
+    """Test a repeat request with the page's ETag gets 304 Not Modified."""
+    build_site(package_location="examples.minimal", output_dir=tmp_path)
+    client = TestClient(create_app(tmp_path))
+
+    first = client.get("/")
+    second = client.get("/", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_create_app_serves_memory_output(tmp_path: Path) -> None:
+    """Test an app given an in-memory output serves it instead of the path."""
+    memory = MemoryOutput()
+    build_site(package_location="examples.minimal", output_dir=tmp_path, memory=memory)
+    client = TestClient(create_app(tmp_path, memory=memory))
+
+    response = client.get("/components/")
+
+    assert not any(tmp_path.iterdir())
+    assert response.status_code == 200
+    assert "Components" in response.text
+
+
+def test_memory_rebuild_imports_edited_story_modules(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test an in-memory rebuild renders the edited stories.py."""
+    package = tmp_path / "memory_reload_catalog"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    stories = package / "stories.py"
+    catalog_source = (
+        "from storyville import Catalog\n\n\n"
+        "def this_catalog() -> Catalog:\n"
+        '    return Catalog(title="{title}")\n'
+    )
+    stories.write_text(catalog_source.format(title="Before Rebuild"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    memory = MemoryOutput()
+    output_dir = tmp_path / "output"
+
+    _rebuild_with_fresh_imports("memory_reload_catalog", output_dir, memory=memory)
+    stories.write_text(catalog_source.format(title="After The Edit"))
+    _rebuild_with_fresh_imports("memory_reload_catalog", output_dir, memory=memory)
+
+    page = memory.get("index.html")
+    assert page is not None
+    assert b"After The Edit" in page.data
+
+
+def test_create_app_rejects_memory_with_subinterpreters(tmp_path: Path) -> None:
+    """Test subinterpreter builds can't target an in-memory output."""
+    with pytest.raises(ValueError, match="in-memory"):
+        create_app(tmp_path, use_subinterpreters=True, memory=MemoryOutput())
+
+
 def test_404_for_nonexistent_path(tmp_path: Path) -> None:
     """Test 404 for non-existent path."""
     build_site(package_location="examples.minimal", output_dir=tmp_path)
@@ -211,11 +312,16 @@ def test_watchers_receive_correct_parameters(tmp_path: Path) -> None:
         assert call_kwargs["package_location"] == "examples.minimal"
         assert call_kwargs["output_dir"] == tmp_path
 
-        # rebuild_callback is now a partial wrapping build_site with with_assertions bound
+        # rebuild_callback is a partial wrapping build_site with build options bound
         rebuild_callback = call_kwargs["rebuild_callback"]
         assert isinstance(rebuild_callback, partial)
         assert rebuild_callback.func == mock_build
-        assert rebuild_callback.keywords == {"with_assertions": True}
+        assert rebuild_callback.keywords == {
+            "with_assertions": True,
+            "incremental": False,
+            "atomic": False,
+            "static_strategy": CopyStrategy.COPY,
+        }
 
         assert call_kwargs["broadcast_callback"] == mock_broadcast
 
@@ -0,0 +1,75 @@
+"""Tests for precompressed output siblings."""
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from storyville.compression import (
+    ENCODINGS,
+    accepted_encodings,
+    compress_file,
+    precompress_output,
+)
+
+PAGE = "<nav>" + "<li><a href='x'>Item</a></li>" * 200 + "</nav>"
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", ["gzip"]),
+        ("gzip;q=0, deflate", []),
+        ("identity", []),
+        ("*", [encoding.name for encoding in ENCODINGS]),
+    ],
+)
+def test_accepted_encodings(header: str, expected: list[str]) -> None:
+    """Test Accept-Encoding parsing honors q=0 and wildcards."""
+    assert [encoding.name for encoding in accepted_encodings(header)] == expected
+
+
+def test_compress_file_writes_gzip_sibling(tmp_path: Path) -> None:
+    """Test the sibling decompresses to the source and carries its mtime."""
+    page = tmp_path / "index.html"
+    page.write_text(PAGE)
+
+    assert compress_file(page) is True
+
+    sibling = tmp_path / "index.html.gz"
+    assert gzip.decompress(sibling.read_bytes()).decode() == PAGE
+    assert sibling.stat().st_mtime_ns == page.stat().st_mtime_ns
+
+
+def test_compress_file_skips_unchanged(tmp_path: Path) -> None:
+    """Test a current sibling is left alone and a changed source recompressed."""
+    page = tmp_path / "index.html"
+    page.write_text(PAGE)
+    compress_file(page)
+
+    assert compress_file(page) is False
+
+    page.write_text(PAGE + "<p>changed</p>")
+    os.utime(page, ns=(0, 1))
+    assert compress_file(page) is True
+    assert b"changed" in gzip.decompress((tmp_path / "index.html.gz").read_bytes())
+
+
+def test_precompress_output(tmp_path: Path) -> None:
+    """Test only large text files get siblings and stale siblings are removed."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "index.html").write_text(PAGE)
+    (tmp_path / "small.css").write_text("a {}")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" + b"\0" * 4096)
+    (tmp_path / "gone.html.gz").write_bytes(b"stale")
+
+    stats = precompress_output(tmp_path)
+
+    assert stats.compressed == 1
+    assert stats.removed == 1
+    assert (tmp_path / "a" / "index.html.gz").exists()
+    assert not (tmp_path / "small.css.gz").exists()
+    assert not (tmp_path / "logo.png.gz").exists()
+    assert not (tmp_path / "gone.html.gz").exists()
+    assert precompress_output(tmp_path).unchanged == 1
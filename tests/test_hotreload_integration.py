@@ -139,9 +139,9 @@ async def test_multiple_rapid_file_changes_debounced(
         # Give time to ensure no additional rebuilds happen (reduced from 1.0s)
         await asyncio.sleep(0.5)
 
-        # Due to debouncing, we should have only 1-2 rebuilds, not 5
-        assert rebuild_count <= 2, (
-            f"Expected at most 2 rebuilds due to debouncing, got {rebuild_count}"
+        # The burst is coalesced into a single rebuild, not 5
+        assert rebuild_count == 1, (
+            f"Expected 1 rebuild due to debouncing, got {rebuild_count}"
         )
 
 
@@ -0,0 +1,66 @@
+"""Tests for compact patches between story HTML versions."""
+
+import pytest
+
+from storyville.html_patch import (
+    apply_patch,
+    compact_patch,
+    diff_html,
+    html_hash,
+    tokenize_html,
+)
+
+STORY = (
+    "<html><body><main>"
+    + "".join(f"<section><h2>Item {i}</h2><p>Text {i}</p></section>" for i in range(50))
+    + "</main></body></html>"
+)
+
+
+def test_tokenize_html_round_trips() -> None:
+    """Test tokens end at each ">" and join back to the original text."""
+    tokens = tokenize_html("<p class='a'>Hi</p> tail")
+    assert tokens == ["<p class='a'>", "Hi</p>", " tail"]
+    assert "".join(tokens) == "<p class='a'>Hi</p> tail"
+    assert tokenize_html("") == []
+
+
+@pytest.mark.parametrize(
+    "new",
+    [
+        STORY,
+        STORY.replace("Text 7", "Changed text"),
+        STORY.replace("<h2>Item 3</h2>", ""),
+        STORY.replace("</main>", "<footer>New</footer></main>"),
+        "<p>Entirely different</p>",
+        "",
+    ],
+)
+def test_apply_patch_reproduces_new_html(new: str) -> None:
+    """Test applying the diff of two versions yields the new version."""
+    assert apply_patch(STORY, diff_html(STORY, new)) == new
+
+
+def test_diff_html_of_equal_text_is_empty() -> None:
+    """Test unchanged HTML needs no operations."""
+    assert diff_html(STORY, STORY) == []
+
+
+def test_compact_patch_is_local_for_small_edits() -> None:
+    """Test a one-element edit produces one small operation."""
+    patch = compact_patch(STORY, STORY.replace("Text 7", "Changed text"))
+    assert patch is not None
+    assert len(patch) == 1
+    assert patch[0][2] == "Changed text</p>"
+
+
+def test_compact_patch_falls_back_when_larger() -> None:
+    """Test no patch is offered when full HTML would be smaller."""
+    assert compact_patch(STORY, "<p>Entirely different</p>") is None
+
+
+def test_html_hash_is_crc32_of_utf8() -> None:
+    """Test the hash matches the client's CRC-32 of the UTF-8 text."""
+    assert html_hash("") == "00000000"
+    assert html_hash("<p>h\u00e9llo \u2713</p>") == "85772d4f"
+    assert html_hash(STORY) != html_hash(STORY.replace("Text 7", "Text 8"))
@@ -0,0 +1,127 @@
+"""Tests for rendering catalog pages on request."""
+
+from pathlib import Path
+
+import pytest
+from starlette.testclient import TestClient
+
+from storyville.app import create_app
+from storyville.lazy import LazySite
+
+STORY = "components/heading/story-0/index.html"
+
+CATALOG_STORIES = """\
+from storyville import Catalog
+
+
+def this_catalog() -> Catalog:
+    return Catalog(title="{title}")
+"""
+
+
+def test_pages_render_on_first_request() -> None:
+    """Test nothing is rendered until a page is asked for, then it is cached."""
+    site = LazySite("examples.minimal")
+    assert site.rendered == 0
+
+    page = site.get("index.html")
+
+    assert page is not None
+    assert page.identity.body is not None
+    assert b"Minimal Catalog" in page.identity.body
+    assert site.get("index.html") is page
+    assert site.rendered == 1
+
+
+def test_unknown_path_is_not_rendered() -> None:
+    """Test paths outside the catalog return None without rendering."""
+    site = LazySite("examples.minimal")
+
+    assert site.get("no/such/page/index.html") is None
+    assert site.rendered == 0
+
+
+def test_static_assets_come_from_sources() -> None:
+    """Test static files are served from the source tree, not rendered."""
+    site = LazySite("examples.minimal")
+
+    asset = site.get("static/components/layout/static/pico-main.css")
+
+    assert asset is not None
+    assert asset.media_type == "text/css"
+    assert site.rendered == 0
+
+
+def test_cache_evicts_least_recently_used_pages() -> None:
+    """Test the cache keeps at most cache_size pages."""
+    site = LazySite("examples.minimal", cache_size=1)
+    first = site.get("index.html")
+
+    site.get("about.html")
+    again = site.get("index.html")
+
+    assert again is not first
+    assert site.rendered == 3
+
+
+def test_reload_clears_cache() -> None:
+    """Test the watcher's rebuild reloads the catalog and drops pages."""
+    site = LazySite("examples.minimal")
+    page = site.get(STORY)
+
+    site.rebuild("examples.minimal", Path("unused"))
+
+    assert site.rendered == 0
+    assert site.get(STORY) is not page
+
+
+def test_rebuild_imports_edited_story_modules(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test pages rendered after a rebuild use the edited stories.py."""
+    package = tmp_path / "lazy_reload_catalog"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    stories = package / "stories.py"
+    stories.write_text(CATALOG_STORIES.format(title="Before Reload"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    site = LazySite("lazy_reload_catalog")
+    before = site.get("index.html")
+    assert before is not None
+    assert before.identity.body is not None
+    assert b"Before Reload" in before.identity.body
+
+    stories.write_text(CATALOG_STORIES.format(title="After The Edit"))
+    site.rebuild("lazy_reload_catalog", Path("unused"))
+
+    after = site.get("index.html")
+    assert after is not None
+    assert after.identity.body is not None
+    assert b"After The Edit" in after.identity.body
+
+
+def test_rejects_empty_cache() -> None:
+    """Test the cache must hold at least one page."""
+    with pytest.raises(ValueError, match="cache_size"):
+        LazySite("examples.minimal", cache_size=0)
+
+
+def test_create_app_serves_lazy_site(tmp_path: Path) -> None:
+    """Test a lazy app serves pages without any build output."""
+    app = create_app(tmp_path, package_location="examples.minimal", lazy=True)
+    client = TestClient(app)
+
+    page = client.get("/components/heading/story-0/")
+    redirect = client.get("/components", follow_redirects=False)
+
+    assert page.status_code == 200
+    assert "<html" in page.text
+    assert redirect.status_code == 307
+    assert client.get("/missing/").status_code == 404
+    assert not any(tmp_path.iterdir())
+
+
+def test_create_app_lazy_needs_package_location(tmp_path: Path) -> None:
+    """Test lazy rendering can't start without a package to load."""
+    with pytest.raises(ValueError, match="package_location"):
+        create_app(tmp_path, lazy=True)
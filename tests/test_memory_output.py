@@ -0,0 +1,69 @@
+"""Tests for the in-memory build output."""
+
+from pathlib import Path
+
+import pytest
+
+from storyville.manifest import BuildManifest
+from storyville.memory_output import MemoryFile, MemoryOutput
+
+
+def test_publish_swaps_in_a_new_generation() -> None:
+    """Test a published generation replaces the previous files."""
+    memory = MemoryOutput()
+    files = memory.snapshot()
+    files["index.html"] = MemoryFile(b"<html></html>")
+
+    assert "index.html" not in memory
+    memory.publish(files, BuildManifest())
+
+    assert memory.generation == 1
+    assert memory.read_text("index.html") == "<html></html>"
+    assert list(memory) == ["index.html"]
+
+
+def test_read_text_missing_file() -> None:
+    """Test reading a path that isn't in the output."""
+    with pytest.raises(FileNotFoundError):
+        MemoryOutput().read_text("missing.html")
+
+
+def test_flush_writes_only_changes(tmp_path: Path) -> None:
+    """Test a flush skips files flushed before and removes dropped files."""
+    memory = MemoryOutput(flush=True)
+    kept = MemoryFile(b"kept")
+    memory.publish(
+        {"a/kept.html": kept, "b/gone.html": MemoryFile(b"x")}, BuildManifest()
+    )
+
+    assert memory.flush_to(tmp_path) == (2, 0)
+    assert (tmp_path / "a" / "kept.html").read_bytes() == b"kept"
+
+    memory.publish(
+        {"a/kept.html": kept, "c/new.html": MemoryFile(b"new")}, BuildManifest()
+    )
+
+    assert memory.flush_to(tmp_path) == (1, 1)
+    assert not (tmp_path / "b").exists()
+    assert (tmp_path / "c" / "new.html").read_bytes() == b"new"
+
+
+def test_load_static_assets_reuses_unchanged_sources(tmp_path: Path) -> None:
+    """Test unchanged static sources are not re-read and orphans are dropped."""
+    storyville_base = tmp_path / "storyville"
+    input_dir = tmp_path / "input"
+    static_dir = input_dir / "components" / "button" / "static"
+    static_dir.mkdir(parents=True)
+    (static_dir / "button.js").write_text("export {};")
+    reference = "static/components/button/static/button.js"
+    memory = MemoryOutput()
+
+    files: dict[str, MemoryFile] = {"static/orphan.css": MemoryFile(b"")}
+    first = memory.load_static_assets(files, storyville_base, input_dir)
+    stored = files[reference]
+    second = memory.load_static_assets(files, storyville_base, input_dir)
+
+    assert (first.copied, first.removed) == (1, 1)
+    assert second.unchanged == 1
+    assert files[reference] is stored
+    assert "static/orphan.css" not in files
@@ -0,0 +1,248 @@
+"""Tests for the in-memory site index and its ASGI app."""
+
+import gzip
+import os
+from pathlib import Path
+
+from starlette.testclient import TestClient
+
+from storyville.manifest import BuildManifest
+from storyville.memory_output import MemoryFile, MemoryOutput
+from storyville.site_files import SiteFiles, SiteIndex
+
+
+def _make_site(tmp_path: Path) -> Path:
+    """Create a small built site with a precompressed page."""
+    site = tmp_path / "site"
+    (site / "components").mkdir(parents=True)
+    page = site / "index.html"
+    page.write_text("<html>" + "home " * 500 + "</html>")
+    sibling = site / "index.html.gz"
+    sibling.write_bytes(gzip.compress(page.read_bytes()))
+    stat_result = page.stat()
+    os.utime(sibling, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    (site / "components" / "index.html").write_text("<html>Components</html>")
+    (site / "archive.tar.gz").write_bytes(b"not a sibling")
+    return site
+
+
+def test_index_records_files_and_siblings(tmp_path: Path) -> None:
+    """Test siblings become representations rather than files of their own."""
+    index = SiteIndex(_make_site(tmp_path))
+    index.refresh()
+
+    page = index.get("index.html")
+    assert page is not None
+    assert set(page.encoded) == {"gzip"}
+    assert page.encoded["gzip"].etag != page.identity.etag
+    assert index.get("index.html.gz") is None
+    assert index.get("archive.tar.gz") is not None
+    assert len(index) == 3
+
+
+def test_get_does_not_refresh(tmp_path: Path) -> None:
+    """Test lookups never walk the site; SiteFiles indexes it off the loop."""
+    index = SiteIndex(_make_site(tmp_path))
+
+    assert index.get("index.html") is None
+    assert not index.refreshed
+
+    client = TestClient(SiteFiles(index))
+    response = client.get("/components/")
+
+    assert response.status_code == 200
+    assert index.refreshed
+
+
+def test_index_ignores_stale_siblings(tmp_path: Path) -> None:
+    """Test a sibling whose mtime differs from its source is not used."""
+    site = _make_site(tmp_path)
+    os.utime(site / "index.html.gz", ns=(0, 0))
+    index = SiteIndex(site)
+    index.refresh()
+
+    page = index.get("index.html")
+    assert page is not None
+    assert page.encoded == {}
+
+
+def test_refresh_reuses_unchanged_entries(tmp_path: Path) -> None:
+    """Test only changed files get new entries and ETags."""
+    site = _make_site(tmp_path)
+    index = SiteIndex(site)
+    index.refresh()
+    home = index.get("index.html")
+    before = index.get("components/index.html")
+    assert before is not None
+
+    (site / "components" / "index.html").write_text("<html>Changed</html>")
+    index.refresh()
+
+    assert index.get("index.html") is home
+    after = index.get("components/index.html")
+    assert after is not None
+    assert after.identity.etag != before.identity.etag
+    assert after.identity.body == b"<html>Changed</html>"
+
+
+def test_large_files_are_streamed(tmp_path: Path) -> None:
+    """Test files beyond the memory budget are indexed without their bytes."""
+    site = _make_site(tmp_path)
+    index = SiteIndex(site, max_cached_bytes=0)
+    client = TestClient(SiteFiles(index))
+
+    response = client.get("/components/")
+
+    assert response.status_code == 200
+    assert response.text == "<html>Components</html>"
+    site_file = index.get("components/index.html")
+    assert site_file is not None
+    assert site_file.identity.body is None
+    assert response.headers["etag"] == site_file.identity.etag
+
+
+def test_if_none_match_returns_304(tmp_path: Path) -> None:
+    """Test a request revalidating the current ETag gets an empty 304."""
+    client = TestClient(SiteFiles(SiteIndex(_make_site(tmp_path))))
+
+    first = client.get("/components/")
+    second = client.get(
+        "/components/", headers={"If-None-Match": first.headers["etag"]}
+    )
+    weak = client.get(
+        "/components/", headers={"If-None-Match": f"W/{first.headers['etag']}"}
+    )
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert weak.status_code == 304
+
+
+def test_encoded_representation_has_its_own_etag(tmp_path: Path) -> None:
+    """Test revalidating the gzip form does not match the identity form."""
+    client = TestClient(SiteFiles(SiteIndex(_make_site(tmp_path))))
+
+    gzipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+    identity = client.get(
+        "/",
+        headers={
+            "Accept-Encoding": "identity",
+            "If-None-Match": gzipped.headers["etag"],
+        },
+    )
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert identity.status_code == 200
+    assert "content-encoding" not in identity.headers
+
+
+def test_directory_without_slash_redirects(tmp_path: Path) -> None:
+    """Test a directory URL without its trailing slash redirects to it."""
+    client = TestClient(SiteFiles(SiteIndex(_make_site(tmp_path))))
+
+    response = client.get("/components", follow_redirects=False)
+
+    assert response.status_code == 307
+    assert response.headers["location"].endswith("/components/")
+
+
+def test_missing_file_serves_404_page(tmp_path: Path) -> None:
+    """Test a site's 404.html is sent with a 404 status."""
+    site = _make_site(tmp_path)
+    client = TestClient(SiteFiles(SiteIndex(site)))
+    assert client.get("/missing.html").status_code == 404
+
+    (site / "404.html").write_text("<html>Lost</html>")
+    client = TestClient(SiteFiles(SiteIndex(site)))
+    response = client.get("/missing.html")
+
+    assert response.status_code == 404
+    assert response.text == "<html>Lost</html>"
+
+
+def test_head_and_unsupported_methods(tmp_path: Path) -> None:
+    """Test HEAD sends headers only and other methods are rejected."""
+    client = TestClient(SiteFiles(SiteIndex(_make_site(tmp_path))))
+
+    head = client.head("/components/")
+    post = client.post("/components/")
+
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["content-length"] == str(len("<html>Components</html>"))
+    assert post.status_code == 405
+
+
+def test_index_serves_memory_output() -> None:
+    """Test an index over a MemoryOutput serves its bytes and tracks changes."""
+    memory = MemoryOutput()
+    memory.publish({"index.html": MemoryFile(b"<html>One</html>")}, BuildManifest())
+    index = SiteIndex(memory)
+    client = TestClient(SiteFiles(index))
+
+    first = client.get("/")
+    assert first.text == "<html>One</html>"
+
+    files = memory.snapshot()
+    files["index.html"] = MemoryFile(b"<html>Two</html>")
+    memory.publish(files, BuildManifest())
+    index.refresh()
+    second = client.get("/", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert second.text == "<html>Two</html>"
+
+
+def test_range_request_returns_partial_content(tmp_path: Path) -> None:
+    """Test uncompressed files answer byte ranges with 206, as StaticFiles did."""
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "clip.mp4").write_bytes(bytes(range(100)))
+    client = TestClient(SiteFiles(SiteIndex(site)))
+
+    full = client.get("/clip.mp4")
+    middle = client.get("/clip.mp4", headers={"Range": "bytes=10-19"})
+    suffix = client.get("/clip.mp4", headers={"Range": "bytes=-5"})
+    open_ended = client.get("/clip.mp4", headers={"Range": "bytes=95-"})
+
+    assert full.headers["accept-ranges"] == "bytes"
+    assert middle.status_code == 206
+    assert middle.content == bytes(range(10, 20))
+    assert middle.headers["content-range"] == "bytes 10-19/100"
+    assert suffix.content == bytes(range(95, 100))
+    assert open_ended.headers["content-range"] == "bytes 95-99/100"
+
+
+def test_unsatisfiable_or_outdated_ranges(tmp_path: Path) -> None:
+    """Test ranges past the end get 416 and a stale If-Range the whole file."""
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "clip.mp4").write_bytes(bytes(range(100)))
+    client = TestClient(SiteFiles(SiteIndex(site)))
+
+    past_end = client.get("/clip.mp4", headers={"Range": "bytes=100-"})
+    outdated = client.get(
+        "/clip.mp4", headers={"Range": "bytes=0-9", "If-Range": '"old"'}
+    )
+    several = client.get("/clip.mp4", headers={"Range": "bytes=0-1,5-6"})
+
+    assert past_end.status_code == 416
+    assert past_end.headers["content-range"] == "bytes */100"
+    assert outdated.status_code == 200
+    assert len(outdated.content) == 100
+    assert several.status_code == 200
+
+
+def test_range_request_for_streamed_file(tmp_path: Path) -> None:
+    """Test files served from disk without cached bytes also support ranges."""
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "clip.mp4").write_bytes(bytes(range(100)))
+    client = TestClient(SiteFiles(SiteIndex(site, max_cached_bytes=0)))
+
+    response = client.get("/clip.mp4", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == bytes(range(10, 20))
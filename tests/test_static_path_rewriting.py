@@ -0,0 +1,162 @@
+"""Tests and benchmarks for the static path rewriters.
+
+Each benchmark group times the tree rewriters (walk, then serialize)
+against the serialized-HTML rewriters (serialize, then one regex pass)
+on the same fresh page, e.g. ``pytest -m slow --benchmark-group-by=group``.
+"""
+
+from pathlib import Path
+
+import pytest
+from aria_testing import query_all_by_tag_name
+from tdom import Node, html
+
+from storyville.static_assets.rewriting import (
+    rewrite_static_paths as rewrite_asset_paths,
+    rewrite_static_paths_html as rewrite_asset_paths_html,
+)
+from storyville.utils import (
+    iter_elements,
+    rewrite_static_paths,
+    rewrite_static_paths_html,
+    static_path_prefix,
+)
+
+
+_ASSETS = {
+    "static/style.css": Path("static/components/page/static/style.css"),
+    "static/logo.png": Path("static/components/page/static/logo.png"),
+}
+
+
+def _large_page(rows: int = 2000) -> Node:
+    """Build a page with many elements, a few of which reference static files."""
+    items = [
+        html(t'<li><a href="/item/{i}">Item {i}</a><span>detail</span></li>')
+        for i in range(rows)
+    ]
+    return html(t"""\
+<div>
+<link rel="stylesheet" href="static/style.css" />
+<ul>{items}</ul>
+<img src="static/logo.png" />
+</div>""")
+
+
+def test_static_path_prefix_matches_depth() -> None:
+    """Test prefixes climb one level per depth."""
+    assert static_path_prefix(0) == ""
+    assert static_path_prefix(3) == "../../../"
+
+
+def test_iter_elements_reaches_nested_elements() -> None:
+    """Test the iterative walk visits every nested element."""
+    node = html(t"<div><ul><li><a>One</a></li><li><a>Two</a></li></ul></div>")
+
+    tags = sorted(element.tag for element in iter_elements(node))
+
+    assert tags == ["a", "a", "div", "li", "li", "ul"]
+
+
+def test_rewrite_static_paths_depth_0_leaves_paths() -> None:
+    """Test root pages keep their static/ paths untouched."""
+    node = html(t'<div><img src="static/logo.png" /></div>')
+
+    rewrite_static_paths(node, depth=0)
+
+    assert query_all_by_tag_name(node, "img")[0].attrs["src"] == "static/logo.png"
+
+
+def test_rewrite_asset_paths_resolves_repeated_references() -> None:
+    """Test every occurrence of a repeated reference is rewritten."""
+    assets = {"static/logo.png": Path("static/components/logo/static/logo.png")}
+    node = html(
+        t'<div><img src="static/logo.png" /><img src="static/logo.png" /></div>'
+    )
+
+    rewrite_asset_paths(node, 1, assets)
+
+    sources = [img.attrs["src"] for img in query_all_by_tag_name(node, "img")]
+    assert sources == ["../../static/components/logo/static/logo.png"] * 2
+
+
+def test_rewrite_static_paths_html_matches_tree_rewrite() -> None:
+    """Test rewriting serialized HTML gives the tree rewriter's markup."""
+    for depth in (0, 1, 3):
+        expected = str(rewrite_static_paths(_large_page(20), depth))
+
+        assert rewrite_static_paths_html(str(_large_page(20)), depth) == expected
+
+
+def test_rewrite_asset_paths_html_matches_tree_rewrite() -> None:
+    """Test resolving references in serialized HTML matches the tree rewrite."""
+    assets = {"static/style.css": _ASSETS["static/style.css"]}
+    expected = str(rewrite_asset_paths(_large_page(20), 2, assets))
+
+    html_text = rewrite_asset_paths_html(str(_large_page(20)), 2, assets)
+
+    assert html_text == expected
+    # Unresolved references are left for the plain depth rewrite
+    assert 'src="static/logo.png"' in html_text
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark(group="static-paths")
+def test_rewrite_static_paths_tree_benchmark(benchmark) -> None:
+    """Benchmark walking a fresh large page at depth 3, then serializing it."""
+
+    # Rewriting is in place, so each round gets a tree that wasn't rewritten
+    def fresh_page() -> tuple[tuple[Node], dict[str, object]]:
+        return (_large_page(),), {}
+
+    def rewrite(node: Node) -> str:
+        return str(rewrite_static_paths(node, 3))
+
+    result = benchmark.pedantic(rewrite, setup=fresh_page, rounds=20)
+    assert 'href="../../../static/style.css"' in result
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark(group="static-paths")
+def test_rewrite_static_paths_html_benchmark(benchmark) -> None:
+    """Benchmark serializing a fresh large page, then rewriting the HTML."""
+
+    def fresh_page() -> tuple[tuple[Node], dict[str, object]]:
+        return (_large_page(),), {}
+
+    def rewrite(node: Node) -> str:
+        return rewrite_static_paths_html(str(node), 3)
+
+    result = benchmark.pedantic(rewrite, setup=fresh_page, rounds=20)
+    benchmark.extra_info["elements"] = len(iter_elements(_large_page()))
+    assert 'href="../../../static/style.css"' in result
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark(group="asset-paths")
+def test_rewrite_asset_paths_tree_benchmark(benchmark) -> None:
+    """Benchmark resolving references by walking a fresh large page."""
+
+    def fresh_page() -> tuple[tuple[Node], dict[str, object]]:
+        return (_large_page(),), {}
+
+    def rewrite(node: Node) -> str:
+        return str(rewrite_asset_paths(node, 2, _ASSETS))
+
+    result = benchmark.pedantic(rewrite, setup=fresh_page, rounds=20)
+    assert 'href="../../../static/components/page/static/style.css"' in result
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark(group="asset-paths")
+def test_rewrite_asset_paths_html_benchmark(benchmark) -> None:
+    """Benchmark resolving references in a fresh large page's HTML."""
+
+    def fresh_page() -> tuple[tuple[Node], dict[str, object]]:
+        return (_large_page(),), {}
+
+    def rewrite(node: Node) -> str:
+        return rewrite_asset_paths_html(str(node), 2, _ASSETS)
+
+    result = benchmark.pedantic(rewrite, setup=fresh_page, rounds=20)
+    assert 'href="../../../static/components/page/static/style.css"' in result
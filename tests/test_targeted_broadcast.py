@@ -7,6 +7,7 @@ from starlette.testclient import TestClient
 
 from storyville.app import create_app
 from storyville.build import build_site
+from storyville.html_patch import apply_patch, html_hash
 from storyville.websocket import (
     ReloadMessage,
     broadcast_full_reload,
@@ -253,6 +254,57 @@ def test_broadcast_full_reload_targets_non_story_viewers(tmp_path: Path) -> None
                     # ws_story should not receive anything
 
 
+def test_broadcast_story_reload_sends_patch_after_first_html(tmp_path: Path) -> None:
+    """Test later morphs for a story carry a patch against the last HTML sent."""
+    build_site(package_location="examples.minimal", output_dir=tmp_path)
+    app = create_app(tmp_path)
+    story_id = "components/heading/story-0"
+    sections = "".join(f"<section><p>Section {i}</p></section>" for i in range(40))
+    first_html = f"<html><body><main>{sections}</main></body></html>"
+    second_html = first_html.replace("Section 7", "Edited section")
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/reload") as ws_early:
+            ws_early.send_json(
+                {
+                    "type": "page_info",
+                    "page_url": f"/{story_id}/index.html",
+                    "page_type": "story",
+                    "story_id": story_id,
+                }
+            )
+            import time
+
+            time.sleep(0.1)
+
+            broadcast_story_reload(story_id, first_html)
+            assert ws_early.receive_json()["html"] == first_html
+
+            with client.websocket_connect("/ws/reload") as ws_late:
+                ws_late.send_json(
+                    {
+                        "type": "page_info",
+                        "page_url": f"/{story_id}/index.html",
+                        "page_type": "story",
+                        "story_id": story_id,
+                    }
+                )
+                time.sleep(0.1)
+
+                broadcast_story_reload(story_id, second_html)
+
+                # The early client gets a patch against the first HTML
+                data = ws_early.receive_json()
+                assert data["change_type"] == "morph_html"
+                assert "html" not in data
+                assert data["base_hash"] == html_hash(first_html)
+                patch = [tuple(operation) for operation in data["patch"]]
+                assert apply_patch(first_html, patch) == second_html
+
+                # The late client has no base yet, so it gets the full HTML
+                assert ws_late.receive_json()["html"] == second_html
+
+
 def test_broadcast_story_reload_with_no_matching_viewers(tmp_path: Path) -> None:
     """Test broadcast_story_reload handles case with no viewers for the target story."""
     build_site(package_location="examples.minimal", output_dir=tmp_path)
@@ -5,11 +5,94 @@ by using event-based waiting with the ready_event parameter.
 """
 
 import asyncio
+import threading
+import time
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
+from watchfiles import Change
 
-from storyville.watchers import watch_and_rebuild
+from storyville import websocket
+from storyville.build import BuildCancelled
+from storyville.manifest import DependencyGraph
+from storyville.watchers import (
+    ChangeCoalescer,
+    story_id_for_page,
+    watch_and_rebuild,
+)
+
+
+class FakeClock:
+    """A monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_coalescer_waits_for_quiet_period() -> None:
+    """Test changes are only ready once no change arrived for the quiet period."""
+    clock = FakeClock()
+    coalescer = ChangeCoalescer(quiet_period=0.3, clock=clock)
+    assert not coalescer.ready()
+
+    coalescer.add([(Change.modified, "/src/a.py")])
+    clock.now += 0.2
+    coalescer.add([(Change.modified, "/src/b.py")])
+    clock.now += 0.2
+    assert not coalescer.ready()
+
+    clock.now += 0.1
+    assert coalescer.ready()
+
+
+def test_coalescer_keeps_every_path_once() -> None:
+    """Test a burst drains as one deduplicated batch with the latest changes."""
+    clock = FakeClock()
+    coalescer = ChangeCoalescer(quiet_period=0.3, clock=clock)
+
+    coalescer.add([(Change.added, "/src/a.py"), (Change.modified, "/src/b.py")])
+    coalescer.add([(Change.modified, "/src/a.py")])
+    coalescer.add([])
+    clock.now += 0.3
+
+    assert coalescer.ready()
+    assert coalescer.drain() == [
+        (Change.modified, "/src/b.py"),
+        (Change.modified, "/src/a.py"),
+    ]
+    assert len(coalescer) == 0
+    assert not coalescer.ready()
+
+
+def test_coalescer_empty_batches_do_not_extend_quiet_period() -> None:
+    """Test the periodic empty change sets let a quiet period end."""
+    clock = FakeClock()
+    coalescer = ChangeCoalescer(quiet_period=0.3, clock=clock)
+
+    coalescer.add([(Change.modified, "/src/a.py")])
+    for _ in range(3):
+        clock.now += 0.1
+        coalescer.add([])
+
+    assert coalescer.ready()
+
+
+@pytest.mark.parametrize(
+    ("page_path", "story_id"),
+    [
+        ("components/heading/story-0/index.html", "components/heading/story-0"),
+        ("components/heading/story-0/themed_story.html", None),
+        ("components/heading/index.html", None),
+        ("index.html", None),
+    ],
+)
+def test_story_id_for_page(page_path: str, story_id: str | None) -> None:
+    """Test only primary story pages map to a story ID."""
+    assert story_id_for_page(page_path) == story_id
 
 
 @pytest.mark.slow
@@ -463,3 +546,360 @@ async def test_unified_watcher_does_not_broadcast_on_build_failure(
             await watcher_task
         except asyncio.CancelledError:
             pass
+
+
+@pytest.mark.slow
+@pytest.mark.anyio
+async def test_unified_watcher_awaits_after_rebuild(tmp_path: Path) -> None:
+    """Test the after_rebuild hook runs after a successful rebuild."""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    calls: list[str] = []
+    after_rebuild_called = asyncio.Event()
+    watcher_ready = asyncio.Event()
+
+    def rebuild_callback(package_location: str, output_dir_arg: Path) -> None:
+        calls.append("rebuild")
+
+    async def broadcast_callback() -> None:
+        pass
+
+    async def after_rebuild() -> None:
+        calls.append("after_rebuild")
+        after_rebuild_called.set()
+
+    watcher_task = asyncio.create_task(
+        watch_and_rebuild(
+            content_path=content_dir,
+            storyville_path=None,
+            rebuild_callback=rebuild_callback,
+            broadcast_callback=broadcast_callback,
+            package_location="test_package",
+            output_dir=output_dir,
+            ready_event=watcher_ready,
+            after_rebuild=after_rebuild,
+        )
+    )
+
+    try:
+        await asyncio.wait_for(watcher_ready.wait(), timeout=2.0)
+
+        (content_dir / "test.txt").write_text("test content")
+
+        try:
+            await asyncio.wait_for(after_rebuild_called.wait(), timeout=3.0)
+        except asyncio.TimeoutError:
+            pytest.fail("after_rebuild was not called within timeout")
+
+        assert calls[:2] == ["rebuild", "after_rebuild"]
+
+    finally:
+        watcher_task.cancel()
+        try:
+            await watcher_task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.slow
+@pytest.mark.anyio
+async def test_unified_watcher_supersedes_in_flight_rebuild(tmp_path: Path) -> None:
+    """Test new changes stop a running rebuild and only the latest is broadcast."""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    build_started = threading.Event()
+    outcomes: list[str] = []
+    broadcasts: list[list[str]] = []
+    broadcast_called = asyncio.Event()
+    watcher_ready = asyncio.Event()
+
+    def rebuild_callback(
+        package_location: str,
+        output_dir_arg: Path,
+        should_cancel: Callable[[], bool],
+    ) -> None:
+        build_started.set()
+        if outcomes:
+            outcomes.append("completed")
+            return
+        # The first build runs until the watcher supersedes it
+        deadline = time.monotonic() + 5.0
+        while not should_cancel():
+            if time.monotonic() > deadline:
+                outcomes.append("timed out")
+                return
+            time.sleep(0.01)
+        outcomes.append("cancelled")
+        raise BuildCancelled("Build cancelled")
+
+    async def broadcast_callback() -> None:
+        broadcasts.append(list(outcomes))
+        broadcast_called.set()
+
+    watcher_task = asyncio.create_task(
+        watch_and_rebuild(
+            content_path=content_dir,
+            storyville_path=None,
+            rebuild_callback=rebuild_callback,
+            broadcast_callback=broadcast_callback,
+            package_location="test_package",
+            output_dir=output_dir,
+            ready_event=watcher_ready,
+        )
+    )
+
+    try:
+        await asyncio.wait_for(watcher_ready.wait(), timeout=2.0)
+
+        (content_dir / "first.txt").write_text("first")
+        assert await asyncio.to_thread(build_started.wait, 3.0)
+
+        (content_dir / "second.txt").write_text("second")
+
+        try:
+            await asyncio.wait_for(broadcast_called.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            pytest.fail("Broadcast was not called within timeout")
+
+        assert outcomes == ["cancelled", "completed"]
+        assert broadcasts == [["cancelled", "completed"]]
+
+    finally:
+        watcher_task.cancel()
+        try:
+            await watcher_task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.slow
+@pytest.mark.anyio
+async def test_unified_watcher_keeps_watching_during_stale_rebuild(
+    tmp_path: Path,
+) -> None:
+    """Test changes during an uncancellable rebuild merge into one rebuild."""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    build_started = threading.Event()
+    release_build = threading.Event()
+    builds: list[str] = []
+    broadcast_called = asyncio.Event()
+    watcher_ready = asyncio.Event()
+
+    def rebuild_callback(package_location: str, output_dir_arg: Path) -> None:
+        builds.append("started")
+        build_started.set()
+        # The first build can't be cancelled, so it runs until released
+        release_build.wait(5.0)
+
+    async def broadcast_callback() -> None:
+        broadcast_called.set()
+
+    watcher_task = asyncio.create_task(
+        watch_and_rebuild(
+            content_path=content_dir,
+            storyville_path=None,
+            rebuild_callback=rebuild_callback,
+            broadcast_callback=broadcast_callback,
+            package_location="test_package",
+            output_dir=output_dir,
+            ready_event=watcher_ready,
+        )
+    )
+
+    try:
+        await asyncio.wait_for(watcher_ready.wait(), timeout=2.0)
+
+        (content_dir / "first.txt").write_text("first")
+        assert await asyncio.to_thread(build_started.wait, 3.0)
+
+        # Both change sets are drained while the stale build still runs
+        (content_dir / "second.txt").write_text("second")
+        await asyncio.sleep(1.0)
+        (content_dir / "third.txt").write_text("third")
+        await asyncio.sleep(1.0)
+        release_build.set()
+
+        try:
+            await asyncio.wait_for(broadcast_called.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            pytest.fail("Broadcast was not called within timeout")
+
+        # Give a wrongly queued extra rebuild a chance to start
+        await asyncio.sleep(1.0)
+        assert builds == ["started", "started"]
+
+    finally:
+        release_build.set()
+        watcher_task.cancel()
+        try:
+            await watcher_task
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.slow
+@pytest.mark.anyio
+async def test_unified_watcher_targets_pages_from_dependencies(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a component change rebuilds and morphs only the stories using it."""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    component = content_dir / "button.py"
+    component.write_text("# version 1")
+    output_dir = tmp_path / "output"
+    story_dir = output_dir / "components" / "button" / "story-0"
+    story_dir.mkdir(parents=True)
+    (story_dir / "themed_story.html").write_text("<button>Hi</button>")
+
+    story_page = "components/button/story-0/index.html"
+    graph = DependencyGraph(
+        pages={story_page: [str(component.resolve())], "index.html": []},
+        shared_digest="shared",
+    )
+    rebuilt_pages: list[object] = []
+    morphs: list[tuple[str, str]] = []
+    global_reloads: list[str] = []
+    morphed = asyncio.Event()
+    watcher_ready = asyncio.Event()
+
+    def rebuild_callback(
+        package_location: str, output_dir_arg: Path, pages: object = None
+    ) -> None:
+        rebuilt_pages.append(pages)
+
+    async def broadcast_callback() -> None:
+        global_reloads.append("legacy")
+
+    async def broadcast_story_reload(story_id: str, html: str) -> None:
+        morphs.append((story_id, html))
+        morphed.set()
+
+    async def broadcast_global_reload() -> None:
+        global_reloads.append("global")
+
+    monkeypatch.setattr(
+        websocket, "broadcast_story_reload_async", broadcast_story_reload
+    )
+    monkeypatch.setattr(
+        websocket, "broadcast_global_reload_async", broadcast_global_reload
+    )
+
+    watcher_task = asyncio.create_task(
+        watch_and_rebuild(
+            content_path=content_dir,
+            storyville_path=None,
+            rebuild_callback=rebuild_callback,
+            broadcast_callback=broadcast_callback,
+            package_location="test_package",
+            output_dir=output_dir,
+            ready_event=watcher_ready,
+            dependencies=lambda: graph,
+        )
+    )
+
+    try:
+        await asyncio.wait_for(watcher_ready.wait(), timeout=2.0)
+
+        component.write_text("# version 2")
+
+        try:
+            await asyncio.wait_for(morphed.wait(), timeout=3.0)
+        except asyncio.TimeoutError:
+            pytest.fail("Story morph was not broadcast within timeout")
+
+        assert rebuilt_pages == [{story_page}]
+        assert morphs == [("components/button/story-0", "<button>Hi</button>")]
+        assert global_reloads == []
+
+    finally:
+        watcher_task.cancel()
+        try:
+            await watcher_task
+        except asyncio.CancelledError:
+            pass
+
+
+async def test_unified_watcher_reads_story_html_from_callable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a story_html lookup supplies morphs when the output isn't on disk."""
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    component = content_dir / "button.py"
+    component.write_text("# version 1")
+    output_dir = tmp_path / "output"
+
+    story_page = "components/button/story-0/index.html"
+    graph = DependencyGraph(
+        pages={story_page: [str(component.resolve())]},
+        shared_digest="shared",
+    )
+    lookups: list[str] = []
+    morphs: list[tuple[str, str]] = []
+    morphed = asyncio.Event()
+    watcher_ready = asyncio.Event()
+
+    def rebuild_callback(
+        package_location: str, output_dir_arg: Path, pages: object = None
+    ) -> None:
+        pass
+
+    async def broadcast_callback() -> None:
+        pass
+
+    def story_html(story_id: str) -> str | None:
+        lookups.append(story_id)
+        return "<button>In memory</button>"
+
+    async def broadcast_story_reload(story_id: str, html: str) -> None:
+        morphs.append((story_id, html))
+        morphed.set()
+
+    monkeypatch.setattr(
+        websocket, "broadcast_story_reload_async", broadcast_story_reload
+    )
+
+    watcher_task = asyncio.create_task(
+        watch_and_rebuild(
+            content_path=content_dir,
+            storyville_path=None,
+            rebuild_callback=rebuild_callback,
+            broadcast_callback=broadcast_callback,
+            package_location="test_package",
+            output_dir=output_dir,
+            ready_event=watcher_ready,
+            dependencies=lambda: graph,
+            story_html=story_html,
+        )
+    )
+
+    try:
+        await asyncio.wait_for(watcher_ready.wait(), timeout=2.0)
+
+        component.write_text("# version 2")
+
+        try:
+            await asyncio.wait_for(morphed.wait(), timeout=3.0)
+        except asyncio.TimeoutError:
+            pytest.fail("Story morph was not broadcast within timeout")
+
+        assert lookups == ["components/button/story-0"]
+        assert morphs == [("components/button/story-0", "<button>In memory</button>")]
+
+    finally:
+        watcher_task.cancel()
+        try:
+            await watcher_task
+        except asyncio.CancelledError:
+            pass
@@ -2,12 +2,14 @@
 
 import json
 from pathlib import Path
+from unittest.mock import MagicMock
 
 from starlette.testclient import TestClient
 
 from storyville.app import create_app
 from storyville.build import build_site
 from storyville.websocket import (
+    ConnectionRegistry,
     PageMetadata,
     PageType,
     _classify_page_type,
@@ -111,3 +113,74 @@ def test_page_metadata_dataclass() -> None:
     assert metadata.page_url == "/index.html"
     assert metadata.page_type == PageType.NON_STORY
     assert metadata.story_id is None
+
+
+def test_connection_registry_indexes_by_page() -> None:
+    """Test the registry indexes connections by page type and story."""
+    registry = ConnectionRegistry()
+    story_viewer, other_viewer, docs_viewer, new_viewer = (
+        MagicMock() for _ in range(4)
+    )
+    for connection in (story_viewer, other_viewer, docs_viewer, new_viewer):
+        registry.add(connection, MagicMock())
+
+    registry.set_metadata(
+        story_viewer,
+        PageMetadata(
+            page_url="/components/heading/story-0/index.html",
+            page_type=PageType.STORY,
+            story_id="components/heading/story-0",
+        ),
+    )
+    registry.set_metadata(
+        other_viewer,
+        PageMetadata(
+            page_url="/components/button/story-0/index.html",
+            page_type=PageType.STORY,
+            story_id="components/button/story-0",
+        ),
+    )
+    registry.set_metadata(
+        docs_viewer, PageMetadata(page_url="/index.html", page_type=PageType.NON_STORY)
+    )
+
+    assert len(registry) == 4
+    assert registry.viewing_story("components/heading/story-0") == [story_viewer]
+    assert set(registry.viewing(PageType.STORY)) == {story_viewer, other_viewer}
+    assert registry.viewing(PageType.NON_STORY) == [docs_viewer]
+    # Connections without page_info yet are in no index
+    assert registry.metadata(new_viewer) is None
+
+
+def test_connection_registry_reindexes_and_removes() -> None:
+    """Test a new page_info moves a connection and removal drops it."""
+    registry = ConnectionRegistry()
+    connection = MagicMock()
+    outbox = MagicMock()
+    registry.add(connection, outbox)
+    registry.set_metadata(
+        connection,
+        PageMetadata(
+            page_url="/components/heading/story-0/index.html",
+            page_type=PageType.STORY,
+            story_id="components/heading/story-0",
+        ),
+    )
+
+    registry.set_metadata(
+        connection, PageMetadata(page_url="/index.html", page_type=PageType.NON_STORY)
+    )
+    assert registry.viewing_story("components/heading/story-0") == []
+    assert registry.viewing(PageType.STORY) == []
+    assert registry.viewing(PageType.NON_STORY) == [connection]
+
+    assert registry.remove(connection) is outbox
+    assert connection not in registry
+    assert registry.viewing(PageType.NON_STORY) == []
+    assert registry.remove(connection) is None
+
+    # Metadata for a connection that is gone is ignored
+    registry.set_metadata(
+        connection, PageMetadata(page_url="/index.html", page_type=PageType.NON_STORY)
+    )
+    assert registry.viewing(PageType.NON_STORY) == []
@@ -0,0 +1,159 @@
+"""Tests for per-connection outbound queues, eviction and batching."""
+
+import asyncio
+import json
+
+import pytest
+
+from storyville import websocket
+from storyville.websocket import (
+    EVICTED_CLOSE_CODE,
+    Outbox,
+    PageMetadata,
+    PageType,
+    batched_broadcasts,
+    broadcast_full_reload_async,
+    broadcast_global_reload_async,
+    broadcast_story_reload_async,
+    flush_outboxes,
+)
+
+STORY_PAGE = PageMetadata(
+    page_url="/components/heading/story-0/index.html",
+    page_type=PageType.STORY,
+    story_id="components/heading/story-0",
+)
+
+
+class FakeWebSocket:
+    """Records sent messages; a stalled client never finishes a send."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.stalled = stalled
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+
+    async def send_text(self, data: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+
+def _connect(
+    client: FakeWebSocket, maxsize: int, metadata: PageMetadata = STORY_PAGE
+) -> None:
+    """Register a fake client the way websocket_endpoint would."""
+    registry = websocket._registry
+    registry.add(client, Outbox(client, maxsize=maxsize))  # type: ignore[arg-type]
+    registry.set_metadata(client, metadata)  # type: ignore[arg-type]
+
+
+@pytest.mark.anyio
+async def test_broadcast_does_not_wait_for_slow_client() -> None:
+    """A stalled client doesn't delay delivery to the others."""
+    fast = FakeWebSocket()
+    stalled = FakeWebSocket(stalled=True)
+    _connect(fast, maxsize=4)
+    _connect(stalled, maxsize=4)
+    try:
+        await asyncio.wait_for(broadcast_global_reload_async(), timeout=1.0)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert len(fast.sent) == 1
+        assert stalled.sent == []
+        assert stalled in websocket._registry
+    finally:
+        for outbox in websocket._registry.outboxes():
+            outbox.close()
+        websocket._registry.clear()
+
+
+@pytest.mark.anyio
+async def test_client_with_full_queue_is_evicted() -> None:
+    """A client that falls a full queue behind is dropped and closed."""
+    fast = FakeWebSocket()
+    stalled = FakeWebSocket(stalled=True)
+    _connect(fast, maxsize=2)
+    _connect(stalled, maxsize=2)
+    try:
+        # One message in flight, two queued, then the queue overflows
+        for _ in range(4):
+            await broadcast_global_reload_async()
+            await asyncio.sleep(0)
+        await flush_outboxes()
+        await asyncio.sleep(0)
+
+        assert len(fast.sent) == 4
+        assert stalled not in websocket._registry
+        assert stalled.close_code == EVICTED_CLOSE_CODE
+    finally:
+        for outbox in websocket._registry.outboxes():
+            outbox.close()
+        websocket._registry.clear()
+
+
+@pytest.mark.anyio
+async def test_client_whose_send_times_out_is_evicted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A send that doesn't finish within SEND_TIMEOUT evicts the client."""
+    monkeypatch.setattr(websocket, "SEND_TIMEOUT", 0.05)
+    stalled = FakeWebSocket(stalled=True)
+    _connect(stalled, maxsize=4)
+    try:
+        await broadcast_global_reload_async()
+        await asyncio.wait_for(flush_outboxes(), timeout=1.0)
+        await asyncio.sleep(0)
+
+        assert stalled not in websocket._registry
+        assert stalled.close_code == EVICTED_CLOSE_CODE
+    finally:
+        for outbox in websocket._registry.outboxes():
+            outbox.close()
+        websocket._registry.clear()
+
+
+@pytest.mark.anyio
+async def test_batched_broadcasts_send_one_frame_per_client() -> None:
+    """Each client gets the messages of one batch in a single frame."""
+    story_viewer = FakeWebSocket()
+    docs_viewer = FakeWebSocket()
+    _connect(story_viewer, maxsize=4)
+    _connect(
+        docs_viewer,
+        maxsize=4,
+        metadata=PageMetadata(page_url="/index.html", page_type=PageType.NON_STORY),
+    )
+    try:
+        with batched_broadcasts():
+            await broadcast_story_reload_async(
+                "components/heading/story-0", "<p>New</p>"
+            )
+            await broadcast_global_reload_async()
+            await broadcast_global_reload_async()
+            await broadcast_full_reload_async()
+            assert story_viewer.sent == []
+        await flush_outboxes()
+
+        assert len(story_viewer.sent) == 1
+        frame = json.loads(story_viewer.sent[0])
+        assert frame["type"] == "batch"
+        # Duplicates are dropped and the order is kept
+        assert [message["change_type"] for message in frame["messages"]] == [
+            "morph_html",
+            "iframe_reload",
+        ]
+        assert frame["messages"][0]["html"] == "<p>New</p>"
+
+        # A single message is sent as is
+        assert [json.loads(text) for text in docs_viewer.sent] == [
+            {"type": "reload", "change_type": "full_reload"}
+        ]
+    finally:
+        for outbox in websocket._registry.outboxes():
+            outbox.close()
+        websocket._registry.clear()